@@ -0,0 +1,37 @@
+"""
+节点间大文本制品存储
+LangGraph 的 add_messages 会把节点返回的消息跨迭代累积，世界态势摘要、
+战术意图这类大文本若同时写入 state 和 messages，负载会被复制多份并
+随迭代线性增长。这里改为按引用存储：messages / state 中只放 "ws:3"
+这类短键，使用方用 resolve() 取回原文。存储有容量上限，FIFO 淘汰。
+"""
+from collections import OrderedDict
+
+_MAX_ENTRIES = 256
+
+_store: OrderedDict[str, str] = OrderedDict()
+_counters: dict[str, int] = {}
+
+
+def put(kind: str, text: str) -> str:
+    """存入制品，返回短引用键（如 "ws:3"）"""
+    seq = _counters.get(kind, 0) + 1
+    _counters[kind] = seq
+    key = f"{kind}:{seq}"
+    _store[key] = text
+    while len(_store) > _MAX_ENTRIES:
+        _store.popitem(last=False)
+    return key
+
+
+def resolve(value) -> str:
+    """解析引用键为原文；普通文本原样返回"""
+    if isinstance(value, str):
+        return _store.get(value, value)
+    return ""
+
+
+def clear():
+    """清空制品存储（新任务会话开始时调用）"""
+    _store.clear()
+    _counters.clear()
@@ -4,11 +4,13 @@ Commander Agent - 指挥官节点
 集成 RAG 战术知识检索，辅助决策
 """
 import json
+from concurrent.futures import ThreadPoolExecutor
 from langchain_core.messages import SystemMessage, HumanMessage
 from loguru import logger
 
+from . import artifacts
 from .state import AgentState
-from mcp.tools import get_world_state
+from mcp.tools import iter_world_state
 from rag import get_rag
 import config
 
@@ -45,53 +47,76 @@ COMMANDER_SYSTEM_PROMPT = """你是一名经验丰富的空战指挥官AI。你
 """
 
 
-def commander_node(state: AgentState, llm) -> dict:
-    """Commander 节点 - 任务理解和战术意图生成"""
-    logger.info("[Commander] 开始分析任务...")
+# 系统提示词只包装一次，省掉每次调用的 pydantic 消息构造
+_COMMANDER_SYS_MSG = SystemMessage(content=COMMANDER_SYSTEM_PROMPT)
+
+# 单元态势行模板（预编译，大编队场景下循环内只剩 format + 一次 join）
+_UNIT_LINE_FMT = (
+    "  - {} [{}] 状态:{} "
+    "位置:({:.4f}, {:.4f}, {:.0f}m) "
+    "速度:{:.1f}m/s 装备:{}件"
+)
+
 
-    # 获取当前世界态势
-    world_state = get_world_state.invoke({})
-    
-    # 构建态势摘要
-    units = world_state.get("units", [])
-    sim_time = world_state.get("sim_time", 0)
-    
-    state_summary_parts = [f"仿真时间: {sim_time}"]
-    for unit in units:
-        name = unit.get("unit_name", "unknown")
-        side = unit.get("forceside", "unknown")
+def _build_world_summary() -> str:
+    """单遍消费流式态势，直接产出摘要文本（不物化完整 world_state dict）"""
+    sim_time = 0.0
+    # 首行占位，sim_time 可能在 units 之后才出现
+    state_summary_parts = [""]
+    for kind, value in iter_world_state():
+        if kind == "sim_time":
+            sim_time = value
+            continue
+        unit = value
         pos = unit.get("position", {})
-        speed = unit.get("speed", 0)
         alive = unit.get("alive", False)
         active = unit.get("active", False)
-        equip_count = len(unit.get("equipment", []))
-
         status = "存活/激活" if alive and active else ("存活/未激活" if alive else "已摧毁")
-        state_summary_parts.append(
-            f"  - {name} [{side}] 状态:{status} "
-            f"位置:({pos.get('latitude', 0):.4f}, {pos.get('longitude', 0):.4f}, {pos.get('altitude', 0):.0f}m) "
-            f"速度:{speed:.1f}m/s 装备:{equip_count}件"
-        )
+        state_summary_parts.append(_UNIT_LINE_FMT.format(
+            unit.get("unit_name", "unknown"),
+            unit.get("forceside", "unknown"),
+            status,
+            pos.get("latitude", 0),
+            pos.get("longitude", 0),
+            pos.get("altitude", 0),
+            unit.get("speed", 0),
+            len(unit.get("equipment", ())),
+        ))
+
+    state_summary_parts[0] = f"仿真时间: {sim_time}"
+    return "\n".join(state_summary_parts)
 
-    world_state_summary = "\n".join(state_summary_parts)
 
-    # RAG 检索相关战术知识
+def commander_node(state: AgentState, llm) -> dict:
+    """Commander 节点 - 任务理解和战术意图生成"""
+    logger.info("[Commander] 开始分析任务...")
+
+    # 并发获取世界态势与 RAG 战术知识（两者独立且都是 I/O 密集，取较慢者的耗时）
     rag = get_rag()
-    tactical_knowledge = rag.get_context_for_agent(state["task"])
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        future_world = executor.submit(_build_world_summary)
+        future_knowledge = executor.submit(rag.get_context_for_agent, state["task"])
+        world_state_summary = future_world.result()
+        tactical_knowledge = future_knowledge.result()
+
     logger.info(f"[Commander] RAG 检索到 {len(tactical_knowledge)} 字符战术知识")
 
     # 构造 LLM 输入
+    # 段落顺序刻意为「稳定前缀在前、易变内容在后」：系统提示、任务和
+    # 检索知识在同一任务的多次迭代间基本不变，战场态势每 tick 都变。
+    # 稳定前缀让服务端的上下文前缀缓存（以及本地 LLM 缓存）跨迭代命中，
+    # 免去对相同知识片段的重复 prefill 计算。
     messages = [
-        SystemMessage(content=COMMANDER_SYSTEM_PROMPT),
+        _COMMANDER_SYS_MSG,
         HumanMessage(content=f"""## 当前任务
 {state['task']}
 
-## 当前战场态势
-{world_state_summary}
-
 ## 相关战术知识（来自知识库）
 {tactical_knowledge}
 
+## 当前战场态势
+{world_state_summary}
+
 请分析态势，参考战术知识，输出战术意图。"""),
     ]
 
@@ -101,9 +126,13 @@ def commander_node(state: AgentState, llm) -> dict:
 
     logger.info(f"[Commander] 战术意图已生成")
 
+    # 大文本按引用入 state/messages，避免随 add_messages 跨迭代复制
+    summary_ref = artifacts.put("ws", world_state_summary)
+    intent_ref = artifacts.put("intent", tactical_intent)
+
     return {
         "tactical_intent": tactical_intent,
-        "world_state_summary": world_state_summary,
+        "world_state_summary": summary_ref,
         "current_phase": "tactical",
-        "messages": [HumanMessage(content=f"[Commander] {tactical_intent}")],
+        "messages": [HumanMessage(content=f"[Commander] 战术意图已生成 -> {intent_ref}")],
     }
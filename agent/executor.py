@@ -4,67 +4,61 @@ Executor Agent - 执行器节点
 """
 import json
 import re
+from concurrent.futures import ThreadPoolExecutor
 from langchain_core.messages import HumanMessage
 from loguru import logger
 
+try:
+    import orjson
+
+    def _loads(text: str):
+        """orjson 解码（C 扩展，比 stdlib 快数倍）"""
+        return orjson.loads(text)
+except ImportError:  # orjson 未安装时回退 stdlib
+    _loads = json.loads
+
+from . import artifacts
 from .state import AgentState
-from skills import (
-    climb_and_accelerate,
-    descend_and_decelerate,
-    turn_to_heading,
-    evade_missile,
-    intercept_target,
-    radar_power_on,
-    radar_power_off,
-    radar_search,
-    activate_jammer,
-    deactivate_jammer,
-    radio_power_on,
-    radio_power_off,
-)
-
-# 技能名称到函数的映射
-SKILL_REGISTRY = {
-    "climb_and_accelerate": climb_and_accelerate,
-    "descend_and_decelerate": descend_and_decelerate,
-    "turn_to_heading": turn_to_heading,
-    "evade_missile": evade_missile,
-    "intercept_target": intercept_target,
-    "radar_power_on": radar_power_on,
-    "radar_power_off": radar_power_off,
-    "radar_search": radar_search,
-    "activate_jammer": activate_jammer,
-    "deactivate_jammer": deactivate_jammer,
-    "radio_power_on": radio_power_on,
-    "radio_power_off": radio_power_off,
-}
+from skills import SKILL_REGISTRY as SKILL_META
+
+# 技能名称到函数的映射：直接从 skills 包注册表派生，
+# Tactical 向 LLM 公布的每个技能 Executor 必然可执行（不再手工同步）
+SKILL_REGISTRY = {name: meta["func"] for name, meta in SKILL_META.items()}
+
+
+# 预编译的 ```json ... ``` 代码块匹配（避免每次响应重新编译）
+_JSON_BLOCK_RE = re.compile(r'```json\s*\n?(.*?)\n?\s*```', re.DOTALL)
+_JSON_DECODER = json.JSONDecoder()
 
 
 def _extract_json(text: str) -> dict | None:
     """从 LLM 输出文本中提取 JSON 对象"""
+    # 快速路径: 整个文本本身就是合法 JSON（一次解析，无正则开销）
+    try:
+        result = _loads(text)
+        if isinstance(result, dict):
+            return result
+    except ValueError:
+        pass
+
     # 尝试匹配 ```json ... ``` 代码块
-    pattern = r'```json\s*\n?(.*?)\n?\s*```'
-    match = re.search(pattern, text, re.DOTALL)
+    match = _JSON_BLOCK_RE.search(text)
     if match:
         try:
-            return json.loads(match.group(1))
-        except json.JSONDecodeError:
+            return _loads(match.group(1))
+        except ValueError:
             pass
 
-    # 尝试直接解析整个文本
-    try:
-        return json.loads(text)
-    except json.JSONDecodeError:
-        pass
-
-    # 尝试匹配 { ... } 块
-    brace_pattern = r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}'
-    matches = re.findall(brace_pattern, text, re.DOTALL)
-    for m in reversed(matches):  # 从后往前找（最后一个通常最完整）
+    # 兜底: 从每个 '{' 起尝试 raw_decode（线性扫描，无嵌套括号正则回溯）
+    pos = text.find("{")
+    while pos != -1:
         try:
-            return json.loads(m)
+            result, _ = _JSON_DECODER.raw_decode(text, pos)
+            if isinstance(result, dict):
+                return result
         except json.JSONDecodeError:
-            continue
+            pass
+        pos = text.find("{", pos + 1)
 
     return None
 
@@ -74,7 +68,6 @@ def executor_node(state: AgentState) -> dict:
     logger.info("[Executor] 开始执行技能...")
 
     skill_decision = state.get("selected_skill", "")
-    results = []
 
     # 解析技能决策 JSON
     decision_data = _extract_json(skill_decision)
@@ -84,61 +77,114 @@ def executor_node(state: AgentState) -> dict:
         logger.error(f"[Executor] {error_msg}")
         return {
             "execution_result": error_msg,
+            "observe_hint": None,
             "current_phase": "observe",
             "iteration_count": state.get("iteration_count", 0) + 1,
             "messages": [HumanMessage(content=f"[Executor] 执行失败: {error_msg}")],
         }
 
+    # Tactical 可能随决策附带观察提示，透传给 Observe 节点复用
+    observe_hint = decision_data.get("observe_hint")
+    if not isinstance(observe_hint, dict):
+        observe_hint = None
+
     skills_to_execute = decision_data.get("skills", [])
     if not skills_to_execute:
         # 尝试单技能格式
         if "skill_name" in decision_data:
             skills_to_execute = [decision_data]
 
-    for skill_info in skills_to_execute:
-        skill_name = skill_info.get("skill_name", "")
-        params = skill_info.get("params", {})
-        reason = skill_info.get("reason", "")
-
-        if skill_name not in SKILL_REGISTRY:
-            error = f"未知技能: {skill_name}"
-            logger.warning(f"[Executor] {error}")
-            results.append({"skill": skill_name, "success": False, "error": error})
-            continue
-
+    def _run_skill(skill_name: str, params: dict, reason: str) -> dict:
         skill_func = SKILL_REGISTRY[skill_name]
-        logger.info(f"[Executor] 执行技能: {skill_name}({params}) - {reason}")
-
+        # 参数化延迟格式化：级别被关闭时不做字符串拼接（params 可能很大）
+        logger.info("[Executor] 执行技能: {}({}) - {}", skill_name, params, reason)
         try:
             result = skill_func(**params)
-            results.append({
+            logger.opt(lazy=True).info(
+                "[Executor] {} -> {}",
+                lambda: skill_name,
+                lambda: f"{'成功' if result.success else '失败'}: {result.description}",
+            )
+            return {
                 "skill": skill_name,
                 "success": result.success,
                 "description": result.description,
                 "actions_count": len(result.actions_taken),
-            })
-            logger.info(f"[Executor] {skill_name} -> {'成功' if result.success else '失败'}: {result.description}")
+            }
         except Exception as e:
             error = f"技能执行异常: {str(e)}"
             logger.error(f"[Executor] {skill_name} -> {error}")
-            results.append({"skill": skill_name, "success": False, "error": error})
+            return {"skill": skill_name, "success": False, "error": error}
+
+    # 并发只限相邻的装备开关类技能（parallel_safe）：把连续一段聚成
+    # 一批并发执行，批与批之间、批与普通技能之间保持 LLM 给出的顺序
+    # （整体前提不被打乱，例如先规避再关干扰机不能变成先关再开）。
+    # 批内按（单元, 装备类别）分组串行：同一部装备的开/关指令若并发
+    # 下发，终态取决于线程调度，必须保序。
+    results = [None] * len(skills_to_execute)
+
+    def _run_batch(batch: list) -> None:
+        """并发执行一段相邻的 parallel_safe 技能（同装备保序）"""
+        if len(batch) == 1:
+            idx, name, params, reason = batch[0]
+            results[idx] = _run_skill(name, params, reason)
+            return
+        groups: dict[tuple, list] = {}
+        for job in batch:
+            key = (job[2].get("unit_name"), SKILL_META.get(job[1], {}).get("category"))
+            groups.setdefault(key, []).append(job)
+
+        def _run_group(jobs: list) -> None:
+            for idx, name, params, reason in jobs:
+                results[idx] = _run_skill(name, params, reason)
+
+        with ThreadPoolExecutor(max_workers=min(8, len(groups))) as pool:
+            for future in [pool.submit(_run_group, jobs) for jobs in groups.values()]:
+                future.result()
+
+    batch = []  # 当前连续的 parallel_safe 技能段
+    for idx, skill_info in enumerate(skills_to_execute):
+        skill_name = skill_info.get("skill_name", "")
+        params = skill_info.get("params", {})
+        reason = skill_info.get("reason", "")
+
+        if skill_name not in SKILL_REGISTRY:
+            error = f"未知技能: {skill_name}"
+            logger.warning(f"[Executor] {error}")
+            results[idx] = {"skill": skill_name, "success": False, "error": error}
+        elif SKILL_META.get(skill_name, {}).get("parallel_safe", False):
+            batch.append((idx, skill_name, params, reason))
+        else:
+            if batch:
+                _run_batch(batch)
+                batch = []
+            results[idx] = _run_skill(skill_name, params, reason)
+    if batch:
+        _run_batch(batch)
 
     # 汇总执行结果
     total = len(results)
     success_count = sum(1 for r in results if r.get("success"))
-    execution_summary = f"执行了 {total} 个技能，成功 {success_count} 个"
+    summary_parts = [f"执行了 {total} 个技能，成功 {success_count} 个"]
 
     for r in results:
         if r.get("success"):
-            execution_summary += f"\n  - {r['skill']}: {r.get('description', '成功')}"
+            summary_parts.append(f"  - {r['skill']}: {r.get('description', '成功')}")
         else:
-            execution_summary += f"\n  - {r['skill']}: 失败 - {r.get('error', r.get('description', ''))}"
+            summary_parts.append(f"  - {r['skill']}: 失败 - {r.get('error', r.get('description', ''))}")
+
+    execution_summary = "\n".join(summary_parts)
+
+    # 汇总可达数 KB，参数化传入让 loguru 在级别关闭时零格式化开销
+    logger.info("[Executor] {}", execution_summary)
 
-    logger.info(f"[Executor] {execution_summary}")
+    # messages 中只放首行 + 引用键，完整汇总经 state 传给 Observe
+    summary_ref = artifacts.put("exec", execution_summary)
 
     return {
         "execution_result": execution_summary,
+        "observe_hint": observe_hint,
         "current_phase": "observe",
         "iteration_count": state.get("iteration_count", 0) + 1,
-        "messages": [HumanMessage(content=f"[Executor] {execution_summary}")],
+        "messages": [HumanMessage(content=f"[Executor] {summary_parts[0]} -> {summary_ref}")],
     }
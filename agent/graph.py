@@ -3,7 +3,7 @@ LangGraph 主图定义
 编排 Commander -> Tactical -> Executor -> Observe 的循环流程
 """
 import os
-from functools import partial
+import re
 from langchain_core.messages import SystemMessage, HumanMessage
 from langgraph.graph import StateGraph, END
 from loguru import logger
@@ -16,22 +16,93 @@ from .executor import executor_node
 import config
 
 
+# 编译后的图与 LLM 实例缓存（按模型参数作键）
+# run_agent 每次任务不再重建 StateGraph / ChatTongyi，配置变化时自动换新
+_LLM_CACHE: dict[tuple, object] = {}
+_GRAPH_CACHE: dict[tuple, object] = {}
+
+
+def _llm_cache_key() -> tuple:
+    """当前 LLM 配置对应的缓存键"""
+    llm_cfg = config.llm
+    return (llm_cfg.MODEL_NAME, llm_cfg.TEMPERATURE, llm_cfg.TOP_P, llm_cfg.JSON_MODE)
+
+
+def reset_agent_graph():
+    """清空图/LLM 缓存（config.reload() 热加载配置后调用）"""
+    _LLM_CACHE.clear()
+    _GRAPH_CACHE.clear()
+    logger.info("[Graph] 图缓存已清空")
+
+
 def _create_llm():
-    """创建通义千问 LLM 实例"""
+    """创建通义千问 LLM 实例（按配置缓存复用）"""
+    key = _llm_cache_key()
+    llm = _LLM_CACHE.get(key)
+    if llm is not None:
+        return llm
+
     from langchain_community.chat_models import ChatTongyi
 
     # 确保 API Key 设置
-    if config.llm.DASHSCOPE_API_KEY:
-        os.environ["DASHSCOPE_API_KEY"] = config.llm.DASHSCOPE_API_KEY
+    llm_cfg = config.llm
+    if llm_cfg.DASHSCOPE_API_KEY:
+        os.environ["DASHSCOPE_API_KEY"] = llm_cfg.DASHSCOPE_API_KEY
+
+    # Qwen 支持结构化输出：开启 JSON 模式后响应即为纯 JSON，
+    # _extract_json 的快速路径一次 loads 即命中，正则/兜底成为死代码
+    model_kwargs = {}
+    if llm_cfg.JSON_MODE:
+        model_kwargs["response_format"] = {"type": "json_object"}
 
     llm = ChatTongyi(
-        model=config.llm.MODEL_NAME,
-        temperature=config.llm.TEMPERATURE,
-        top_p=config.llm.TOP_P,
+        model=llm_cfg.MODEL_NAME,
+        temperature=llm_cfg.TEMPERATURE,
+        top_p=llm_cfg.TOP_P,
+        model_kwargs=model_kwargs,
     )
+
+    # 包一层调用缓存：迭代间近似重复的提示直接命中，省掉远程调用
+    from .llm_cache import CachedLLM
+    llm = CachedLLM(llm)
+
+    _LLM_CACHE[key] = llm
     return llm
 
 
+# 执行全部成功且最后一个技能属于此集合时，任务可直接判定结束，
+# 不必再消耗一次 Observe LLM 调用
+TERMINAL_SKILLS = {"bvr_attack", "return_to_base", "abort_engagement"}
+
+_EXEC_SUMMARY_RE = re.compile(r"执行了 (\d+) 个技能，成功 (\d+) 个")
+
+
+def _execution_fully_succeeded(execution_result: str) -> bool:
+    """执行汇总是否表明所有技能均成功"""
+    match = _EXEC_SUMMARY_RE.search(execution_result)
+    if not match:
+        return False
+    total, success = int(match.group(1)), int(match.group(2))
+    return total > 0 and success == total
+
+
+def _shortcut_observe(execution_result: str) -> str | None:
+    """规则短路判断：明确可以结束时返回结束原因，否则返回 None 交给 LLM"""
+    if not _execution_fully_succeeded(execution_result):
+        return None
+
+    # 取最后一个执行的技能名（汇总格式: "  - skill_name: ..."）
+    last_skill = None
+    for line in execution_result.splitlines():
+        line = line.strip()
+        if line.startswith("- "):
+            last_skill = line[2:].split(":", 1)[0].strip()
+
+    if last_skill in TERMINAL_SKILLS:
+        return f"全部技能执行成功，终端动作 {last_skill} 已完成"
+    return None
+
+
 def _observe_node(state: AgentState, llm) -> dict:
     """
     Observe 节点 - 观察执行结果，决定是否继续
@@ -51,6 +122,36 @@ def _observe_node(state: AgentState, llm) -> dict:
             "messages": [HumanMessage(content=f"[Observe] 达到最大迭代次数，任务结束")],
         }
 
+    # 规则短路：执行结果已经明确（全部成功 + 终端动作），省掉一次 LLM 调用
+    shortcut_reason = _shortcut_observe(execution_result or "")
+    if shortcut_reason:
+        logger.info(f"[Observe] 任务结束（规则判定）: {shortcut_reason}")
+        return {
+            "should_continue": False,
+            "current_phase": "done",
+            "messages": [HumanMessage(content=f"[Observe] 完成: {shortcut_reason}")],
+        }
+
+    # 复用 Tactical 同轮给出的观察提示：其前提（全部技能执行成功）满足时
+    # 直接采纳结论，把 tactical+observe 合并为一次 LLM 往返
+    hint = state.get("observe_hint")
+    if isinstance(hint, dict) and "continue" in hint \
+            and _execution_fully_succeeded(execution_result or ""):
+        reason = hint.get("reason", "")
+        if hint.get("continue"):
+            logger.info(f"[Observe] 继续执行（Tactical 提示）: {reason}")
+            return {
+                "should_continue": True,
+                "current_phase": "tactical",
+                "messages": [HumanMessage(content=f"[Observe] 继续: {reason}")],
+            }
+        logger.info(f"[Observe] 任务结束（Tactical 提示）: {reason}")
+        return {
+            "should_continue": False,
+            "current_phase": "done",
+            "messages": [HumanMessage(content=f"[Observe] 完成: {reason}")],
+        }
+
     # 让 LLM 判断是否需要继续
     observe_prompt = f"""你是任务观察者。根据以下执行结果，判断任务是否已完成。
 
@@ -96,6 +197,14 @@ def _observe_node(state: AgentState, llm) -> dict:
         }
 
 
+def _bind_llm(node_func, llm):
+    """把 llm 绑定进节点闭包（只剩一次位置参数调用的开销）"""
+    def _node(state: AgentState) -> dict:
+        return node_func(state, llm)
+    _node.__name__ = node_func.__name__
+    return _node
+
+
 def _route_after_observe(state: AgentState) -> str:
     """Observe 之后的路由决策"""
     if state.get("should_continue", False):
@@ -104,17 +213,22 @@ def _route_after_observe(state: AgentState) -> str:
 
 
 def create_agent_graph():
-    """创建 LangGraph Agent 图"""
+    """创建 LangGraph Agent 图（编译结果按 LLM 配置缓存，跨任务复用）"""
+    key = _llm_cache_key()
+    cached = _GRAPH_CACHE.get(key)
+    if cached is not None:
+        return cached
+
     llm = _create_llm()
 
     # 创建状态图
     graph = StateGraph(AgentState)
 
-    # 添加节点
-    graph.add_node("commander", partial(commander_node, llm=llm))
-    graph.add_node("tactical", partial(tactical_node, llm=llm))
+    # 添加节点（闭包绑定 llm，避免 partial.__call__ 每次重建 kwargs）
+    graph.add_node("commander", _bind_llm(commander_node, llm))
+    graph.add_node("tactical", _bind_llm(tactical_node, llm))
     graph.add_node("executor", executor_node)
-    graph.add_node("observe", partial(_observe_node, llm=llm))
+    graph.add_node("observe", _bind_llm(_observe_node, llm))
 
     # 定义边（流程）
     graph.set_entry_point("commander")
@@ -127,27 +241,33 @@ def create_agent_graph():
 
     # 编译图
     compiled = graph.compile()
+    _GRAPH_CACHE[key] = compiled
     logger.info("[Graph] Agent 图编译完成")
 
     return compiled
 
 
-def run_agent(task: str, max_iterations: int = None) -> dict:
+def run_agent_stream(task: str, max_iterations: int = None):
     """
-    运行 Agent 执行任务
+    流式运行 Agent：逐节点产出进度，最后产出最终状态
+
+    生成器按图的执行顺序 yield ("progress", 节点名)，全图跑完后
+    yield ("final", 最终状态字典)。UI 层可以按自己的节奏合并
+    刷新进度，而不必阻塞等待整个任务结束。
 
     Args:
         task: 任务描述
         max_iterations: 最大迭代次数
-
-    Returns:
-        最终状态字典
     """
     if max_iterations is None:
         max_iterations = config.agent.MAX_ITERATIONS
 
     graph = create_agent_graph()
 
+    # 新任务开始，清空上一会话的大文本制品
+    from . import artifacts
+    artifacts.clear()
+
     # 初始状态
     initial_state = {
         "messages": [],
@@ -157,6 +277,7 @@ def run_agent(task: str, max_iterations: int = None) -> dict:
         "selected_skill": None,
         "skill_params": None,
         "execution_result": None,
+        "observe_hint": None,
         "iteration_count": 0,
         "max_iterations": max_iterations,
         "should_continue": True,
@@ -170,13 +291,35 @@ def run_agent(task: str, max_iterations: int = None) -> dict:
     final_state = None
     for step in graph.stream(initial_state):
         for node_name, node_state in step.items():
-            logger.debug(f"[Agent] 节点 {node_name} 执行完毕")
+            # 参数化延迟格式化：DEBUG 关闭时不构造字符串
+            logger.debug("[Agent] 节点 {} 执行完毕", node_name)
             final_state = node_state
+            yield ("progress", node_name)
 
     logger.info("[Agent] 任务执行完毕")
 
-    # 保存回放记录
+    # 保存回放记录（先排空后台记录队列，避免尾部记录丢失）
+    from mcp.tools import flush_records
     from utils.replay import get_recorder
+    flush_records()
     get_recorder().save()
 
+    yield ("final", final_state)
+
+
+def run_agent(task: str, max_iterations: int = None) -> dict:
+    """
+    运行 Agent 执行任务（阻塞式，内部消费流式接口）
+
+    Args:
+        task: 任务描述
+        max_iterations: 最大迭代次数
+
+    Returns:
+        最终状态字典
+    """
+    final_state = None
+    for kind, payload in run_agent_stream(task, max_iterations):
+        if kind == "final":
+            final_state = payload
     return final_state
@@ -0,0 +1,173 @@
+"""
+LLM 调用缓存
+Commander / Tactical / Observe 节点在同一任务的多次迭代中会发出
+高度相似的提示词（系统提示不变，态势摘要增量变化）。
+本模块提供两级缓存，命中时直接返回历史响应，省掉一次远程调用:
+
+1. 精确缓存: 对序列化后的消息做 SHA-256，完全相同的提示直接命中
+2. 语义缓存: 对提示做 embedding，余弦相似度超过阈值视为命中
+   （复用 RAG 的 DashScope embedder，不可用时自动退化为仅精确缓存）
+
+缓存带 TTL 和容量上限，LRU 淘汰。
+"""
+import time
+import hashlib
+from collections import OrderedDict
+from typing import Any, Optional
+
+from loguru import logger
+
+import config
+
+
+def _serialize_messages(messages: list) -> str:
+    """将 LangChain 消息列表序列化为稳定的字符串键"""
+    return "\x00".join(f"{type(m).__name__}:{m.content}" for m in messages)
+
+
+class CachedLLM:
+    """LLM 代理 - invoke / stream 走缓存，其余属性透传给底层 LLM"""
+
+    def __init__(self, llm, max_size: int = None, ttl: float = None,
+                 similarity_threshold: float = None):
+        self._llm = llm
+        self._max_size = max_size or config.agent.LLM_CACHE_SIZE
+        self._ttl = ttl or config.agent.LLM_CACHE_TTL
+        self._threshold = similarity_threshold or config.agent.LLM_CACHE_SIMILARITY
+        # key -> (timestamp, embedding | None, response)
+        self._cache: OrderedDict[str, tuple] = OrderedDict()
+        self._embedder = None
+        self._embedder_failed = False
+
+    # ── 缓存操作 ──────────────────────────────────────────
+
+    def invoke(self, messages: list) -> Any:
+        if self._max_size <= 0:
+            return self._llm.invoke(messages)
+
+        serialized = _serialize_messages(messages)
+        key = hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+        now = time.time()
+        self._evict_expired(now)
+
+        # 1. 精确命中
+        hit = self._cache.get(key)
+        if hit is not None:
+            self._cache.move_to_end(key)
+            logger.debug("[LLMCache] 精确命中")
+            return hit[2]
+
+        # 2. 语义命中（embedding 可用时）
+        embedding = self._embed(serialized)
+        if embedding is not None:
+            response = self._semantic_probe(embedding)
+            if response is not None:
+                logger.debug("[LLMCache] 语义命中")
+                return response
+
+        # 3. 未命中 -> 远程调用并写入
+        response = self._llm.invoke(messages)
+        self._cache[key] = (now, embedding, response)
+        while len(self._cache) > self._max_size:
+            self._cache.popitem(last=False)
+        return response
+
+    def stream(self, messages: list):
+        """流式调用（与 invoke 共用两级缓存）
+
+        命中时把缓存的完整响应作为单块产出；未命中则边转发底层
+        流式块边累积，流结束后把累积内容写入缓存。调用方可能在
+        决策 JSON 闭合后提前停止消费（见 tactical 节点），此时
+        已接收的内容就是其实际使用的响应，同样入缓存。
+        """
+        if self._max_size <= 0:
+            yield from self._llm.stream(messages)
+            return
+
+        serialized = _serialize_messages(messages)
+        key = hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+        now = time.time()
+        self._evict_expired(now)
+
+        hit = self._cache.get(key)
+        if hit is not None:
+            self._cache.move_to_end(key)
+            logger.debug("[LLMCache] 精确命中（流式）")
+            yield hit[2]
+            return
+
+        embedding = self._embed(serialized)
+        if embedding is not None:
+            response = self._semantic_probe(embedding)
+            if response is not None:
+                logger.debug("[LLMCache] 语义命中（流式）")
+                yield response
+                return
+
+        parts = []
+        try:
+            for chunk in self._llm.stream(messages):
+                if chunk.content:
+                    parts.append(chunk.content)
+                yield chunk
+        finally:
+            if parts:
+                from langchain_core.messages import AIMessage
+                self._cache[key] = (now, embedding, AIMessage(content="".join(parts)))
+                while len(self._cache) > self._max_size:
+                    self._cache.popitem(last=False)
+
+    def clear(self):
+        """清空缓存（任务切换或配置热加载时调用）"""
+        self._cache.clear()
+
+    def _evict_expired(self, now: float):
+        expired = [k for k, (ts, _, _) in self._cache.items() if now - ts > self._ttl]
+        for k in expired:
+            del self._cache[k]
+
+    def _semantic_probe(self, embedding) -> Optional[Any]:
+        """在缓存中做余弦相似度匹配（numpy 点积，条目已归一化）"""
+        try:
+            import numpy as np
+        except ImportError:
+            return None
+
+        entries = [(k, e, r) for k, (_, e, r) in self._cache.items() if e is not None]
+        if not entries:
+            return None
+
+        matrix = np.stack([e for _, e, _ in entries])
+        scores = matrix @ embedding
+        best = int(scores.argmax())
+        if scores[best] >= self._threshold:
+            self._cache.move_to_end(entries[best][0])
+            return entries[best][2]
+        return None
+
+    def _embed(self, text: str):
+        """计算归一化 embedding，失败则永久退化为仅精确缓存"""
+        if self._embedder_failed:
+            return None
+        try:
+            import numpy as np
+            if self._embedder is None:
+                from rag import get_rag
+                rag = get_rag()
+                if not rag._initialized:
+                    rag.initialize()
+                if rag.embeddings is None:
+                    raise RuntimeError("RAG embeddings 不可用")
+                self._embedder = rag.embeddings
+            vec = np.asarray(self._embedder.embed_query(text), dtype=np.float32)
+            norm = np.linalg.norm(vec)
+            return vec / norm if norm > 0 else None
+        except Exception as e:
+            logger.warning(f"[LLMCache] embedding 不可用，退化为精确缓存: {e}")
+            self._embedder_failed = True
+            return None
+
+    # ── 透传 ──────────────────────────────────────────────
+
+    def __getattr__(self, name):
+        return getattr(self._llm, name)
@@ -28,6 +28,9 @@ class AgentState(TypedDict):
     # Executor 执行结果
     execution_result: Optional[str]
 
+    # Tactical 随技能决策一并给出的观察提示（执行全部成功时可省掉 Observe LLM 调用）
+    observe_hint: Optional[dict]
+
     # 控制流
     iteration_count: int
     max_iterations: int
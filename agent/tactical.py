@@ -4,9 +4,11 @@ Tactical Agent - 战术决策节点
 技能列表从 SKILL_REGISTRY 动态生成，不在此处写死
 """
 import json
+from functools import lru_cache
 from langchain_core.messages import SystemMessage, HumanMessage
 from loguru import logger
 
+from . import artifacts
 from .state import AgentState
 
 
@@ -27,7 +29,8 @@ TACTICAL_SYSTEM_PROMPT_TEMPLATE = """你是一名战术AI参谋。你的职责
             "params": {{"参数名": "参数值"}},
             "reason": "选择此技能的理由"
         }}
-    ]
+    ],
+    "observe_hint": {{"continue": false, "reason": "假设上述技能全部执行成功，任务是否还需继续及原因"}}
 }}
 ```
 
@@ -35,6 +38,7 @@ TACTICAL_SYSTEM_PROMPT_TEMPLATE = """你是一名战术AI参谋。你的职责
 - 只选择上述列表中的技能
 - 参数必须基于当前态势中的实际数据（单元名称、位置等）
 - 考虑执行顺序的合理性（如先开雷达再截击）
+- observe_hint 描述的是"全部技能执行成功"前提下的结论；无法判断时可省略该字段
 """
 
 
@@ -72,19 +76,81 @@ def _build_skill_list_prompt() -> str:
     return "\n".join(parts)
 
 
+@lru_cache(maxsize=1)
+def _rendered_system_prompt() -> str:
+    """完整渲染后的系统提示词（SKILL_REGISTRY 运行期不变，只渲染一次）"""
+    return TACTICAL_SYSTEM_PROMPT_TEMPLATE.format(skill_list=_build_skill_list_prompt())
+
+
+@lru_cache(maxsize=1)
+def _rendered_system_message() -> SystemMessage:
+    """预构造的系统消息对象，省掉每次调用的 pydantic 构造"""
+    return SystemMessage(content=_rendered_system_prompt())
+
+
+def reset_tactical_prompt_cache():
+    """清空提示词缓存（技能注册表变化或 config.reload() 后调用）"""
+    _rendered_system_prompt.cache_clear()
+    _rendered_system_message.cache_clear()
+
+
+_JSON_DECODER = json.JSONDecoder()
+
+
+def _has_complete_json(text: str) -> bool:
+    """文本中是否已出现一个完整闭合的 JSON 对象（raw_decode，不构建完整 AST 校验链）"""
+    pos = text.find("{")
+    if pos == -1:
+        return False
+    try:
+        _JSON_DECODER.raw_decode(text, pos)
+        return True
+    except json.JSONDecodeError:
+        return False
+
+
+def _stream_skill_decision(llm, messages) -> str:
+    """流式获取技能决策
+
+    边收 token 边检查 JSON 是否闭合，决策 JSON 一旦完整立即停止消费，
+    不必等 LLM 把尾部说明文字全部生成完。不支持流式时退回 invoke。
+    """
+    try:
+        stream = llm.stream(messages)
+    except (AttributeError, NotImplementedError):
+        return llm.invoke(messages).content
+
+    parts = []
+    try:
+        for chunk in stream:
+            content = chunk.content
+            if not content:
+                continue
+            parts.append(content)
+            # 只有出现右花括号时才值得做一次完整性检查
+            if "}" in content and _has_complete_json("".join(parts)):
+                logger.debug("[Tactical] 决策 JSON 已闭合，提前结束流式接收")
+                break
+    except Exception as e:
+        if not parts:
+            logger.warning(f"[Tactical] 流式调用失败，退回普通调用: {e}")
+            return llm.invoke(messages).content
+        logger.warning(f"[Tactical] 流式接收中断，使用已接收内容: {e}")
+
+    return "".join(parts)
+
+
 def tactical_node(state: AgentState, llm) -> dict:
     """Tactical 节点 - 技能选择和参数确定"""
     logger.info("[Tactical] 开始战术决策...")
 
     tactical_intent = state.get("tactical_intent", "")
-    world_state_summary = state.get("world_state_summary", "")
-
-    # 动态生成技能列表
-    skill_list_text = _build_skill_list_prompt()
-    system_prompt = TACTICAL_SYSTEM_PROMPT_TEMPLATE.format(skill_list=skill_list_text)
+    # 态势摘要按引用存储，此处取回原文
+    world_state_summary = artifacts.resolve(state.get("world_state_summary", ""))
 
     messages = [
-        SystemMessage(content=system_prompt),
+        # 技能列表提示词（已缓存，注册表不变时不重复渲染/构造）
+        _rendered_system_message(),
         HumanMessage(content=f"""## 指挥官战术意图
 {tactical_intent}
 
@@ -94,13 +160,14 @@ def tactical_node(state: AgentState, llm) -> dict:
 请选择合适的技能并确定参数。"""),
     ]
 
-    response = llm.invoke(messages)
-    skill_decision = response.content
+    skill_decision = _stream_skill_decision(llm, messages)
 
     logger.info("[Tactical] 技能选择完成")
 
+    decision_ref = artifacts.put("skill", skill_decision)
+
     return {
         "selected_skill": skill_decision,
         "current_phase": "executor",
-        "messages": [HumanMessage(content=f"[Tactical] {skill_decision}")],
+        "messages": [HumanMessage(content=f"[Tactical] 技能决策已生成 -> {decision_ref}")],
     }
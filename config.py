@@ -59,6 +59,15 @@ def reload():
     log._reload()
     replay._reload()
 
+    # 使 agent 侧缓存失效（仅在相应模块已加载时处理，避免引入重依赖）
+    import sys
+    graph_mod = sys.modules.get("agent.graph")
+    if graph_mod is not None:
+        graph_mod.reset_agent_graph()
+    tactical_mod = sys.modules.get("agent.tactical")
+    if tactical_mod is not None:
+        tactical_mod.reset_tactical_prompt_cache()
+
 
 # ── 配置类 ────────────────────────────────────────────────
 
@@ -72,6 +81,8 @@ class SimEngineConfig:
         self.HOST: str = _getenv("SIM_ENGINE_HOST", "localhost")
         self.PORT: int = int(_getenv("SIM_ENGINE_PORT", "8080"))
         self.HTTP_TIMEOUT: float = float(_getenv("SIM_ENGINE_HTTP_TIMEOUT", "10.0"))
+        # 单元状态 GET 的缓存 TTL（毫秒，0 表示关闭）
+        self.GET_CACHE_TTL_MS: float = float(_getenv("SIM_ENGINE_GET_CACHE_TTL_MS", "100"))
 
     @property
     def base_url(self) -> str:
@@ -89,6 +100,8 @@ class LLMConfig:
         self.MODEL_NAME: str = _getenv("QWEN_MODEL_NAME", "qwen-plus")
         self.TEMPERATURE: float = float(_getenv("LLM_TEMPERATURE", "0.3"))
         self.TOP_P: float = float(_getenv("LLM_TOP_P", "0.8"))
+        # JSON 模式：模型直接输出纯 JSON，响应解析走快速路径
+        self.JSON_MODE: bool = _getenv("LLM_JSON_MODE", "true").lower() in ("1", "true", "yes")
 
 
 class AgentConfig:
@@ -100,6 +113,12 @@ class AgentConfig:
     def _reload(self):
         self.MAX_ITERATIONS: int = int(_getenv("AGENT_MAX_ITERATIONS", "50"))
         self.TIMEOUT_SECONDS: int = int(_getenv("AGENT_TIMEOUT_SECONDS", "30"))
+        # LLM 调用缓存（0 表示关闭）
+        self.LLM_CACHE_SIZE: int = int(_getenv("AGENT_LLM_CACHE_SIZE", "128"))
+        self.LLM_CACHE_TTL: float = float(_getenv("AGENT_LLM_CACHE_TTL", "600"))
+        self.LLM_CACHE_SIMILARITY: float = float(_getenv("AGENT_LLM_CACHE_SIMILARITY", "0.97"))
+        # 技能指令派发池的最大在飞请求数
+        self.COMMAND_POOL_SIZE: int = int(_getenv("AGENT_COMMAND_POOL_SIZE", "2"))
 
 
 class RAGConfig:
@@ -110,9 +129,40 @@ class RAGConfig:
 
     def _reload(self):
         self.EMBEDDING_MODEL: str = _getenv("RAG_EMBEDDING_MODEL", "text-embedding-v3")
+        # DashScope 不可用时的本地 embedding 降级模型（sentence-transformers）
+        self.LOCAL_EMBEDDING_MODEL: str = _getenv(
+            "RAG_LOCAL_EMBEDDING_MODEL", "paraphrase-multilingual-MiniLM-L12-v2",
+        )
         self.CHUNK_SIZE: int = int(_getenv("RAG_CHUNK_SIZE", "800"))
         self.CHUNK_OVERLAP: int = int(_getenv("RAG_CHUNK_OVERLAP", "100"))
         self.RETRIEVE_TOP_K: int = int(_getenv("RAG_RETRIEVE_TOP_K", "3"))
+        # 向量库构建时每批 embedding 的文本条数（DashScope 单请求上限约 25）
+        self.EMBED_BATCH_SIZE: int = int(_getenv("RAG_EMBED_BATCH_SIZE", "25"))
+        # embedding 批次的并发提交数
+        self.EMBED_CONCURRENCY: int = int(_getenv("RAG_EMBED_CONCURRENCY", "8"))
+        # retrieve 精确匹配缓存容量（LRU）
+        self.QUERY_CACHE_SIZE: int = int(_getenv("RAG_QUERY_CACHE_SIZE", "512"))
+        # HNSW 索引参数：M 为图的出度，EF_SEARCH 为检索时的候选宽度
+        self.HNSW_M: int = int(_getenv("RAG_HNSW_M", "32"))
+        self.HNSW_EF_SEARCH: int = int(_getenv("RAG_HNSW_EF_SEARCH", "64"))
+        # 向量存储精度：fp32（无损）/ fp16 / int8（标量量化，省内存）
+        self.QUANTIZER: str = _getenv("RAG_QUANTIZER", "fp32").lower()
+        # 片段数达到阈值时改用 IVF+PQ 倒排索引，NPROBE 为检索探测的聚类数
+        self.IVF_THRESHOLD: int = int(_getenv("RAG_IVF_THRESHOLD", "50000"))
+        self.IVF_NPROBE: int = int(_getenv("RAG_IVF_NPROBE", "16"))
+        # retrieve 语义缓存容量与命中阈值（余弦相似度）
+        self.SEMANTIC_CACHE_SIZE: int = int(_getenv("RAG_SEMANTIC_CACHE_SIZE", "128"))
+        self.SEMANTIC_CACHE_SIMILARITY: float = float(_getenv("RAG_SEMANTIC_CACHE_SIMILARITY", "0.95"))
+        # 注入 Commander 提示词的知识上下文字符预算（prefill 成本与前缀长度成正比）
+        self.MAX_CONTEXT_CHARS: int = int(_getenv("RAG_MAX_CONTEXT_CHARS", "4000"))
+        # 首次 get_rag() 时即初始化并预热（默认惰性初始化）
+        self.EAGER_INIT: bool = _getenv("RAG_EAGER_INIT", "false").lower() in ("1", "true", "yes")
+        # 预热查询（逗号分隔），用于填充检索缓存
+        self.WARMUP_QUERIES: list = [
+            q.strip() for q in _getenv(
+                "RAG_WARMUP_QUERIES", "空战战术,电子干扰压制,武器发射条件",
+            ).split(",") if q.strip()
+        ]
         self.KNOWLEDGE_BASE_DIR: str = _resolve_path(
             "RAG_KNOWLEDGE_BASE_DIR", os.path.join("rag", "knowledge_base"),
         )
@@ -9,6 +9,7 @@ from loguru import logger
 
 import config
 from mcp.client import get_client
+from utils.logger import setup_logger
 from utils.replay import new_session, get_recorder
 from agent.graph import run_agent, create_agent_graph
 
@@ -154,6 +155,10 @@ def main():
 
     args = parser.parse_args()
 
+    # 初始化日志系统：挂控制台/文件 sink，并把 stdlib logging
+    # （mcp 客户端/工具层的热路径日志）桥接进 loguru
+    setup_logger()
+
     # 覆盖配置
     if args.host:
         config.sim_engine.HOST = args.host
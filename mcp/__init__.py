@@ -2,9 +2,11 @@ from .tools import (
     # 基础查询
     get_world_state,
     get_unit_state,
+    get_units_states_bulk,
     get_units_list,
     query_equipment,
     get_simulation_status,
+    mcp_batch,
     # 基础控制
     control_equipment,
     alter_unit,
@@ -33,7 +35,8 @@ from .tools import (
 )
 
 __all__ = [
-    "get_world_state", "get_unit_state", "get_units_list", "query_equipment", "get_simulation_status",
+    "get_world_state", "get_unit_state", "get_units_states_bulk", "get_units_list",
+    "query_equipment", "get_simulation_status", "mcp_batch",
     "control_equipment", "alter_unit", "assign_mission",
     "platform_move_to_pos", "platform_move_to_direction", "platform_patrol",
     "platform_return_land", "platform_formation",
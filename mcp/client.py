@@ -3,11 +3,91 @@ HTTP 客户端封装
 负责与 C++ AiHttpService 通信
 """
 import httpx
-from loguru import logger
-from typing import Any, Optional
+import logging
+import time
+from contextvars import ContextVar
+from typing import Any, Iterator, NamedTuple, Optional
+
+try:
+    # 并发负载下 httpx.AsyncClient 延迟劣化明显，异步路径优先 aiohttp
+    import aiohttp
+except ImportError:  # aiohttp 未安装时异步路径回退 httpx
+    aiohttp = None
+
+try:
+    import orjson
+
+    def _loads(data):
+        """orjson 解码（C 扩展，大响应下比 stdlib 快数倍）"""
+        return orjson.loads(data)
+
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+except ImportError:  # orjson 未安装时回退 stdlib
+    import json as _json
+
+    _loads = _json.loads
+
+    def _dumps(obj) -> bytes:
+        return _json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+try:
+    # HTTP/2 多路复用需要 h2 包（httpx[http2]），缺失时继续用 HTTP/1.1
+    import h2  # noqa: F401
+    _HTTP2 = True
+except ImportError:
+    _HTTP2 = False
+
+# keep-alive 连接池：避免每次请求重新 TCP 握手
+_POOL_LIMITS = httpx.Limits(
+    max_connections=100, max_keepalive_connections=20, keepalive_expiry=60,
+)
 
 import config
 
+# 热路径用 stdlib logger + %-延迟格式化（无 loguru 取帧开销），
+# 记录经 utils.logger.InterceptHandler 汇入统一的 loguru sink
+logger = logging.getLogger(__name__)
+
+
+class _RawResponseReader:
+    """把 httpx 流式响应适配成 ijson 需要的 read() 文件接口"""
+
+    def __init__(self, response):
+        self._chunks = response.iter_raw()
+        self._buffer = b""
+
+    def read(self, size: int = -1) -> bytes:
+        if size < 0:
+            return self._buffer + b"".join(self._chunks)
+        while len(self._buffer) < size:
+            try:
+                self._buffer += next(self._chunks)
+            except StopIteration:
+                break
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+
+def _is_idempotent_get(path: str) -> bool:
+    """同一仿真刻内结果不变的只读路由（tick 级缓存白名单）"""
+    return path == "/api/units" or path.endswith("/detail")
+
+
+def _is_unit_state_get(path: str) -> bool:
+    """单元状态路由（短 TTL 缓存，写该单元后失效）"""
+    return path.startswith("/api/unit/") and path.endswith("/state")
+
+
+class RouteSpec(NamedTuple):
+    """预注册路由：方法 + 路径模板
+
+    headers 在客户端构造时已注册，路径模板为模块级常量，
+    热路径只剩一次 %-格式化和一次 HTTP 调用。
+    """
+    method: str
+    template: str
+
 
 class SimEngineClient:
     """C++ 仿真引擎 HTTP 客户端"""
@@ -17,6 +97,16 @@ class SimEngineClient:
         self.timeout = timeout if timeout is not None else config.sim_engine.HTTP_TIMEOUT
         self._client: Optional[httpx.Client] = None
         self._async_client: Optional[httpx.AsyncClient] = None
+        # 热路径预绑定的 bound method（客户端创建时填充，
+        # 每次请求省一次描述符查找 + bound-method 分配）
+        self._client_get = None
+        self._client_post = None
+        # tick 级只读缓存：仿真刻推进或任何写操作后整体失效
+        self._tick_cache: dict[str, dict] = {}
+        self._cache_sim_time: float = -1.0
+        # 单元状态 GET 的短 TTL 缓存：同一决策 tick 内多个技能对同一
+        # 单元的重复读直接命中，写该单元后按前缀失效
+        self._state_cache: dict[str, tuple[float, dict]] = {}
 
     @property
     def client(self) -> httpx.Client:
@@ -26,129 +116,375 @@ class SimEngineClient:
                 base_url=self.base_url,
                 timeout=self.timeout,
                 headers={"Content-Type": "application/json"},
+                limits=_POOL_LIMITS,
+                http2=_HTTP2,
             )
+            self._client_get = self._client.get
+            self._client_post = self._client.post
         return self._client
 
     @property
-    def async_client(self) -> httpx.AsyncClient:
-        """获取异步 HTTP 客户端（惰性创建）"""
+    def async_client(self):
+        """获取异步 HTTP 客户端（惰性创建）
+
+        优先使用 aiohttp.ClientSession（长连接池 + keep-alive，
+        高并发下延迟显著低于 httpx.AsyncClient），未安装时回退 httpx。
+        """
         if self._async_client is None:
-            self._async_client = httpx.AsyncClient(
-                base_url=self.base_url,
-                timeout=self.timeout,
-                headers={"Content-Type": "application/json"},
-            )
+            if aiohttp is not None:
+                self._async_client = aiohttp.ClientSession(
+                    connector=aiohttp.TCPConnector(
+                        limit=100, limit_per_host=100, keepalive_timeout=60,
+                    ),
+                    timeout=aiohttp.ClientTimeout(total=self.timeout),
+                    headers={"Content-Type": "application/json"},
+                )
+            else:
+                self._async_client = httpx.AsyncClient(
+                    base_url=self.base_url,
+                    timeout=self.timeout,
+                    headers={"Content-Type": "application/json"},
+                    limits=_POOL_LIMITS,
+                    http2=_HTTP2,
+                )
         return self._async_client
 
+    def _handle_transport_err(self, e: Exception, path: str) -> dict:
+        """冷路径：连接/传输层异常"""
+        if isinstance(e, httpx.ConnectError):
+            logger.error("无法连接到仿真引擎: %s%s", self.base_url, path)
+            return {"error": f"Connection refused: {self.base_url}"}
+        logger.error("请求异常: %s", e)
+        return {"error": str(e)}
+
+    def _handle_status_err(self, response, path: str) -> dict:
+        """冷路径：非 2xx/3xx 状态码"""
+        logger.error("HTTP 错误: %s - %s", response.status_code, path)
+        try:
+            return _loads(response.content)
+        except Exception:
+            return {"error": f"HTTP {response.status_code}: {path}"}
+
+    def _observe_sim_time(self, result) -> None:
+        """从响应提取 sim_time，仿真刻推进时整体失效 tick 缓存"""
+        if isinstance(result, dict):
+            sim_time = result.get("sim_time")
+            if sim_time is not None and sim_time != self._cache_sim_time:
+                self._cache_sim_time = sim_time
+                self._tick_cache.clear()
+                self._state_cache.clear()
+
+    def invalidate_cache(self) -> None:
+        """清空 tick 级只读缓存（写操作后调用，避免读到旧值）"""
+        self._tick_cache.clear()
+
+    def invalidate_unit_state(self, unit_name: str) -> None:
+        """失效指定单元的状态 TTL 缓存
+
+        客户端对该单元的任何 POST 都会自动调用；技能层在已知
+        态势剧变（单元被毁等）时也可显式调用。
+        """
+        prefix = f"/api/unit/{unit_name}"
+        for key in [k for k in self._state_cache if k.startswith(prefix)]:
+            del self._state_cache[key]
+
+    def _invalidate_unit_state(self, path: str) -> None:
+        """写操作后失效状态 TTL 缓存
+
+        POST 到某单元时只失效该单元前缀下的键；非单元路径的写
+        （任务、批量接口等）影响范围不明，整体清空。
+        """
+        if not self._state_cache:
+            return
+        if path.startswith("/api/unit/"):
+            self.invalidate_unit_state(path[len("/api/unit/"):].split("/", 1)[0])
+        else:
+            self._state_cache.clear()
+
     def get(self, path: str, params: dict = None) -> dict:
-        """同步 GET 请求"""
+        """同步 GET 请求（成功路径无异常构造，错误处理移到冷路径方法）
+
+        白名单内的幂等只读路由在同一仿真刻内直接命中缓存，免一次 RTT；
+        单元状态路由走短 TTL 缓存（SIM_ENGINE_GET_CACHE_TTL_MS）。
+        """
+        cacheable = params is None and _is_idempotent_get(path)
+        if cacheable:
+            hit = self._tick_cache.get(path)
+            if hit is not None:
+                return hit
+        state_ttl = 0.0
+        if not cacheable and params is None and _is_unit_state_get(path):
+            state_ttl = config.sim_engine.GET_CACHE_TTL_MS / 1000.0
+            if state_ttl > 0:
+                hit = self._state_cache.get(path)
+                if hit is not None and time.monotonic() - hit[0] < state_ttl:
+                    return hit[1]
+        if self._client is None:
+            _ = self.client  # 触发惰性创建并预绑定方法
         try:
-            response = self.client.get(path, params=params)
-            response.raise_for_status()
-            return response.json()
-        except httpx.ConnectError:
-            logger.error(f"无法连接到仿真引擎: {self.base_url}{path}")
-            return {"error": f"Connection refused: {self.base_url}"}
-        except httpx.HTTPStatusError as e:
-            logger.error(f"HTTP 错误: {e.response.status_code} - {path}")
-            try:
-                return e.response.json()
-            except Exception:
-                return {"error": str(e)}
+            response = self._client_get(path, params=params)
         except Exception as e:
-            logger.error(f"请求异常: {e}")
-            return {"error": str(e)}
+            return self._handle_transport_err(e, path)
+        if response.status_code < 400:
+            result = _loads(response.content)
+            self._observe_sim_time(result)
+            if isinstance(result, dict) and "error" not in result:
+                if cacheable:
+                    self._tick_cache[path] = result
+                elif state_ttl > 0:
+                    self._state_cache[path] = (time.monotonic(), result)
+            return result
+        return self._handle_status_err(response, path)
 
     def post(self, path: str, data: dict = None) -> dict:
-        """同步 POST 请求"""
+        """同步 POST 请求（请求体 orjson 预序列化，Content-Type 已注册）
+
+        写操作成功后整体失效 tick 级只读缓存。
+        """
+        if self._client is None:
+            _ = self.client
         try:
-            response = self.client.post(path, json=data or {})
-            response.raise_for_status()
-            return response.json()
-        except httpx.ConnectError:
-            logger.error(f"无法连接到仿真引擎: {self.base_url}{path}")
-            return {"error": f"Connection refused: {self.base_url}"}
-        except httpx.HTTPStatusError as e:
-            logger.error(f"HTTP 错误: {e.response.status_code} - {path}")
-            try:
-                return e.response.json()
-            except Exception:
-                return {"error": str(e)}
+            response = self._client_post(path, content=_dumps(data or {}))
         except Exception as e:
-            logger.error(f"请求异常: {e}")
-            return {"error": str(e)}
+            return self._handle_transport_err(e, path)
+        if response.status_code < 400:
+            self.invalidate_cache()
+            self._invalidate_unit_state(path)
+            result = _loads(response.content)
+            self._observe_sim_time(result)
+            return result
+        return self._handle_status_err(response, path)
 
     async def async_get(self, path: str, params: dict = None) -> dict:
         """异步 GET 请求"""
+        if aiohttp is not None:
+            try:
+                async with self.async_client.get(self.base_url + path, params=params) as response:
+                    body = await response.read()
+                    if response.status >= 400:
+                        # 与 _handle_status_err 一致：保留引擎返回的结构化错误体
+                        logger.error("HTTP 错误: %s - %s", response.status, path)
+                        try:
+                            return _loads(body)
+                        except Exception:
+                            return {"error": f"HTTP {response.status}: {path}"}
+                    return _loads(body)
+            except aiohttp.ClientConnectorError:
+                logger.error("无法连接到仿真引擎: %s%s", self.base_url, path)
+                return {"error": f"Connection refused: {self.base_url}"}
+            except Exception as e:
+                logger.error("请求异常: %s", e)
+                return {"error": str(e)}
+
         try:
             response = await self.async_client.get(path, params=params)
             response.raise_for_status()
-            return response.json()
+            return _loads(response.content)
         except httpx.ConnectError:
-            logger.error(f"无法连接到仿真引擎: {self.base_url}{path}")
+            logger.error("无法连接到仿真引擎: %s%s", self.base_url, path)
             return {"error": f"Connection refused: {self.base_url}"}
         except httpx.HTTPStatusError as e:
-            logger.error(f"HTTP 错误: {e.response.status_code} - {path}")
+            logger.error("HTTP 错误: %s - %s", e.response.status_code, path)
             try:
                 return e.response.json()
             except Exception:
                 return {"error": str(e)}
         except Exception as e:
-            logger.error(f"请求异常: {e}")
+            logger.error("请求异常: %s", e)
             return {"error": str(e)}
 
     async def async_post(self, path: str, data: dict = None) -> dict:
         """异步 POST 请求"""
+        if aiohttp is not None:
+            try:
+                async with self.async_client.post(self.base_url + path, data=_dumps(data or {})) as response:
+                    body = await response.read()
+                    if response.status >= 400:
+                        # 与 _handle_status_err 一致：保留引擎返回的结构化错误体
+                        logger.error("HTTP 错误: %s - %s", response.status, path)
+                        try:
+                            return _loads(body)
+                        except Exception:
+                            return {"error": f"HTTP {response.status}: {path}"}
+                    return _loads(body)
+            except aiohttp.ClientConnectorError:
+                logger.error("无法连接到仿真引擎: %s%s", self.base_url, path)
+                return {"error": f"Connection refused: {self.base_url}"}
+            except Exception as e:
+                logger.error("请求异常: %s", e)
+                return {"error": str(e)}
+
         try:
-            response = await self.async_client.post(path, json=data or {})
+            response = await self.async_client.post(path, content=_dumps(data or {}))
             response.raise_for_status()
-            return response.json()
+            return _loads(response.content)
         except httpx.ConnectError:
-            logger.error(f"无法连接到仿真引擎: {self.base_url}{path}")
+            logger.error("无法连接到仿真引擎: %s%s", self.base_url, path)
             return {"error": f"Connection refused: {self.base_url}"}
         except httpx.HTTPStatusError as e:
-            logger.error(f"HTTP 错误: {e.response.status_code} - {path}")
+            logger.error("HTTP 错误: %s - %s", e.response.status_code, path)
             try:
                 return e.response.json()
             except Exception:
                 return {"error": str(e)}
         except Exception as e:
-            logger.error(f"请求异常: {e}")
+            logger.error("请求异常: %s", e)
             return {"error": str(e)}
 
+    def stream_get_json(self, path: str) -> dict:
+        """流式 GET + 单遍解码（适合大响应，如完整世界态势）
+
+        普通响应路径会先整体缓冲、再按字符集解码为 str、再解析 JSON；
+        这里流式收取原始字节后直接 orjson 解码，省掉中间文本拷贝。
+        逐单元惰性迭代见 iter_world_state。
+        """
+        try:
+            with self.client.stream("GET", path) as response:
+                if response.status_code >= 400:
+                    response.read()
+                    return self._handle_status_err(response, path)
+                result = _loads(response.read())
+                self._observe_sim_time(result)
+                return result
+        except Exception as e:
+            return self._handle_transport_err(e, path)
+
+    def call(self, spec: RouteSpec, args: tuple = (), body: dict = None) -> dict:
+        """按预注册路由发起请求"""
+        path = spec.template % args if args else spec.template
+        if spec.method == "GET":
+            return self.get(path)
+        return self.post(path, body)
+
+    def batch(self, ops: list[dict]) -> list[dict]:
+        """把多个子请求合并为一次 /api/batch 往返
+
+        每个 op 形如 {"method": "GET", "path": "..."}，POST 可带 "body"。
+        服务端按序分发给既有 handler 并拼接响应；引擎不支持该端点时
+        回退为客户端侧执行（纯 GET 走并发批量，混合请求按序执行）。
+        """
+        if not ops:
+            return []
+        result = self.post("/api/batch", {"ops": ops})
+        if isinstance(result, dict):
+            responses = result.get("responses")
+            if isinstance(responses, list):
+                return responses
+
+        if all(op.get("method", "GET").upper() == "GET" for op in ops):
+            return self.batch_get([op["path"] for op in ops])
+        return [
+            self.get(op["path"]) if op.get("method", "GET").upper() == "GET"
+            else self.post(op["path"], op.get("body"))
+            for op in ops
+        ]
+
+    def batch_get(self, paths: list[str]) -> list[dict]:
+        """批量并发 GET：一波提交所有独立请求，N 个串行 RTT 摊平为 1 个
+
+        无事件循环的同步上下文用 asyncio.gather 并发发起全部请求；
+        已处于运行中的事件循环时（无法嵌套 run）退回线程池并发。
+        结果顺序与 paths 一致。
+        """
+        if not paths:
+            return []
+        import asyncio
+
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            async def _gather():
+                try:
+                    return await asyncio.gather(*(self.async_get(p) for p in paths))
+                finally:
+                    # 异步会话绑定本次临时事件循环，就地关闭避免跨循环复用
+                    if self._async_client is not None:
+                        closer = getattr(self._async_client, "aclose", self._async_client.close)
+                        await closer()
+                        self._async_client = None
+            return asyncio.run(_gather())
+
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=min(16, len(paths))) as pool:
+            return list(pool.map(self.get, paths))
+
+    def iter_world_state(self) -> "Iterator[tuple]":
+        """流式解析 /api/world_state，不物化完整嵌套 dict
+
+        依次产出 ("sim_time", float) 和 ("unit", dict)。
+        大场景（数百单元）下峰值内存只与单个单元大小相关。
+        需要 ijson，未安装时抛 ImportError 由调用方回退整体解析。
+        """
+        import ijson
+
+        with self.client.stream("GET", "/api/world_state") as response:
+            response.raise_for_status()
+            builder = None
+            for prefix, event, value in ijson.parse(_RawResponseReader(response)):
+                if builder is not None:
+                    builder.event(event, value)
+                    if prefix == "units.item" and event == "end_map":
+                        yield ("unit", builder.value)
+                        builder = None
+                elif prefix == "units.item" and event == "start_map":
+                    builder = ijson.ObjectBuilder()
+                    builder.event(event, value)
+                elif prefix == "sim_time" and event == "number":
+                    yield ("sim_time", float(value))
+
     def health_check(self) -> bool:
         """检查仿真引擎是否可连接"""
         result = self.get("/api/health")
         return result.get("status") == "ok"
 
-    def close(self):
+    def close(self) -> None:
         """关闭客户端连接"""
         if self._client:
             self._client.close()
             self._client = None
+            self._client_get = None
+            self._client_post = None
         if self._async_client:
             import asyncio
+            # aiohttp 会话用 close()，httpx 用 aclose()
+            closer = getattr(self._async_client, "aclose", self._async_client.close)
             try:
-                loop = asyncio.get_event_loop()
-                if loop.is_running():
-                    loop.create_task(self._async_client.aclose())
-                else:
-                    loop.run_until_complete(self._async_client.aclose())
-            except Exception:
-                pass
+                # 有运行中的事件循环则投递任务，否则起临时循环同步关闭
+                asyncio.get_running_loop().create_task(closer())
+            except RuntimeError:
+                try:
+                    asyncio.run(closer())
+                except Exception:
+                    pass
             self._async_client = None
 
-    def __del__(self):
-        self.close()
-
 
 # 全局客户端实例
 _client: Optional[SimEngineClient] = None
 
+# 上下文级覆盖：并发 worker（asyncio.Task / 线程）可注入独立实例，
+# 未设置时所有任务共享全局单例及其连接池
+_client_cv: ContextVar[Optional[SimEngineClient]] = ContextVar("sim_engine_client", default=None)
+
+
+def set_client(client: SimEngineClient):
+    """在当前上下文内覆盖客户端实例（返回 Token 可用于恢复）"""
+    return _client_cv.set(client)
+
 
 def get_client() -> SimEngineClient:
-    """获取全局客户端实例"""
+    """获取当前上下文的客户端实例
+
+    优先读 contextvar 覆盖，否则回退全局单例；
+    首次创建单例时注册进程退出清理。
+    """
+    client = _client_cv.get()
+    if client is not None:
+        return client
     global _client
     if _client is None:
         _client = SimEngineClient()
+        # 显式退出钩子代替 __del__：连接关闭不再落在 GC 上
+        import atexit
+        atexit.register(_client.close)
     return _client
@@ -1,98 +1,192 @@
 """
-Pydantic 数据模型定义
+数据模型定义
 映射 C++ 仿真引擎的数据结构到 Python 类型
+
+响应侧模型与 C++ 结构一一对应、无需类型强转，使用带 __slots__ 的
+dataclass（免去 Pydantic 每实例的校验与 __dict__ 开销，大场景下
+一次态势解码要分配数千个实例）；请求侧模型保留 Pydantic 校验。
 """
+from dataclasses import dataclass, field
 from typing import Optional
 from pydantic import BaseModel, Field
 
 
 # ============================================================================
-# 基础数据模型
+# 基础数据模型（响应侧，slots dataclass）
 # ============================================================================
 
-class Position(BaseModel):
+@dataclass(slots=True)
+class Position:
     """地理位置（经纬高）"""
-    latitude: float = Field(description="纬度（度）")
-    longitude: float = Field(description="经度（度）")
-    altitude: float = Field(description="高度（米）")
+    latitude: float = 0.0
+    longitude: float = 0.0
+    altitude: float = 0.0
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Position":
+        return cls(
+            latitude=data.get("latitude", 0.0),
+            longitude=data.get("longitude", 0.0),
+            altitude=data.get("altitude", 0.0),
+        )
 
 
-class Orientation(BaseModel):
+@dataclass(slots=True)
+class Orientation:
     """姿态角"""
-    pitch: float = Field(description="俯仰角（度）")
-    heading: float = Field(description="航向角（度）")
-    roll: float = Field(description="滚转角（度）")
+    pitch: float = 0.0
+    heading: float = 0.0
+    roll: float = 0.0
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Orientation":
+        return cls(
+            pitch=data.get("pitch", 0.0),
+            heading=data.get("heading", 0.0),
+            roll=data.get("roll", 0.0),
+        )
 
 
 # ============================================================================
 # 装备数据模型
 # ============================================================================
 
-class EquipmentInfo(BaseModel):
-    """装备信息"""
-    entity_id: int = Field(description="装备实体 ID")
-    entity_name: str = Field(description="装备名称")
-    class_name: str = Field(default="", description="装备类名")
-    type: str = Field(description="装备类型: radar/jammer/communication/sensor/weapon_system/platform")
-    status: str = Field(description="装备状态: ON/OFF/FAULT")
+@dataclass(slots=True)
+class EquipmentInfo:
+    """装备信息
+
+    type: radar/jammer/communication/sensor/weapon_system/platform
+    status: ON/OFF/FAULT
+    """
+    entity_id: int = 0
+    entity_name: str = ""
+    class_name: str = ""
+    type: str = ""
+    status: str = ""
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "EquipmentInfo":
+        return cls(
+            entity_id=data.get("entity_id", 0),
+            entity_name=data.get("entity_name", ""),
+            class_name=data.get("class_name", ""),
+            type=data.get("type", ""),
+            status=data.get("status", ""),
+        )
 
 
 # ============================================================================
 # 单元数据模型
 # ============================================================================
 
-class UnitSummary(BaseModel):
+@dataclass(slots=True)
+class UnitSummary:
     """单元摘要信息"""
-    unit_id: int = Field(description="单元 ID")
-    unit_name: str = Field(description="单元名称")
-    unit_type: str = Field(default="", description="单元类型")
-    forceside: str = Field(default="", description="所属方")
-    alive: bool = Field(default=True, description="是否存活")
-    active: bool = Field(default=True, description="是否激活")
-
-
-class UnitState(BaseModel):
+    unit_id: int = 0
+    unit_name: str = ""
+    unit_type: str = ""
+    forceside: str = ""
+    alive: bool = True
+    active: bool = True
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "UnitSummary":
+        return cls(
+            unit_id=data.get("unit_id", 0),
+            unit_name=data.get("unit_name", ""),
+            unit_type=data.get("unit_type", ""),
+            forceside=data.get("forceside", ""),
+            alive=data.get("alive", True),
+            active=data.get("active", True),
+        )
+
+
+@dataclass(slots=True)
+class UnitState:
     """单元完整状态"""
-    unit_id: int = Field(description="单元 ID")
-    unit_name: str = Field(description="单元名称")
-    unit_type: str = Field(default="", description="单元类型")
-    dictionary_name: str = Field(default="", description="字典名称")
-    forceside: str = Field(default="", description="所属方")
-    position: Position = Field(description="地理位置")
-    orientation: Orientation = Field(description="姿态角")
-    speed: float = Field(description="速度（m/s）")
-    alive: bool = Field(default=True, description="是否存活")
-    active: bool = Field(default=True, description="是否激活")
-    commander_id: int = Field(default=-1, description="指挥官单元 ID")
-    commander_name: str = Field(default="", description="指挥官名称")
-    equipment: list[EquipmentInfo] = Field(default_factory=list, description="装备列表")
+    unit_id: int = 0
+    unit_name: str = ""
+    unit_type: str = ""
+    dictionary_name: str = ""
+    forceside: str = ""
+    position: Position = field(default_factory=Position)
+    orientation: Orientation = field(default_factory=Orientation)
+    speed: float = 0.0
+    alive: bool = True
+    active: bool = True
+    commander_id: int = -1
+    commander_name: str = ""
+    equipment: list[EquipmentInfo] = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "UnitState":
+        return cls(
+            unit_id=data.get("unit_id", 0),
+            unit_name=data.get("unit_name", ""),
+            unit_type=data.get("unit_type", ""),
+            dictionary_name=data.get("dictionary_name", ""),
+            forceside=data.get("forceside", ""),
+            position=Position.from_dict(data.get("position", {})),
+            orientation=Orientation.from_dict(data.get("orientation", {})),
+            speed=data.get("speed", 0.0),
+            alive=data.get("alive", True),
+            active=data.get("active", True),
+            commander_id=data.get("commander_id", -1),
+            commander_name=data.get("commander_name", ""),
+            equipment=[EquipmentInfo.from_dict(e) for e in data.get("equipment", [])],
+        )
 
 
 # ============================================================================
 # 世界状态
 # ============================================================================
 
-class WorldState(BaseModel):
+@dataclass(slots=True)
+class WorldState:
     """全局世界状态"""
-    sim_time: float = Field(description="仿真时间")
-    units: list[UnitState] = Field(default_factory=list, description="所有单元状态")
+    sim_time: float = 0.0
+    units: list[UnitState] = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "WorldState":
+        return cls(
+            sim_time=data.get("sim_time", 0.0),
+            units=[UnitState.from_dict(u) for u in data.get("units", [])],
+        )
 
 
-class UnitsListResponse(BaseModel):
+@dataclass(slots=True)
+class UnitsListResponse:
     """单元列表响应"""
-    count: int = Field(description="单元数量")
-    units: list[UnitSummary] = Field(default_factory=list, description="单元摘要列表")
+    count: int = 0
+    units: list[UnitSummary] = field(default_factory=list)
 
+    @classmethod
+    def from_dict(cls, data: dict) -> "UnitsListResponse":
+        return cls(
+            count=data.get("count", 0),
+            units=[UnitSummary.from_dict(u) for u in data.get("units", [])],
+        )
 
-class SimulationStatus(BaseModel):
+
+@dataclass(slots=True)
+class SimulationStatus:
     """仿真状态"""
-    status: str = Field(description="状态")
-    sim_time: float = Field(description="仿真时间")
-    http_server_running: bool = Field(description="HTTP 服务运行状态")
+    status: str = ""
+    sim_time: float = 0.0
+    http_server_running: bool = False
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "SimulationStatus":
+        return cls(
+            status=data.get("status", ""),
+            sim_time=data.get("sim_time", 0.0),
+            http_server_running=data.get("http_server_running", False),
+        )
 
 
 # ============================================================================
-# 控制请求模型
+# 控制请求模型（请求侧保留 Pydantic 校验）
 # ============================================================================
 
 class EquipmentControlRequest(BaseModel):
@@ -128,11 +222,25 @@ class MissionRequest(BaseModel):
 # 通用响应
 # ============================================================================
 
-class ActionResult(BaseModel):
+@dataclass(slots=True)
+class ActionResult:
     """操作结果响应"""
-    result: str = Field(description="操作结果: success/error")
-    unit_name: Optional[str] = Field(default=None, description="目标单元名称")
-    equipment_name: Optional[str] = Field(default=None, description="目标装备名称")
-    error: Optional[str] = Field(default=None, description="错误信息")
-    unit_state: Optional[UnitState] = Field(default=None, description="更新后的单元状态")
-    equipment_state: Optional[EquipmentInfo] = Field(default=None, description="更新后的装备状态")
+    result: str = ""
+    unit_name: Optional[str] = None
+    equipment_name: Optional[str] = None
+    error: Optional[str] = None
+    unit_state: Optional[UnitState] = None
+    equipment_state: Optional[EquipmentInfo] = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ActionResult":
+        unit_state = data.get("unit_state")
+        equipment_state = data.get("equipment_state")
+        return cls(
+            result=data.get("result", ""),
+            unit_name=data.get("unit_name"),
+            equipment_name=data.get("equipment_name"),
+            error=data.get("error"),
+            unit_state=UnitState.from_dict(unit_state) if unit_state else None,
+            equipment_state=EquipmentInfo.from_dict(equipment_state) if equipment_state else None,
+        )
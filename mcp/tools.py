@@ -3,11 +3,12 @@ MCP Tools 定义
 每个函数是一个可被 LangGraph Agent 调用的工具
 映射到 C++ AiHttpService 的 HTTP 端点
 """
-from typing import Optional
+import threading
+from queue import Queue
+from typing import Iterator, Optional
 from langchain_core.tools import tool
-from loguru import logger
 
-from .client import get_client
+from .client import RouteSpec, get_client
 from .schemas import (
     WorldState,
     UnitState,
@@ -17,15 +18,108 @@ from .schemas import (
     ActionResult,
 )
 from utils.replay import get_recorder
-
-
-def _record_call(tool_name: str, params: dict, result: dict):
-    """记录工具调用到回放系统"""
-    try:
-        sim_time = result.get("sim_time", 0.0)
-        get_recorder().record(tool_name, params, result, sim_time)
-    except Exception:
-        pass
+import logging
+
+# 热路径用 stdlib logger + %-延迟格式化，经 InterceptHandler 汇入 loguru sink
+logger = logging.getLogger(__name__)
+
+# 模块级绑定：工具热路径少一次全局查找
+_get_client = get_client
+
+
+# URL 路径模板（模块级常量 + %-格式化，比每次调用重建 f-string 更省
+# 一次格式化扫描；%s 两个以上替换时 % 快于 f-string）
+_PATH_UNIT_STATE = "/api/unit/%s/state"
+_PATH_EQUIP_QUERY = "/api/unit/%s/equipment/%s/query"
+_PATH_EQUIP_CONTROL = "/api/unit/%s/equipment/%s/control"
+_PATH_UNIT_ALTER = "/api/unit/%s/alter"
+_PATH_UNIT_MISSION = "/api/unit/%s/mission"
+_PATH_MOVE_TO_POS = "/api/unit/%s/platform/move_to_pos"
+_PATH_MOVE_TO_DIR = "/api/unit/%s/platform/move_to_dir"
+_PATH_PATROL = "/api/unit/%s/platform/patrol"
+_PATH_RETURN_LAND = "/api/unit/%s/platform/return_land"
+_PATH_FORMATION = "/api/unit/%s/platform/formation"
+_PATH_RADAR_DETAIL = "/api/unit/%s/radar/%s/detail"
+_PATH_JAMMER_DETAIL = "/api/unit/%s/jammer/%s/detail"
+_PATH_JAMMER_COMMAND = "/api/unit/%s/jammer/%s/command"
+_PATH_WEAPON_STATUS = "/api/unit/%s/weapon/%s/status"
+_PATH_WEAPON_LOCK = "/api/unit/%s/weapon/%s/lock"
+_PATH_WEAPON_LAUNCH = "/api/unit/%s/weapon/%s/launch"
+_PATH_WEAPON_ABORT = "/api/unit/%s/weapon/%s/abort"
+_PATH_COMM_DETAIL = "/api/unit/%s/comm/%s/detail"
+
+
+# 预注册路由表：每个工具对应 (方法, 路径模板)，热路径一次查表 + 一次调用
+_ROUTES: dict[str, RouteSpec] = {
+    "get_world_state": RouteSpec("GET", "/api/world_state"),
+    "get_units_list": RouteSpec("GET", "/api/units"),
+    "get_simulation_status": RouteSpec("GET", "/api/simulation/status"),
+    "get_unit_state": RouteSpec("GET", _PATH_UNIT_STATE),
+    "query_equipment": RouteSpec("GET", _PATH_EQUIP_QUERY),
+    "control_equipment": RouteSpec("POST", _PATH_EQUIP_CONTROL),
+    "alter_unit": RouteSpec("POST", _PATH_UNIT_ALTER),
+    "assign_mission": RouteSpec("POST", _PATH_UNIT_MISSION),
+    "platform_move_to_pos": RouteSpec("POST", _PATH_MOVE_TO_POS),
+    "platform_move_to_direction": RouteSpec("POST", _PATH_MOVE_TO_DIR),
+    "platform_patrol": RouteSpec("POST", _PATH_PATROL),
+    "platform_return_land": RouteSpec("POST", _PATH_RETURN_LAND),
+    "platform_formation": RouteSpec("POST", _PATH_FORMATION),
+    "get_radar_detail": RouteSpec("GET", _PATH_RADAR_DETAIL),
+    "get_jammer_detail": RouteSpec("GET", _PATH_JAMMER_DETAIL),
+    "jammer_command": RouteSpec("POST", _PATH_JAMMER_COMMAND),
+    "get_weapon_status": RouteSpec("GET", _PATH_WEAPON_STATUS),
+    "weapon_lock_target": RouteSpec("POST", _PATH_WEAPON_LOCK),
+    "weapon_launch": RouteSpec("POST", _PATH_WEAPON_LAUNCH),
+    "weapon_abort": RouteSpec("POST", _PATH_WEAPON_ABORT),
+    "get_comm_detail": RouteSpec("GET", _PATH_COMM_DETAIL),
+}
+
+
+# 控制类工具的可选字段键表（模块级常量，body 用一次 zip 推导构建，
+# 避免热路径上的多分支逐键赋值）
+_EQUIP_CONTROL_KEYS = ("power", "set_fault", "params")
+_ALTER_KEYS = ("latitude", "longitude", "altitude", "heading", "pitch", "roll", "speed", "active")
+_MISSION_OPT_KEYS = ("task_name", "task_old_name", "mission_time")
+
+# 常见"全默认参数"调用的预构建请求体尾部：命中时一次解包合并，
+# 不再逐键重建浮点常量字典
+_DEFAULT_FLIGHT_TAIL = {"altitude": 5000.0, "speed": 200.0, "turn_g": 3.0}
+_DEFAULT_PATROL_TAIL = {"altitude": 5000.0, "speed": 200.0}
+
+
+# 回放记录走后台队列：生产端 put_nowait 不阻塞工具返回路径，
+# 消费端单线程串行落盘。用 Queue 而非 SimpleQueue：task_done/join
+# 提供落盘前的排空屏障（见 flush_records）
+_record_q: Queue = Queue()
+
+
+def _drain_records() -> None:
+    """后台消费线程：逐条写入回放记录，异常不影响后续记录"""
+    while True:
+        tool_name, params, result, sim_time = _record_q.get()
+        try:
+            get_recorder().record(tool_name, params, result, sim_time)
+        except Exception:
+            pass
+        finally:
+            _record_q.task_done()
+
+
+threading.Thread(target=_drain_records, name="mcp-record-drain", daemon=True).start()
+
+
+def _record_call(tool_name: str, params: dict, result: dict) -> None:
+    """把工具调用投递到回放记录队列（非阻塞）"""
+    _record_q.put_nowait((tool_name, params, result, result.get("sim_time", 0.0)))
+
+
+def flush_records() -> None:
+    """等待队列中的回放记录全部写入 recorder
+
+    save() 前必须调用：消费线程是 daemon，末尾几条记录（如收官的
+    bvr_attack）可能仍在队列里，不排空就落盘会丢尾部记录。
+    """
+    _record_q.join()
 
 
 # ============================================================================
@@ -36,13 +130,39 @@ def _record_call(tool_name: str, params: dict, result: dict):
 def get_world_state() -> dict:
     """获取当前全局世界态势，包含所有作战单元的位置、姿态、速度、装备状态等信息。
     返回完整的战场态势数据，是 AI 决策的基础信息来源。"""
-    client = get_client()
-    result = client.get("/api/world_state")
+    client = _get_client()
+    # 态势响应可能很大，走流式单遍解码路径
+    result = client.stream_get_json("/api/world_state")
     _record_call("get_world_state", {}, result)
-    logger.info(f"[MCP] get_world_state -> {len(result.get('units', []))} units")
+    logger.debug("[MCP] get_world_state -> %s units", len(result.get("units", [])))
     return result
 
 
+def iter_world_state() -> Iterator[tuple]:
+    """流式遍历世界态势（普通生成器，非 LangChain 工具，供 Python 侧代码使用）
+
+    依次产出 ("sim_time", float) 和 ("unit", dict)，避免大场景下
+    物化完整的 world_state dict。ijson 不可用或引擎不支持流式响应时
+    回退为整体获取后迭代。不写入回放记录。
+    """
+    client = _get_client()
+    yielded = False
+    try:
+        for item in client.iter_world_state():
+            yielded = True
+            yield item
+        return
+    except Exception as e:
+        if yielded:
+            raise
+        logger.debug("[MCP] 流式态势解析不可用，回退整体获取: %s", e)
+
+    result = client.get("/api/world_state")
+    yield ("sim_time", result.get("sim_time", 0.0))
+    for unit in result.get("units", []):
+        yield ("unit", unit)
+
+
 @tool
 def get_unit_state(unit_name: str) -> dict:
     """获取指定作战单元的完整状态信息。
@@ -53,21 +173,57 @@ def get_unit_state(unit_name: str) -> dict:
     Returns:
         包含位置、姿态、速度、装备列表等完整信息
     """
-    client = get_client()
-    result = client.get(f"/api/unit/{unit_name}/state")
+    client = _get_client()
+    result = client.call(_ROUTES["get_unit_state"], (unit_name,))
     _record_call("get_unit_state", {"unit_name": unit_name}, result)
-    logger.info(f"[MCP] get_unit_state({unit_name})")
+    logger.debug("[MCP] get_unit_state(%s)", unit_name)
     return result
 
 
+@tool
+def get_units_states_bulk(unit_names: list[str]) -> dict:
+    """批量获取多个作战单元的完整状态，一次并发波代替逐个 get_unit_state。
+
+    Args:
+        unit_names: 单元名称列表
+
+    Returns:
+        以单元名为键的状态信息字典
+    """
+    client = _get_client()
+    results = client.batch_get([_PATH_UNIT_STATE % name for name in unit_names])
+    states = dict(zip(unit_names, results))
+    _record_call("get_units_states_bulk", {"unit_names": unit_names}, {"count": len(states)})
+    logger.debug("[MCP] get_units_states_bulk -> %s units", len(states))
+    return states
+
+
+@tool
+def mcp_batch(calls: list[dict]) -> list[dict]:
+    """把多个独立子请求合并为一次引擎往返执行（决策点之间攒一批再发）。
+
+    Args:
+        calls: 子请求列表，每项形如 {"method": "GET", "path": "/api/unit/X/state"}，
+               POST 请求可附带 "body" 字段
+
+    Returns:
+        与 calls 顺序一致的响应列表
+    """
+    client = _get_client()
+    results = client.batch(calls)
+    _record_call("mcp_batch", {"calls": calls}, {"count": len(results)})
+    logger.debug("[MCP] mcp_batch -> %s ops", len(results))
+    return results
+
+
 @tool
 def get_units_list() -> dict:
     """获取所有作战单元的摘要列表（ID、名称、类型、阵营、存活状态）。
     适合快速了解战场全局兵力部署。"""
-    client = get_client()
-    result = client.get("/api/units")
+    client = _get_client()
+    result = client.call(_ROUTES["get_units_list"])
     _record_call("get_units_list", {}, result)
-    logger.info(f"[MCP] get_units_list -> {result.get('count', 0)} units")
+    logger.debug("[MCP] get_units_list -> %s units", result.get("count", 0))
     return result
 
 
@@ -82,18 +238,18 @@ def query_equipment(unit_name: str, equipment_name: str) -> dict:
     Returns:
         装备的类型、状态（ON/OFF/FAULT）等信息
     """
-    client = get_client()
-    result = client.get(f"/api/unit/{unit_name}/equipment/{equipment_name}/query")
+    client = _get_client()
+    result = client.call(_ROUTES["query_equipment"], (unit_name, equipment_name))
     _record_call("query_equipment", {"unit_name": unit_name, "equipment_name": equipment_name}, result)
-    logger.info(f"[MCP] query_equipment({unit_name}, {equipment_name})")
+    logger.debug("[MCP] query_equipment(%s, %s)", unit_name, equipment_name)
     return result
 
 
 @tool
 def get_simulation_status() -> dict:
     """获取仿真引擎的运行状态和当前仿真时间。"""
-    client = get_client()
-    result = client.get("/api/simulation/status")
+    client = _get_client()
+    result = client.call(_ROUTES["get_simulation_status"])
     _record_call("get_simulation_status", {}, result)
     return result
 
@@ -124,18 +280,13 @@ def control_equipment(
 
     安全约束: 所有控制均通过引擎接口执行，不直接修改物理状态。
     """
-    client = get_client()
-    body = {}
-    if power is not None:
-        body["power"] = power
-    if set_fault is not None:
-        body["set_fault"] = set_fault
-    if params is not None:
-        body["params"] = params
-
-    result = client.post(f"/api/unit/{unit_name}/equipment/{equipment_name}/control", body)
+    client = _get_client()
+    body = {k: v for k, v in zip(_EQUIP_CONTROL_KEYS, (power, set_fault, params))
+            if v is not None}
+
+    result = client.call(_ROUTES["control_equipment"], (unit_name, equipment_name), body)
     _record_call("control_equipment", {"unit_name": unit_name, "equipment_name": equipment_name, **body}, result)
-    logger.info(f"[MCP] control_equipment({unit_name}, {equipment_name}, {body})")
+    logger.info("[MCP] control_equipment(%s, %s, %s)", unit_name, equipment_name, body)
     return result
 
 
@@ -169,28 +320,14 @@ def alter_unit(
 
     安全约束: 通过 ManualInterventionServices 执行，遵守引擎限幅规则。
     """
-    client = get_client()
-    body = {}
-    if latitude is not None:
-        body["latitude"] = latitude
-    if longitude is not None:
-        body["longitude"] = longitude
-    if altitude is not None:
-        body["altitude"] = altitude
-    if heading is not None:
-        body["heading"] = heading
-    if pitch is not None:
-        body["pitch"] = pitch
-    if roll is not None:
-        body["roll"] = roll
-    if speed is not None:
-        body["speed"] = speed
-    if active is not None:
-        body["active"] = active
-
-    result = client.post(f"/api/unit/{unit_name}/alter", body)
+    client = _get_client()
+    body = {k: v for k, v in zip(
+        _ALTER_KEYS, (latitude, longitude, altitude, heading, pitch, roll, speed, active),
+    ) if v is not None}
+
+    result = client.call(_ROUTES["alter_unit"], (unit_name,), body)
     _record_call("alter_unit", {"unit_name": unit_name, **body}, result)
-    logger.info(f"[MCP] alter_unit({unit_name}, {body})")
+    logger.info("[MCP] alter_unit(%s, %s)", unit_name, body)
     return result
 
 
@@ -217,21 +354,15 @@ def assign_mission(
     Returns:
         操作结果
     """
-    client = get_client()
-    body = {
-        "action": action,
-        "mission_type": mission_type,
-    }
-    if task_name is not None:
-        body["task_name"] = task_name
-    if task_old_name is not None:
-        body["task_old_name"] = task_old_name
-    if mission_time is not None:
-        body["mission_time"] = mission_time
-
-    result = client.post(f"/api/unit/{unit_name}/mission", body)
+    client = _get_client()
+    body = {"action": action, "mission_type": mission_type}
+    body.update((k, v) for k, v in zip(
+        _MISSION_OPT_KEYS, (task_name, task_old_name, mission_time),
+    ) if v is not None)
+
+    result = client.call(_ROUTES["assign_mission"], (unit_name,), body)
     _record_call("assign_mission", {"unit_name": unit_name, **body}, result)
-    logger.info(f"[MCP] assign_mission({unit_name}, {action}, {mission_type})")
+    logger.info("[MCP] assign_mission(%s, %s, %s)", unit_name, action, mission_type)
     return result
 
 
@@ -258,12 +389,15 @@ def platform_move_to_pos(
         speed: 飞行速度（m/s），默认200
         turn_g: 转弯过载（G），默认3
     """
-    client = get_client()
-    body = {"latitude": latitude, "longitude": longitude, "altitude": altitude,
-            "speed": speed, "turn_g": turn_g}
-    result = client.post(f"/api/unit/{unit_name}/platform/move_to_pos", body)
+    client = _get_client()
+    if altitude == 5000.0 and speed == 200.0 and turn_g == 3.0:
+        body = {"latitude": latitude, "longitude": longitude, **_DEFAULT_FLIGHT_TAIL}
+    else:
+        body = {"latitude": latitude, "longitude": longitude, "altitude": altitude,
+                "speed": speed, "turn_g": turn_g}
+    result = client.call(_ROUTES["platform_move_to_pos"], (unit_name,), body)
     _record_call("platform_move_to_pos", {"unit_name": unit_name, **body}, result)
-    logger.info(f"[MCP] platform_move_to_pos({unit_name}, lat={latitude}, lon={longitude})")
+    logger.info("[MCP] platform_move_to_pos(%s, lat=%s, lon=%s)", unit_name, latitude, longitude)
     return result
 
 
@@ -271,8 +405,8 @@ def platform_move_to_pos(
 def platform_move_to_direction(
     unit_name: str,
     heading: float,
-    altitude: float = 5000.0,
-    speed: float = 200.0,
+    altitude: Optional[float] = None,
+    speed: Optional[float] = None,
     turn_g: float = 3.0,
 ) -> dict:
     """命令平台朝指定航向飞行。
@@ -280,13 +414,18 @@ def platform_move_to_direction(
     Args:
         unit_name: 单元名称
         heading: 目标航向（度，0=北，顺时针）
-        altitude: 飞行高度（米）
-        speed: 飞行速度（m/s）
+        altitude: 飞行高度（米，缺省保持当前高度）
+        speed: 飞行速度（m/s，缺省保持当前速度）
         turn_g: 转弯过载（G）
     """
-    client = get_client()
-    body = {"heading": heading, "altitude": altitude, "speed": speed, "turn_g": turn_g}
-    result = client.post(f"/api/unit/{unit_name}/platform/move_to_dir", body)
+    client = _get_client()
+    if altitude == 5000.0 and speed == 200.0 and turn_g == 3.0:
+        body = {"heading": heading, **_DEFAULT_FLIGHT_TAIL}
+    else:
+        body = {"heading": heading, "turn_g": turn_g}
+        body.update((k, v) for k, v in (("altitude", altitude), ("speed", speed))
+                    if v is not None)
+    result = client.call(_ROUTES["platform_move_to_direction"], (unit_name,), body)
     _record_call("platform_move_to_direction", {"unit_name": unit_name, **body}, result)
     return result
 
@@ -301,9 +440,12 @@ def platform_patrol(unit_name: str, airspace_name: str, altitude: float = 5000.0
         altitude: 巡逻高度（米）
         speed: 巡逻速度（m/s）
     """
-    client = get_client()
-    body = {"airspace_name": airspace_name, "altitude": altitude, "speed": speed}
-    result = client.post(f"/api/unit/{unit_name}/platform/patrol", body)
+    client = _get_client()
+    if altitude == 5000.0 and speed == 200.0:
+        body = {"airspace_name": airspace_name, **_DEFAULT_PATROL_TAIL}
+    else:
+        body = {"airspace_name": airspace_name, "altitude": altitude, "speed": speed}
+    result = client.call(_ROUTES["platform_patrol"], (unit_name,), body)
     _record_call("platform_patrol", {"unit_name": unit_name, **body}, result)
     return result
 
@@ -317,11 +459,11 @@ def platform_return_land(unit_name: str, land_type: str = "直接返航", airpor
         land_type: 返航方式 - "直接返航" 或 "原路返航"
         airport_name: 目标机场名称（可选）
     """
-    client = get_client()
+    client = _get_client()
     body = {"land_type": land_type}
     if airport_name:
         body["airport_name"] = airport_name
-    result = client.post(f"/api/unit/{unit_name}/platform/return_land", body)
+    result = client.call(_ROUTES["platform_return_land"], (unit_name,), body)
     _record_call("platform_return_land", {"unit_name": unit_name, **body}, result)
     return result
 
@@ -335,11 +477,11 @@ def platform_formation(unit_name: str, leader_name: str, formation_name: str = N
         leader_name: 长机名称
         formation_name: 编队队形名称（可选）
     """
-    client = get_client()
+    client = _get_client()
     body = {"leader_name": leader_name}
     if formation_name:
         body["formation_name"] = formation_name
-    result = client.post(f"/api/unit/{unit_name}/platform/formation", body)
+    result = client.call(_ROUTES["platform_formation"], (unit_name,), body)
     _record_call("platform_formation", {"unit_name": unit_name, **body}, result)
     return result
 
@@ -356,8 +498,8 @@ def get_radar_detail(unit_name: str, radar_name: str) -> dict:
         unit_name: 单元名称
         radar_name: 雷达装备名称
     """
-    client = get_client()
-    result = client.get(f"/api/unit/{unit_name}/radar/{radar_name}/detail")
+    client = _get_client()
+    result = client.call(_ROUTES["get_radar_detail"], (unit_name, radar_name))
     _record_call("get_radar_detail", {"unit_name": unit_name, "radar_name": radar_name}, result)
     return result
 
@@ -370,8 +512,8 @@ def get_jammer_detail(unit_name: str, jammer_name: str) -> dict:
         unit_name: 单元名称
         jammer_name: 干扰机装备名称
     """
-    client = get_client()
-    result = client.get(f"/api/unit/{unit_name}/jammer/{jammer_name}/detail")
+    client = _get_client()
+    result = client.call(_ROUTES["get_jammer_detail"], (unit_name, jammer_name))
     _record_call("get_jammer_detail", {"unit_name": unit_name, "jammer_name": jammer_name}, result)
     return result
 
@@ -403,13 +545,13 @@ def jammer_command(
         duration: 干扰持续时间（秒）
         target_name: 干扰目标名称（AGECMCmd时使用）
     """
-    client = get_client()
+    client = _get_client()
     body = {"command": command, "jam_type": jam_type,
             "center_az": center_az, "center_el": center_el,
             "az_range": az_range, "el_range": el_range, "duration": duration}
     if target_name:
         body["target_name"] = target_name
-    result = client.post(f"/api/unit/{unit_name}/jammer/{jammer_name}/command", body)
+    result = client.call(_ROUTES["jammer_command"], (unit_name, jammer_name), body)
     _record_call("jammer_command", {"unit_name": unit_name, "jammer_name": jammer_name, **body}, result)
     return result
 
@@ -426,8 +568,8 @@ def get_weapon_status(unit_name: str, weapon_name: str) -> dict:
         unit_name: 单元名称
         weapon_name: 武器系统名称
     """
-    client = get_client()
-    result = client.get(f"/api/unit/{unit_name}/weapon/{weapon_name}/status")
+    client = _get_client()
+    result = client.call(_ROUTES["get_weapon_status"], (unit_name, weapon_name))
     _record_call("get_weapon_status", {"unit_name": unit_name, "weapon_name": weapon_name}, result)
     return result
 
@@ -443,9 +585,9 @@ def weapon_lock_target(unit_name: str, weapon_name: str, target_id: int) -> dict
 
     安全约束: 锁定不等于发射，锁定后需确认才能发射。
     """
-    client = get_client()
+    client = _get_client()
     body = {"target_id": target_id}
-    result = client.post(f"/api/unit/{unit_name}/weapon/{weapon_name}/lock", body)
+    result = client.call(_ROUTES["weapon_lock_target"], (unit_name, weapon_name), body)
     _record_call("weapon_lock_target", {"unit_name": unit_name, "weapon_name": weapon_name, **body}, result)
     return result
 
@@ -462,11 +604,11 @@ def weapon_launch(unit_name: str, weapon_name: str, target_id: int, launch_num:
 
     安全约束: 仅在确认目标在发射包线内且已锁定后才能发射。
     """
-    client = get_client()
+    client = _get_client()
     body = {"target_id": target_id, "launch_num": launch_num}
-    result = client.post(f"/api/unit/{unit_name}/weapon/{weapon_name}/launch", body)
+    result = client.call(_ROUTES["weapon_launch"], (unit_name, weapon_name), body)
     _record_call("weapon_launch", {"unit_name": unit_name, "weapon_name": weapon_name, **body}, result)
-    logger.warning(f"[MCP] WEAPON LAUNCH: {unit_name}/{weapon_name} -> target {target_id} x{launch_num}")
+    logger.warning("[MCP] WEAPON LAUNCH: %s/%s -> target %s x%s", unit_name, weapon_name, target_id, launch_num)
     return result
 
 
@@ -478,8 +620,8 @@ def weapon_abort(unit_name: str, weapon_name: str) -> dict:
         unit_name: 单元名称
         weapon_name: 武器系统名称
     """
-    client = get_client()
-    result = client.post(f"/api/unit/{unit_name}/weapon/{weapon_name}/abort", {})
+    client = _get_client()
+    result = client.call(_ROUTES["weapon_abort"], (unit_name, weapon_name), {})
     _record_call("weapon_abort", {"unit_name": unit_name, "weapon_name": weapon_name}, result)
     return result
 
@@ -496,8 +638,8 @@ def get_comm_detail(unit_name: str, comm_name: str) -> dict:
         unit_name: 单元名称
         comm_name: 通信设备名称
     """
-    client = get_client()
-    result = client.get(f"/api/unit/{unit_name}/comm/{comm_name}/detail")
+    client = _get_client()
+    result = client.call(_ROUTES["get_comm_detail"], (unit_name, comm_name))
     _record_call("get_comm_detail", {"unit_name": unit_name, "comm_name": comm_name}, result)
     return result
 
@@ -509,7 +651,8 @@ def get_comm_detail(unit_name: str, comm_name: str) -> dict:
 # 所有可用 MCP 工具
 ALL_TOOLS = [
     # 基础查询
-    get_world_state, get_unit_state, get_units_list, query_equipment, get_simulation_status,
+    get_world_state, get_unit_state, get_units_states_bulk, get_units_list,
+    query_equipment, get_simulation_status, mcp_batch,
     # 基础控制
     control_equipment, alter_unit, assign_mission,
     # 平台飞行控制
@@ -525,7 +668,8 @@ ALL_TOOLS = [
 
 # 只读工具（查询类）
 QUERY_TOOLS = [
-    get_world_state, get_unit_state, get_units_list, query_equipment, get_simulation_status,
+    get_world_state, get_unit_state, get_units_states_bulk, get_units_list,
+    query_equipment, get_simulation_status,
     get_radar_detail, get_jammer_detail, get_weapon_status, get_comm_detail,
 ]
 
@@ -10,6 +10,12 @@
 """
 import os
 import json
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 from loguru import logger
@@ -21,6 +27,86 @@ from langchain_text_splitters import RecursiveCharacterTextSplitter
 
 import config
 
+# orjson 为可选依赖：知识库 JSON 解析显著更快，缺失时回退 stdlib json
+try:
+    import orjson
+
+    def _json_loads(data):
+        return orjson.loads(data)
+
+    def _json_dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+except ImportError:
+    def _json_loads(data):
+        return json.loads(data)
+
+    def _json_dumps(obj) -> str:
+        return json.dumps(obj, ensure_ascii=False)
+
+# pyahocorasick 为可选依赖：多关键词对长文档做单遍匹配，
+# 未安装时退化为编译后的正则交替式（同样单遍，常数稍大）
+try:
+    import ahocorasick
+    _HAS_AHOCORASICK = True
+except ImportError:
+    _HAS_AHOCORASICK = False
+
+# 文档分类的内置规则（JSON 配置缺失时使用）
+_BUILTIN_CATEGORY_RULES = [
+    ("tactics",         ["tactic", "战术", "条令", "战法"]),
+    ("radar_manual",    ["radar", "雷达"]),
+    ("ew_manual",       ["jam", "干扰", "电子战", "ecm"]),
+    ("weapon_manual",   ["weapon", "武器", "弹药", "导弹"]),
+    ("comm_manual",     ["comm", "通信", "数据链"]),
+    ("historical_case", ["case", "案例", "历史"]),
+    ("flight_manual",   ["flight", "飞行", "航路", "空域"]),
+]
+
+
+@lru_cache(maxsize=1)
+def _category_patterns() -> list[tuple[str, re.Pattern]]:
+    """加载并编译文档分类规则（进程内只做一次）
+
+    优先从 ui/ui_config/doc_categories.json 读取分类定义，
+    缺失或解析失败时回退内置规则；每类关键词合并为一个正则交替式。
+    """
+    rules = []
+    try:
+        cfg_path = Path(__file__).resolve().parent.parent / "ui" / "ui_config" / "doc_categories.json"
+        if cfg_path.exists():
+            data = _json_loads(cfg_path.read_bytes())
+            for cat_key, cat_info in data.get("categories", {}).items():
+                if cat_key == "general":
+                    continue
+                keywords = cat_info.get("keywords", [])
+                if keywords:
+                    rules.append((cat_key, keywords))
+    except Exception as e:
+        logger.warning(f"[RAG] 分类配置加载失败，使用内置规则: {e}")
+        rules = []
+    if not rules:
+        rules = _BUILTIN_CATEGORY_RULES
+    return [(cat, re.compile("|".join(map(re.escape, kws)))) for cat, kws in rules]
+
+
+class LocalSTEmbeddings:
+    """本地 sentence-transformers embedding 降级实现
+
+    DashScope 不可用（无 API key / 离线环境）时使用，
+    embed_documents / embed_query 接口与 LangChain Embeddings 对齐。
+    sentence-transformers 为可选依赖，导入失败由调用方处理。
+    """
+
+    def __init__(self, model_name: str = None):
+        from sentence_transformers import SentenceTransformer
+        self._model = SentenceTransformer(model_name or config.rag.LOCAL_EMBEDDING_MODEL)
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return self._model.encode(texts, batch_size=64, convert_to_numpy=True).tolist()
+
+    def embed_query(self, text: str) -> list[float]:
+        return self._model.encode([text], convert_to_numpy=True)[0].tolist()
+
 
 class TacticalRAG:
     """战术知识 RAG 检索器"""
@@ -31,6 +117,18 @@ class TacticalRAG:
         self.vectorstore: Optional[FAISS] = None
         self.embeddings = None
         self._initialized = False
+        # get_context_for_agent 结果缓存（任务在迭代间重复时直接命中）
+        self._context_cache: OrderedDict[tuple, str] = OrderedDict()
+        # retrieve 精确匹配缓存：(query, k, category) -> 文档列表
+        self._exact_cache: OrderedDict[tuple, list[Document]] = OrderedDict()
+        self._exact_cache_lock = threading.Lock()
+        # retrieve 语义缓存：(query, k, category) -> (归一化查询向量, 文档列表)
+        # 近重复查询（余弦相似度达阈值）直接复用历史检索结果
+        self._semantic_cache: OrderedDict[tuple, tuple] = OrderedDict()
+        self._query_embed_failed = False
+        # _load_knowledge_documents 结果缓存（按文件名+mtime 签名判定是否过期）
+        self._docs_cache: Optional[list[Document]] = None
+        self._docs_cache_sig: Optional[tuple] = None
 
     def initialize(self):
         """初始化 RAG 系统"""
@@ -46,9 +144,11 @@ class TacticalRAG:
                 dashscope_api_key=config.llm.DASHSCOPE_API_KEY,
             )
         except Exception as e:
-            logger.warning(f"[RAG] DashScope Embeddings 初始化失败: {e}，使用降级搜索")
-            self._initialized = True
-            return
+            logger.warning(f"[RAG] DashScope Embeddings 初始化失败: {e}，尝试本地模型")
+            self.embeddings = self._init_local_embeddings()
+            if self.embeddings is None:
+                self._initialized = True
+                return
 
         # 尝试加载已有向量库
         if os.path.exists(self.persist_dir):
@@ -56,6 +156,10 @@ class TacticalRAG:
                 self.vectorstore = FAISS.load_local(
                     self.persist_dir, self.embeddings, allow_dangerous_deserialization=True
                 )
+                # 旧库可能是 HNSW 索引，加载后恢复检索宽度配置
+                index = getattr(self.vectorstore, "index", None)
+                if index is not None and hasattr(index, "hnsw"):
+                    index.hnsw.efSearch = config.rag.HNSW_EF_SEARCH
                 logger.info("[RAG] 已加载现有向量库")
                 self._initialized = True
                 return
@@ -74,9 +178,16 @@ class TacticalRAG:
             chunks = splitter.split_documents(documents)
             logger.info(f"[RAG] 分块完成: {len(chunks)} 个片段")
 
-            # 构建向量库
+            # 构建向量库（显式分批 embedding，再由向量直接建索引）
             try:
-                self.vectorstore = FAISS.from_documents(chunks, self.embeddings)
+                texts = [c.page_content for c in chunks]
+                vectors = self._embed_in_batches(texts)
+                # 下划线前缀的内部缓存键不写入向量库元数据
+                metadatas = [
+                    {key: v for key, v in c.metadata.items() if not key.startswith("_")}
+                    for c in chunks
+                ]
+                self.vectorstore = self._build_vectorstore(texts, vectors, metadatas)
                 # 持久化
                 os.makedirs(self.persist_dir, exist_ok=True)
                 self.vectorstore.save_local(self.persist_dir)
@@ -88,88 +199,202 @@ class TacticalRAG:
 
         self._initialized = True
 
+    @staticmethod
+    def _init_local_embeddings() -> Optional[LocalSTEmbeddings]:
+        """初始化本地 embedding 降级模型，不可用时返回 None（转纯关键词搜索）"""
+        try:
+            embeddings = LocalSTEmbeddings()
+            logger.info(f"[RAG] 已启用本地 embedding 模型: {config.rag.LOCAL_EMBEDDING_MODEL}")
+            return embeddings
+        except Exception as e:
+            logger.warning(f"[RAG] 本地 embedding 不可用: {e}，使用降级搜索")
+            return None
+
+    def _build_vectorstore(self, texts: list[str], vectors: list[list[float]],
+                           metadatas: list[dict]) -> FAISS:
+        """用 HNSW 图索引构建向量库
+
+        FAISS.from_embeddings 默认建 IndexFlatL2，每次检索是对全部
+        向量的暴力扫描；HNSW 把单次检索降到近似对数复杂度，
+        召回宽度由 RAG_HNSW_EF_SEARCH 控制。构建失败时回退平坦索引。
+
+        RAG_QUANTIZER 控制向量存储精度：fp32（默认，无损）、
+        fp16 / int8（标量量化，内存减半 / 降为 1/4，召回略有损失）。
+
+        当片段数达到 RAG_IVF_THRESHOLD 时改用 IVF+PQ 倒排索引
+        （聚类数 4*sqrt(N)，检索探测 RAG_IVF_NPROBE 个聚类），
+        大语料下内存和检索开销远低于 HNSW。
+        """
+        try:
+            import faiss
+            from langchain_community.docstore.in_memory import InMemoryDocstore
+
+            dim = len(vectors[0])
+            n = len(vectors)
+            quantizer = config.rag.QUANTIZER
+            if n >= config.rag.IVF_THRESHOLD:
+                nlist = max(1, int(4 * n ** 0.5))
+                # PQ 子量化器个数必须整除向量维度
+                m = next(m for m in (64, 32, 16, 8, 4, 2, 1) if dim % m == 0)
+                index = faiss.IndexIVFPQ(faiss.IndexFlatL2(dim), dim, nlist, m, 8)
+                index.nprobe = config.rag.IVF_NPROBE
+            elif quantizer == "fp16":
+                index = faiss.IndexHNSWSQ(dim, faiss.ScalarQuantizer.QT_fp16, config.rag.HNSW_M)
+            elif quantizer == "int8":
+                index = faiss.IndexHNSWSQ(dim, faiss.ScalarQuantizer.QT_8bit, config.rag.HNSW_M)
+            else:
+                index = faiss.IndexHNSWFlat(dim, config.rag.HNSW_M)
+            if hasattr(index, "hnsw"):
+                index.hnsw.efConstruction = 200
+                index.hnsw.efSearch = config.rag.HNSW_EF_SEARCH
+            if not index.is_trained:
+                # 标量/乘积量化器需要先用样本向量训练量化参数
+                import numpy as np
+                index.train(np.asarray(vectors, dtype="float32"))
+            vectorstore = FAISS(
+                embedding_function=self.embeddings,
+                index=index,
+                docstore=InMemoryDocstore(),
+                index_to_docstore_id={},
+            )
+            vectorstore.add_embeddings(list(zip(texts, vectors)), metadatas=metadatas)
+            return vectorstore
+        except Exception as e:
+            logger.warning(f"[RAG] HNSW 索引构建失败，回退平坦索引: {e}")
+            return FAISS.from_embeddings(
+                list(zip(texts, vectors)), self.embeddings, metadatas=metadatas,
+            )
+
+    def _embed_in_batches(self, texts: list[str], batch_size: int = None) -> list[list[float]]:
+        """分批调用 embedding 接口并按输入顺序拼接结果
+
+        默认的逐块 embedding 对 DashScope 是一块一次 HTTP 往返，
+        冷启动被 N 次 RTT 支配；按 RAG_EMBED_BATCH_SIZE 分批提交
+        把 TLS/HTTP 开销摊到每批多条文本上。
+        批次之间再经线程池并发提交（RAG_EMBED_CONCURRENCY 个一波），
+        限流/瞬时失败按指数退避重试。
+        """
+        if batch_size is None:
+            batch_size = config.rag.EMBED_BATCH_SIZE
+        batches = [texts[s:s + batch_size] for s in range(0, len(texts), batch_size)]
+        if not batches:
+            return []
+
+        def _embed_one(batch: list[str]) -> list[list[float]]:
+            delay = 1.0
+            for attempt in range(4):
+                try:
+                    return self.embeddings.embed_documents(batch)
+                except Exception as e:
+                    if attempt == 3:
+                        raise
+                    logger.warning(f"[RAG] embedding 批次失败（第 {attempt + 1} 次），{delay:.0f}s 后重试: {e}")
+                    time.sleep(delay)
+                    delay *= 2
+
+        if len(batches) == 1:
+            return _embed_one(batches[0])
+        workers = min(config.rag.EMBED_CONCURRENCY, len(batches))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_embed_one, batches))
+        return [vec for batch_vectors in results for vec in batch_vectors]
+
+    def _knowledge_signature(self) -> tuple:
+        """知识库目录的内容签名：文件名 + mtime，文件有增删改时变化"""
+        paths = sorted(
+            list(self.knowledge_dir.glob("*.md")) + list(self.knowledge_dir.glob("*.json"))
+        )
+        return tuple((p.name, p.stat().st_mtime_ns) for p in paths)
+
     def _load_knowledge_documents(self) -> list[Document]:
-        """加载知识库文档"""
+        """加载知识库文档
+
+        结果按目录签名缓存：降级搜索每次查询都会调用本方法，
+        文件未变化时直接复用上次解析结果，避免重复磁盘 IO。
+        """
         documents = []
 
         if not self.knowledge_dir.exists():
             logger.warning(f"[RAG] 知识库目录不存在: {self.knowledge_dir}")
             return documents
 
-        for filepath in self.knowledge_dir.glob("*.md"):
+        sig = self._knowledge_signature()
+        if self._docs_cache is not None and sig == self._docs_cache_sig:
+            return self._docs_cache
+
+        # 文件读取走线程池并发（读盘是纯 IO），Document 构造留在主线程
+        md_paths = sorted(self.knowledge_dir.glob("*.md"))
+        json_paths = sorted(self.knowledge_dir.glob("*.json"))
+        all_paths = md_paths + json_paths
+        if not all_paths:
+            return documents
+
+        def _read_one(path: Path):
             try:
-                content = filepath.read_text(encoding="utf-8")
-                doc = Document(
-                    page_content=content,
-                    metadata={
-                        "source": filepath.name,
-                        "category": self._categorize_doc(filepath.name),
-                    },
-                )
-                documents.append(doc)
-                logger.info(f"[RAG] 加载文档: {filepath.name}")
+                return path.read_text(encoding="utf-8")
             except Exception as e:
-                logger.error(f"[RAG] 加载文档失败 {filepath}: {e}")
+                logger.error(f"[RAG] 加载文档失败 {path}: {e}")
+                return None
+
+        with ThreadPoolExecutor(max_workers=min(16, len(all_paths))) as pool:
+            contents = dict(zip(all_paths, pool.map(_read_one, all_paths)))
+
+        for filepath in md_paths:
+            content = contents[filepath]
+            if content is None:
+                continue
+            documents.append(Document(
+                page_content=content,
+                metadata={
+                    "source": filepath.name,
+                    "category": self._categorize_doc(filepath.name),
+                    # 降级搜索用的小写缓存（下划线前缀键不入向量库）
+                    "_content_lower": content.lower(),
+                },
+            ))
+            logger.info(f"[RAG] 加载文档: {filepath.name}")
 
         # 加载 JSON 格式的知识
-        for filepath in self.knowledge_dir.glob("*.json"):
+        for filepath in json_paths:
+            raw = contents[filepath]
+            if raw is None:
+                continue
             try:
-                data = json.loads(filepath.read_text(encoding="utf-8"))
+                data = _json_loads(raw)
                 if isinstance(data, list):
                     for item in data:
-                        content = item.get("content", json.dumps(item, ensure_ascii=False))
-                        doc = Document(
+                        content = item.get("content")
+                        if content is None:
+                            content = _json_dumps(item)
+                        documents.append(Document(
                             page_content=content,
                             metadata={
                                 "source": filepath.name,
                                 "category": item.get("category", "general"),
+                                "_content_lower": content.lower(),
                             },
-                        )
-                        documents.append(doc)
+                        ))
                 logger.info(f"[RAG] 加载文档: {filepath.name}")
             except Exception as e:
                 logger.error(f"[RAG] 加载文档失败 {filepath}: {e}")
 
+        self._docs_cache = documents
+        self._docs_cache_sig = sig
         return documents
 
     @staticmethod
+    @lru_cache(maxsize=256)
     def _categorize_doc(filename: str) -> str:
         """根据文件名推断文档类别
-        分类定义统一在 ui/ui_config/doc_categories.json 中维护
-        优先从 JSON 配置加载，回退到内置规则
+
+        分类定义统一在 ui/ui_config/doc_categories.json 中维护，
+        优先从 JSON 配置加载，回退到内置规则。规则进程内只编译一次，
+        结果按文件名缓存（文件名集合很小且稳定）。
         """
         name_lower = filename.lower()
-        # 尝试从 JSON 配置文件直接加载
-        try:
-            import json as _json
-            _cfg_path = Path(__file__).resolve().parent.parent / "ui" / "ui_config" / "doc_categories.json"
-            if _cfg_path.exists():
-                _data = _json.loads(_cfg_path.read_text(encoding="utf-8"))
-                categories = _data.get("categories", {})
-                for cat_key, cat_info in categories.items():
-                    if cat_key == "general":
-                        continue
-                    for kw in cat_info.get("keywords", []):
-                        if kw in name_lower:
-                            return cat_key
-                return "general"
-        except Exception:
-            pass
-
-        # 回退: 使用内置规则
-        rules = [
-            ("tactics",         ["tactic", "战术", "条令", "战法"]),
-            ("radar_manual",    ["radar", "雷达"]),
-            ("ew_manual",       ["jam", "干扰", "电子战", "ecm"]),
-            ("weapon_manual",   ["weapon", "武器", "弹药", "导弹"]),
-            ("comm_manual",     ["comm", "通信", "数据链"]),
-            ("historical_case", ["case", "案例", "历史"]),
-            ("flight_manual",   ["flight", "飞行", "航路", "空域"]),
-        ]
-        for cat_key, keywords in rules:
-            for kw in keywords:
-                if kw in name_lower:
-                    return cat_key
+        for cat_key, pattern in _category_patterns():
+            if pattern.search(name_lower):
+                return cat_key
         return "general"
 
     def retrieve(self, query: str, k: int = None, category: str = None) -> list[Document]:
@@ -182,28 +407,100 @@ class TacticalRAG:
 
         Returns:
             相关文档列表
+
+        结果按 (query, k, category) 精确缓存（LRU），Agent 在 tick 间
+        重复同一查询时不再触发向量检索；rebuild() 时整体失效。
         """
         if k is None:
             k = config.rag.RETRIEVE_TOP_K
 
+        cache_key = (query, k, category)
+        with self._exact_cache_lock:
+            cached = self._exact_cache.get(cache_key)
+            if cached is not None:
+                self._exact_cache.move_to_end(cache_key)
+                return cached
+
         if not self._initialized:
             self.initialize()
 
         if self.vectorstore is None:
-            return self._fallback_search(query, category)
-
+            results = self._fallback_search(query, category)
+            unit_vec = None
+        else:
+            # 查询向量只算一次：先探测语义缓存，未命中再用同一向量检索
+            raw_vec, unit_vec = self._embed_query_vector(query)
+            if unit_vec is not None:
+                sem_hit = self._semantic_probe(unit_vec, k, category)
+                if sem_hit is not None:
+                    logger.debug("[RAG] 语义缓存命中: {}", query[:40])
+                    return sem_hit
+            try:
+                if raw_vec is not None:
+                    if category:
+                        results = self.vectorstore.similarity_search_by_vector(
+                            raw_vec, k=k * 2,
+                            filter={"category": category},
+                        )[:k]
+                    else:
+                        results = self.vectorstore.similarity_search_by_vector(raw_vec, k=k)
+                elif category:
+                    results = self.vectorstore.similarity_search(
+                        query, k=k * 2,
+                        filter={"category": category},
+                    )[:k]
+                else:
+                    results = self.vectorstore.similarity_search(query, k=k)
+            except Exception as e:
+                logger.error(f"[RAG] 检索失败: {e}")
+                results = self._fallback_search(query, category)
+
+        with self._exact_cache_lock:
+            self._exact_cache[cache_key] = results
+            while len(self._exact_cache) > config.rag.QUERY_CACHE_SIZE:
+                self._exact_cache.popitem(last=False)
+            if unit_vec is not None:
+                self._semantic_cache[cache_key] = (unit_vec, results)
+                while len(self._semantic_cache) > config.rag.SEMANTIC_CACHE_SIZE:
+                    self._semantic_cache.popitem(last=False)
+        return results
+
+    def _embed_query_vector(self, query: str):
+        """计算查询向量，返回 (原始向量, 归一化向量)；失败后永久退化"""
+        if self._query_embed_failed or self.embeddings is None:
+            return None, None
         try:
-            if category:
-                results = self.vectorstore.similarity_search(
-                    query, k=k * 2,
-                    filter={"category": category},
-                )
-                return results[:k]
-            else:
-                return self.vectorstore.similarity_search(query, k=k)
+            import numpy as np
+            raw = self.embeddings.embed_query(query)
+            vec = np.asarray(raw, dtype=np.float32)
+            norm = np.linalg.norm(vec)
+            return raw, (vec / norm if norm > 0 else None)
         except Exception as e:
-            logger.error(f"[RAG] 检索失败: {e}")
-            return self._fallback_search(query, category)
+            logger.warning(f"[RAG] 查询向量计算失败，退化为文本检索: {e}")
+            self._query_embed_failed = True
+            return None, None
+
+    def _semantic_probe(self, unit_vec, k: int, category: Optional[str]) -> Optional[list[Document]]:
+        """在语义缓存中做余弦相似度匹配（条目已归一化，点积即余弦）"""
+        try:
+            import numpy as np
+        except ImportError:
+            return None
+        with self._exact_cache_lock:
+            entries = [
+                (key, vec, res)
+                for key, (vec, res) in self._semantic_cache.items()
+                if key[1] == k and key[2] == category
+            ]
+            if not entries:
+                return None
+            matrix = np.stack([vec for _, vec, _ in entries])
+            scores = matrix @ unit_vec
+            best = int(scores.argmax())
+            if scores[best] >= config.rag.SEMANTIC_CACHE_SIMILARITY:
+                self._semantic_cache.move_to_end(entries[best][0])
+                return entries[best][2]
+        return None
 
     def retrieve_with_scores(self, query: str, k: int = None) -> list[tuple[Document, float]]:
         """检索并返回相关性分数"""
@@ -223,21 +520,60 @@ class TacticalRAG:
             return [(doc, 0.5) for doc in self._fallback_search(query)]
 
     def get_context_for_agent(self, query: str, k: int = None) -> str:
-        """获取格式化的上下文文本，供 Agent 使用"""
+        """获取格式化的上下文文本，供 Agent 使用
+
+        上下文总长受 RAG_MAX_CONTEXT_CHARS 预算约束（LLM prefill 成本
+        与前缀长度成正比），超出预算的片段被截断或丢弃。
+        结果按 (query, k) 作 LRU 缓存，任务迭代间重复查询直接命中。
+        """
         if k is None:
             k = config.rag.RETRIEVE_TOP_K
 
+        cache_key = (query, k)
+        cached = self._context_cache.get(cache_key)
+        if cached is not None:
+            self._context_cache.move_to_end(cache_key)
+            return cached
+
         docs = self.retrieve(query, k=k)
         if not docs:
             return "（无相关战术知识）"
 
+        # 预算内的挑选按检索排名进行：预算截断时丢弃的是低相关片段，
+        # 而不是排序后字典序靠后的片段
+        budget = config.rag.MAX_CONTEXT_CHARS
+        selected = []  # (doc, 截断后的正文；None 表示完整收录)
+        used = 0
+        for doc in docs:
+            source = doc.metadata.get("source", "未知")
+            category = doc.metadata.get("category", "general")
+            header_len = len(f"[知识0] ({category} - {source})\n")
+            entry_len = header_len + len(doc.page_content)
+            remaining = budget - used
+            if entry_len > remaining:
+                # 剩余预算过小则不再塞入截断片段
+                if remaining > 200:
+                    selected.append((doc, doc.page_content[:remaining - header_len] + "…"))
+                break
+            selected.append((doc, None))
+            used += entry_len + 2  # 计入分隔空行
+
+        # 稳定排序只作用于已选子集：同一批片段总是产出字节相同的
+        # 上下文文本，便于下游 LLM 前缀缓存命中（见 commander 的提示词排布）
+        selected.sort(key=lambda item: (item[0].metadata.get("source", ""), item[0].page_content))
+
         context_parts = []
-        for i, doc in enumerate(docs, 1):
+        for i, (doc, clipped) in enumerate(selected, 1):
             source = doc.metadata.get("source", "未知")
             category = doc.metadata.get("category", "general")
-            context_parts.append(f"[知识{i}] ({category} - {source})\n{doc.page_content}")
+            content = doc.page_content if clipped is None else clipped
+            context_parts.append(f"[知识{i}] ({category} - {source})\n{content}")
 
-        return "\n\n".join(context_parts)
+        context = "\n\n".join(context_parts)
+        self._context_cache[cache_key] = context
+        while len(self._context_cache) > 64:
+            self._context_cache.popitem(last=False)
+        return context
 
     def _fallback_search(self, query: str, category: str = None) -> list[Document]:
         """降级搜索（当向量库不可用时，直接读取文档文件做关键词匹配）"""
@@ -249,22 +585,70 @@ class TacticalRAG:
         results = []
         query_lower = query.lower()
         keywords = [kw.strip() for kw in query_lower.replace("，", " ").replace("、", " ").split() if len(kw.strip()) > 0]
+        matcher = self._build_keyword_matcher(keywords)
 
         for doc in all_docs:
             doc_cat = doc.metadata.get("category", "")
             if category and doc_cat != category:
                 continue
-            content_lower = doc.page_content.lower()
-            if any(kw in content_lower for kw in keywords):
+            # 小写文本在加载时已缓存，避免每次查询重复 lower() 全文
+            content_lower = doc.metadata.get("_content_lower") or doc.page_content.lower()
+            if matcher(content_lower):
                 results.append(doc)
+                if len(results) >= 5:
+                    break
 
         if results:
-            return results[:5]
+            return results
         return all_docs[:3]
 
+    @staticmethod
+    def _build_keyword_matcher(keywords: list[str]):
+        """构建关键词匹配器：对每篇文档只扫描一遍，不随关键词数线性退化
+
+        优先用 Aho-Corasick 自动机（pyahocorasick 已安装时），
+        否则退化为编译后的正则交替式。
+        """
+        if not keywords:
+            return lambda text: False
+        if _HAS_AHOCORASICK:
+            automaton = ahocorasick.Automaton()
+            for kw in keywords:
+                automaton.add_word(kw, kw)
+            automaton.make_automaton()
+
+            def _match(text: str) -> bool:
+                for _ in automaton.iter(text):
+                    return True
+                return False
+
+            return _match
+        pattern = re.compile("|".join(map(re.escape, keywords)))
+        return lambda text: pattern.search(text) is not None
+
+    def warm(self):
+        """预热：初始化向量库并预执行常用查询
+
+        把 embedding 客户端冷启动和首次检索的延迟从任务关键路径
+        挪到启动阶段，同时填充检索缓存。预热查询可通过
+        RAG_WARMUP_QUERIES 配置。
+        """
+        self.initialize()
+        for query in config.rag.WARMUP_QUERIES:
+            try:
+                self.retrieve(query)
+            except Exception as e:
+                logger.warning(f"[RAG] 预热查询失败 {query!r}: {e}")
+
     def rebuild(self):
         """重建向量库"""
         self._initialized = False
+        self._context_cache.clear()
+        with self._exact_cache_lock:
+            self._exact_cache.clear()
+            self._semantic_cache.clear()
+        self._docs_cache = None
+        self._docs_cache_sig = None
         if os.path.exists(self.persist_dir):
             import shutil
             shutil.rmtree(self.persist_dir)
@@ -281,4 +665,6 @@ def get_rag() -> TacticalRAG:
     global _rag
     if _rag is None:
         _rag = TacticalRAG()
+        if config.rag.EAGER_INIT:
+            _rag.warm()
     return _rag
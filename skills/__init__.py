@@ -9,8 +9,12 @@
 - communication: 通信管理
 - weapon: 武器使用（BVR攻击、中止交战）
 """
+from types import MappingProxyType
 
-from .maneuver import climb_and_accelerate, descend_and_decelerate, turn_to_heading, evade_missile, intercept_target
+from .maneuver import (
+    climb_and_accelerate, descend_and_decelerate, turn_to_heading,
+    evade_missile, intercept_target, intercept_targets,
+)
 from .sensor import radar_power_on, radar_power_off, radar_search
 from .electronic_warfare import activate_jammer, deactivate_jammer
 from .communication import radio_power_on, radio_power_off
@@ -18,6 +22,7 @@ from .weapon import bvr_attack, abort_engagement
 from .flight import fly_to_position, fly_heading, patrol_airspace, return_to_base, join_formation, combat_spread
 
 # 全局技能注册表 - Tactical Agent 从这里选取技能
+# parallel_safe: 标记无顺序依赖的技能（装备开关类），Executor 可并发执行
 SKILL_REGISTRY = {
     # 基础机动
     "climb_and_accelerate": {
@@ -25,30 +30,42 @@ SKILL_REGISTRY = {
         "description": "爬升并加速到指定高度和速度",
         "params": ["unit_name", "target_altitude", "target_speed"],
         "category": "maneuver",
+        "parallel_safe": False,
     },
     "descend_and_decelerate": {
         "func": descend_and_decelerate,
         "description": "下降并减速到指定高度和速度",
         "params": ["unit_name", "target_altitude", "target_speed"],
         "category": "maneuver",
+        "parallel_safe": False,
     },
     "turn_to_heading": {
         "func": turn_to_heading,
         "description": "转向到指定航向（度）",
         "params": ["unit_name", "target_heading"],
         "category": "maneuver",
+        "parallel_safe": False,
     },
     "evade_missile": {
         "func": evade_missile,
         "description": "规避来袭导弹（急转下降+开启干扰）",
         "params": ["unit_name", "threat_bearing"],
         "category": "maneuver",
+        "parallel_safe": False,
     },
     "intercept_target": {
         "func": intercept_target,
         "description": "截击目标（调整航向+加速趋近）",
         "params": ["unit_name", "target_name"],
         "category": "maneuver",
+        "parallel_safe": False,
+    },
+    "intercept_targets": {
+        "func": intercept_targets,
+        "description": "多目标截击分诊（批量算距离后截击最近目标）",
+        "params": ["unit_name", "targets"],
+        "category": "maneuver",
+        "parallel_safe": False,
     },
 
     # 平台飞行
@@ -57,36 +74,42 @@ SKILL_REGISTRY = {
         "description": "飞往指定经纬度坐标点（直接平台控制）",
         "params": ["unit_name", "latitude", "longitude", "altitude", "speed"],
         "category": "flight",
+        "parallel_safe": False,
     },
     "fly_heading": {
         "func": fly_heading,
         "description": "按指定航向飞行（度，0=北）",
         "params": ["unit_name", "heading", "altitude", "speed"],
         "category": "flight",
+        "parallel_safe": False,
     },
     "patrol_airspace": {
         "func": patrol_airspace,
         "description": "在指定空域巡逻飞行",
         "params": ["unit_name", "airspace_name", "altitude", "speed"],
         "category": "flight",
+        "parallel_safe": False,
     },
     "return_to_base": {
         "func": return_to_base,
         "description": "返航着陆到基地",
         "params": ["unit_name", "airport_name"],
         "category": "flight",
+        "parallel_safe": False,
     },
     "join_formation": {
         "func": join_formation,
         "description": "加入编队跟随长机飞行",
         "params": ["unit_name", "leader_name", "formation_name"],
         "category": "flight",
+        "parallel_safe": False,
     },
     "combat_spread": {
         "func": combat_spread,
         "description": "面对威胁方向横向战斗展开",
         "params": ["unit_name", "threat_bearing", "altitude", "speed"],
         "category": "flight",
+        "parallel_safe": False,
     },
 
     # 雷达
@@ -95,18 +118,21 @@ SKILL_REGISTRY = {
         "description": "开启雷达",
         "params": ["unit_name"],
         "category": "sensor",
+        "parallel_safe": True,
     },
     "radar_power_off": {
         "func": radar_power_off,
         "description": "关闭雷达（电磁静默）",
         "params": ["unit_name"],
         "category": "sensor",
+        "parallel_safe": True,
     },
     "radar_search": {
         "func": radar_search,
         "description": "雷达搜索（开启雷达并获取探测结果）",
         "params": ["unit_name"],
         "category": "sensor",
+        "parallel_safe": True,
     },
 
     # 电子战
@@ -115,12 +141,14 @@ SKILL_REGISTRY = {
         "description": "开启干扰机",
         "params": ["unit_name"],
         "category": "ew",
+        "parallel_safe": True,
     },
     "deactivate_jammer": {
         "func": deactivate_jammer,
         "description": "关闭干扰机",
         "params": ["unit_name"],
         "category": "ew",
+        "parallel_safe": True,
     },
 
     # 通信
@@ -129,12 +157,14 @@ SKILL_REGISTRY = {
         "description": "开启无线电通信",
         "params": ["unit_name"],
         "category": "comm",
+        "parallel_safe": True,
     },
     "radio_power_off": {
         "func": radio_power_off,
         "description": "关闭无线电（通信静默）",
         "params": ["unit_name"],
         "category": "comm",
+        "parallel_safe": True,
     },
 
     # 武器
@@ -143,19 +173,32 @@ SKILL_REGISTRY = {
         "description": "BVR超视距攻击：雷达锁定+发射中距弹",
         "params": ["unit_name", "target_name", "weapon_name", "launch_num"],
         "category": "weapon",
+        "parallel_safe": False,
     },
     "abort_engagement": {
         "func": abort_engagement,
         "description": "中止当前武器交战",
         "params": ["unit_name", "weapon_name"],
         "category": "weapon",
+        "parallel_safe": False,
     },
 }
 
+# 注册表构建完成后转只读视图：Agent 侧按键查找是 C 速度的 dict.get，
+# 且任何运行时改写都会显式报错而不是静默污染注册表
+SKILL_REGISTRY = MappingProxyType(SKILL_REGISTRY)
+
+# 预计算每个技能的参数个数，校验路径免去逐次 len(info["params"])
+SKILL_PARAM_ARITIES = MappingProxyType({
+    name: len(info["params"]) for name, info in SKILL_REGISTRY.items()
+})
+
 __all__ = [
     "SKILL_REGISTRY",
+    "SKILL_PARAM_ARITIES",
     # maneuver
-    "climb_and_accelerate", "descend_and_decelerate", "turn_to_heading", "evade_missile", "intercept_target",
+    "climb_and_accelerate", "descend_and_decelerate", "turn_to_heading", "evade_missile",
+    "intercept_target", "intercept_targets",
     # flight
     "fly_to_position", "fly_heading", "patrol_airspace", "return_to_base", "join_formation", "combat_spread",
     # sensor
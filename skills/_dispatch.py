@@ -0,0 +1,113 @@
+"""
+技能指令派发池
+
+紧凑控制循环（规避 + 干扰 + 雷达更新按 tick 连发）里，逐条
+client.post 并等待返回会让总延迟随指令数线性累加。本模块提供一个
+有界的后台派发池：
+
+- 指令入队即返回 Future，调用方可选择等待或继续推进
+- 在飞行中的请求数受 max_in_flight 约束，避免淹没引擎
+- 对同一单元的 /alter 指令做合并：排队中尚未发出的旧姿态指令
+  会被新指令直接覆盖（旧值已过时，发出去只会让机动滞后）
+
+需要逐条结果的技能继续走同步 client.post；本池服务于
+「只关心最新指令到达」的高频控制路径。
+"""
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Optional
+
+from loguru import logger
+
+from mcp.client import get_client
+
+# 模块级绑定：技能热路径少一次全局查找（同 mcp.tools 的做法）
+_get_client = get_client
+
+import config
+
+
+class CommandPool:
+    """有界后台指令派发池（daemon 工作线程，进程退出不阻塞）"""
+
+    def __init__(self, max_in_flight: int = None):
+        self._max_in_flight = max_in_flight or config.agent.COMMAND_POOL_SIZE
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        # unit_name -> (payload, future)：排队中的 alter 指令，后到覆盖
+        self._pending_alters: dict[str, tuple[dict, Future]] = {}
+        self._lock = threading.Lock()
+        self._workers_started = False
+
+    def _ensure_workers(self) -> None:
+        if self._workers_started:
+            return
+        with self._lock:
+            if self._workers_started:
+                return
+            for i in range(self._max_in_flight):
+                threading.Thread(
+                    target=self._drain, name=f"skill-dispatch-{i}", daemon=True,
+                ).start()
+            self._workers_started = True
+
+    def _drain(self) -> None:
+        client = _get_client()
+        while True:
+            kind, payload = self._queue.get()
+            future = None
+            try:
+                if kind == "alter":
+                    unit_name = payload
+                    with self._lock:
+                        entry = self._pending_alters.pop(unit_name, None)
+                    if entry is None:
+                        continue  # 已被后到指令合并取走
+                    data, future = entry
+                    result = client.post(f"/api/unit/{unit_name}/alter", data)
+                    future.set_result(result)
+                else:
+                    path, data, future = payload
+                    future.set_result(client.post(path, data))
+            except Exception as e:
+                logger.warning("[Dispatch] 指令派发异常: {}", e)
+                # 异常必须传给 Future，否则阻塞在 .result() 的调用方
+                # 会永远等不到结果
+                if future is not None:
+                    future.set_exception(e)
+
+    def submit(self, path: str, data: dict) -> Future:
+        """入队一条通用 POST 指令，返回结果 Future"""
+        self._ensure_workers()
+        future: Future = Future()
+        self._queue.put(("post", (path, data, future)))
+        return future
+
+    def submit_alter(self, unit_name: str, data: dict) -> Future:
+        """入队一条姿态指令；同单元排队中的旧指令被覆盖（返回同一 Future）
+
+        快速连续的航向/高度更新只有最后一条有意义，覆盖而非排队
+        避免引擎按过时序列逐条机动。
+        """
+        self._ensure_workers()
+        with self._lock:
+            entry = self._pending_alters.get(unit_name)
+            if entry is not None:
+                # 尚未发出：就地换载荷，复用原 Future，不再追加队列项
+                self._pending_alters[unit_name] = (data, entry[1])
+                return entry[1]
+            future: Future = Future()
+            self._pending_alters[unit_name] = (data, future)
+        self._queue.put(("alter", unit_name))
+        return future
+
+
+_pool: Optional[CommandPool] = None
+
+
+def get_command_pool() -> CommandPool:
+    """获取全局指令派发池（惰性创建）"""
+    global _pool
+    if _pool is None:
+        _pool = CommandPool()
+    return _pool
@@ -0,0 +1,106 @@
+"""
+地理数学内核（Haversine 距离 / 方位角）
+
+numba 为可选依赖：已安装时标量内核经 @njit 编译为机器码，
+缺失时装饰器退化为空操作、保持纯 Python 语义。
+批量路径提供 numpy 向量化实现（数组运算本身即 C 速度）。
+"""
+import math
+
+try:
+    import numpy as np
+except ImportError:  # 标量内核不依赖 numpy，向量化入口由调用方保证
+    np = None
+
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        """numba 缺失时的空装饰器"""
+        if args and callable(args[0]):
+            return args[0]
+
+        def wrap(func):
+            return func
+        return wrap
+
+# 地球半径（米）
+_EARTH_RADIUS_M = 6371000.0
+
+
+@njit(cache=True, fastmath=True)
+def haversine(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """两点大圆距离（米），Haversine 公式"""
+    dlat = math.radians(lat2 - lat1)
+    dlon = math.radians(lon2 - lon1)
+    a = (math.sin(dlat / 2) ** 2 +
+         math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(dlon / 2) ** 2)
+    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+    return _EARTH_RADIUS_M * c
+
+
+@njit(cache=True, fastmath=True)
+def bearing(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """两点之间的方位角（度，0-360）"""
+    lat1_r = math.radians(lat1)
+    lat2_r = math.radians(lat2)
+    dlon = math.radians(lon2 - lon1)
+
+    x = math.sin(dlon) * math.cos(lat2_r)
+    y = math.cos(lat1_r) * math.sin(lat2_r) - math.sin(lat1_r) * math.cos(lat2_r) * math.cos(dlon)
+
+    result = math.degrees(math.atan2(x, y))
+    return (result + 360) % 360
+
+
+@njit(cache=True, fastmath=True)
+def clamp(value: float, min_val: float, max_val: float) -> float:
+    """限幅"""
+    return max(min_val, min(max_val, value))
+
+
+@njit(cache=True, fastmath=True)
+def normalize_heading(heading: float) -> float:
+    """航向归一化到 [0, 360)"""
+    return heading % 360.0
+
+
+# 预计算的航向查表（1° 分辨率）：整数方位角 -> 规避 / 展开航向。
+# 每 tick 对多条来袭航迹做威胁分诊时，把 (bearing + 偏置) % 360
+# 的重复浮点运算换成一次序列索引。
+_EVADE_TBL = tuple(float((b + 150) % 360) for b in range(360))
+_SPREAD_TBL = tuple(float((b + 90) % 360) for b in range(360))
+
+
+def evade_heading(threat_bearing: float) -> float:
+    """近似背向威胁的规避航向（威胁方位 +150°，查表）"""
+    return _EVADE_TBL[int(threat_bearing) % 360]
+
+
+def spread_heading(threat_bearing: float) -> float:
+    """垂直于威胁方向的横向展开航向（威胁方位 +90°，查表）"""
+    return _SPREAD_TBL[int(threat_bearing) % 360]
+
+
+def haversine_vec(lat1, lon1, lat2, lon2) -> "np.ndarray":
+    """向量化 Haversine：输入为同长度数组，批量计算多对点的距离"""
+    lat1 = np.radians(np.asarray(lat1, dtype=np.float64))
+    lon1 = np.radians(np.asarray(lon1, dtype=np.float64))
+    lat2 = np.radians(np.asarray(lat2, dtype=np.float64))
+    lon2 = np.radians(np.asarray(lon2, dtype=np.float64))
+    dlat = lat2 - lat1
+    dlon = lon2 - lon1
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2
+    return _EARTH_RADIUS_M * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+
+def bearing_vec(lat1, lon1, lat2, lon2) -> "np.ndarray":
+    """向量化方位角（度，0-360）"""
+    lat1 = np.radians(np.asarray(lat1, dtype=np.float64))
+    lon1 = np.radians(np.asarray(lon1, dtype=np.float64))
+    lat2 = np.radians(np.asarray(lat2, dtype=np.float64))
+    lon2 = np.radians(np.asarray(lon2, dtype=np.float64))
+    dlon = lon2 - lon1
+    x = np.sin(dlon) * np.cos(lat2)
+    y = np.cos(lat1) * np.sin(lat2) - np.sin(lat1) * np.cos(lat2) * np.cos(dlon)
+    return (np.degrees(np.arctan2(x, y)) + 360) % 360
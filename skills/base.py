@@ -4,13 +4,16 @@ Skill = 可复用、可解释、可组合的战术动作
 输入: WorldState / UnitState
 输出: 一组 MCP Tool 调用序列（确定性）
 """
-import math
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from typing import Any
 from loguru import logger
 
+from . import _geomath
 
-@dataclass
+
+@dataclass(slots=True)
 class SkillResult:
     """Skill 执行结果"""
     success: bool
@@ -27,6 +30,129 @@ class SkillResult:
         }
 
 
+# (unit, equipment) -> 最近一次观测/已成功下发的电源状态（"ON"/"OFF"）
+# 状态快照和控制成功都会刷新；用于跳过显然无效的重复控制 RPC
+_equip_power_state: dict[tuple[str, str], str] = {}
+
+
+def _known_power_state(unit_name: str, equip_name: str) -> str | None:
+    """查询某装备最近已知的电源状态，未知返回 None"""
+    return _equip_power_state.get((unit_name, equip_name))
+
+
+def _record_power_state(unit_name: str, equip_name: str, status: str) -> None:
+    """记录装备电源状态（控制成功或快照观测后调用）"""
+    _equip_power_state[(unit_name, equip_name)] = status
+
+
+def ensure_equipment_power(client, unit_name: str, equip_name: str, on: bool) -> dict | None:
+    """确保装备处于目标电源状态；已知已达目标态时跳过 RPC
+
+    持续交战中雷达/干扰机保持开启时，后续技能调用不再重复发
+    TURN_ON。返回 None 表示无需下发。
+    """
+    desired = "ON" if on else "OFF"
+    if _known_power_state(unit_name, equip_name) == desired:
+        return None
+    result = client.post(
+        f"/api/unit/{unit_name}/equipment/{equip_name}/control",
+        {"power": on},
+    )
+    if result.get("result") == "success":
+        _record_power_state(unit_name, equip_name, desired)
+    return result
+
+
+# bulk-control 端点的特性探测结果（首次 404 后进程内不再尝试）
+_BULK_CONTROL_UNSUPPORTED = False
+
+
+def _control_many(client, unit_name: str, equip_names: list[str], power: bool) -> list[dict]:
+    """向多件装备下发开/关机控制，按输入顺序返回动作记录
+
+    缓存中已知处于目标电源状态的装备直接跳过（同
+    ensure_equipment_power 的判定），不再下发显然无效的重复控制，
+    跳过项视同成功；其余装备优先走 bulk-control 批量端点（一次
+    POST 控制全部装备），旧版引擎不支持时（404）回退并发逐件下发。
+    无论哪条路径，返回的动作记录顺序都与输入一致。
+    """
+    if not equip_names:
+        return []
+
+    desired = "ON" if power else "OFF"
+    pending = [n for n in equip_names if _known_power_state(unit_name, n) != desired]
+    if len(pending) == len(equip_names):
+        return _dispatch_controls(client, unit_name, equip_names, power)
+
+    executed = {
+        a["params"]["equipment"]: a
+        for a in _dispatch_controls(client, unit_name, pending, power)
+    }
+    return [
+        executed.get(n) or {
+            "tool": "control_equipment",
+            "params": {"unit": unit_name, "equipment": n, "power": power},
+            "result": "success",
+        }
+        for n in equip_names
+    ]
+
+
+def _dispatch_controls(client, unit_name: str, equip_names: list[str], power: bool) -> list[dict]:
+    """实际下发装备开/关机控制（bulk 优先，回退并发逐件）"""
+    global _BULK_CONTROL_UNSUPPORTED
+    if not equip_names:
+        return []
+
+    if not _BULK_CONTROL_UNSUPPORTED and len(equip_names) > 1:
+        resp = client.post(
+            f"/api/unit/{unit_name}/equipment/bulk-control",
+            {"items": [{"equipment": n, "power": power} for n in equip_names]},
+        )
+        if "error" not in resp:
+            per_item = {
+                r.get("equipment"): r.get("result", "unknown")
+                for r in resp.get("results", [])
+            }
+            actions = [
+                {
+                    "tool": "control_equipment",
+                    "params": {"unit": unit_name, "equipment": n, "power": power},
+                    "result": per_item.get(n, resp.get("result", "unknown")),
+                }
+                for n in equip_names
+            ]
+            for action in actions:
+                if action["result"] == "success":
+                    _record_power_state(unit_name, action["params"]["equipment"],
+                                        "ON" if power else "OFF")
+            return actions
+        if "HTTP 404" in resp.get("error", ""):
+            _BULK_CONTROL_UNSUPPORTED = True
+            logger.debug("[Skill] bulk-control 端点不可用，回退逐件下发")
+        else:
+            # 连接类错误：批量失败时同样回退逐件，让每件拿到独立结果
+            logger.warning(f"[Skill] bulk-control 失败，回退逐件下发: {resp.get('error')}")
+
+    def _one(equip_name: str) -> dict:
+        result = client.post(
+            f"/api/unit/{unit_name}/equipment/{equip_name}/control",
+            {"power": power},
+        )
+        if result.get("result") == "success":
+            _record_power_state(unit_name, equip_name, "ON" if power else "OFF")
+        return {
+            "tool": "control_equipment",
+            "params": {"unit": unit_name, "equipment": equip_name, "power": power},
+            "result": result.get("result", "unknown"),
+        }
+
+    if len(equip_names) == 1:
+        return [_one(equip_names[0])]
+    with ThreadPoolExecutor(max_workers=min(8, len(equip_names))) as pool:
+        return list(pool.map(_one, equip_names))
+
+
 class Skill:
     """Skill 基类 - 所有战术技能继承此类"""
 
@@ -34,43 +160,110 @@ class Skill:
     description: str = "Base skill"
 
     @staticmethod
-    def calculate_bearing(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-        """计算两点之间的方位角（度）"""
-        lat1_r = math.radians(lat1)
-        lat2_r = math.radians(lat2)
-        dlon = math.radians(lon2 - lon1)
+    def calculate_bearing(lat1, lon1, lat2, lon2):
+        """计算两点之间的方位角（度）
+
+        标量走 _geomath 标量内核（numba 可用时已 JIT 编译），
+        数组输入自动切换 numpy 向量化内核批量计算。
+        """
+        if hasattr(lat1, "ndim"):
+            return _geomath.bearing_vec(lat1, lon1, lat2, lon2)
+        return _geomath.bearing(lat1, lon1, lat2, lon2)
 
-        x = math.sin(dlon) * math.cos(lat2_r)
-        y = math.cos(lat1_r) * math.sin(lat2_r) - math.sin(lat1_r) * math.cos(lat2_r) * math.cos(dlon)
+    @staticmethod
+    def calculate_distance(lat1, lon1, lat2, lon2):
+        """计算两点之间的距离（米），使用 Haversine 公式
 
-        bearing = math.degrees(math.atan2(x, y))
-        return (bearing + 360) % 360
+        标量 / 数组输入的分派规则同 calculate_bearing。
+        """
+        if hasattr(lat1, "ndim"):
+            return _geomath.haversine_vec(lat1, lon1, lat2, lon2)
+        return _geomath.haversine(lat1, lon1, lat2, lon2)
 
     @staticmethod
-    def calculate_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-        """计算两点之间的距离（米），使用 Haversine 公式"""
-        R = 6371000  # 地球半径（米）
-        dlat = math.radians(lat2 - lat1)
-        dlon = math.radians(lon2 - lon1)
-        a = (math.sin(dlat / 2) ** 2 +
-             math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(dlon / 2) ** 2)
-        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-        return R * c
+    def calculate_bearings_vec(lats1, lons1, lats2, lons2):
+        """批量计算方位角（度）：输入为同长度数组，一次广播算完
+
+        多目标分诊（从 N 条航迹中挑最近威胁）时避免逐目标的
+        Python 级三角函数调用。
+        """
+        return _geomath.bearing_vec(lats1, lons1, lats2, lons2)
+
+    @staticmethod
+    def calculate_distances_vec(lats1, lons1, lats2, lons2):
+        """批量计算 Haversine 距离（米），分派规则同 calculate_bearings_vec"""
+        return _geomath.haversine_vec(lats1, lons1, lats2, lons2)
+
+    @staticmethod
+    def pick_nearest_target(my_lat: float, my_lon: float, targets: list[dict]) -> int:
+        """从目标列表中选出距离最近者的下标，列表为空返回 -1
+
+        numpy 可用时经向量化 Haversine 一次算完全部距离再 argmin，
+        K 个目标只付一轮数组运算；缺失时退化为标量内核逐个比较。
+        """
+        if not targets:
+            return -1
+        np = _geomath.np
+        if np is not None and len(targets) > 1:
+            lats = np.asarray([t.get("latitude", 0.0) for t in targets])
+            lons = np.asarray([t.get("longitude", 0.0) for t in targets])
+            return int(_geomath.haversine_vec(my_lat, my_lon, lats, lons).argmin())
+        best_idx, best_dist = 0, float("inf")
+        for i, t in enumerate(targets):
+            dist = _geomath.haversine(my_lat, my_lon,
+                                      t.get("latitude", 0.0), t.get("longitude", 0.0))
+            if dist < best_dist:
+                best_idx, best_dist = i, dist
+        return best_idx
 
     @staticmethod
     def clamp(value: float, min_val: float, max_val: float) -> float:
-        """限幅函数"""
-        return max(min_val, min(max_val, value))
+        """限幅函数（numba 可用时为编译内核）"""
+        return _geomath.clamp(value, min_val, max_val)
+
+    @staticmethod
+    def normalize_heading(heading: float) -> float:
+        """航向归一化到 [0, 360)"""
+        return _geomath.normalize_heading(heading)
+
+    @staticmethod
+    def normalize_state(state: dict) -> dict:
+        """为单元状态 dict 就地构建装备索引（幂等）
+
+        客户端的状态 TTL 缓存让同一 dict 对象在一个决策 tick 内被
+        多个技能复用；取到状态后先 normalize 一次，后续所有
+        find_equipment_by_* 查找都变成哈希命中。
+        """
+        if "_equip_by_type" in state:
+            return state
+        unit_name = state.get("unit_name", "")
+        by_type: dict[str, list[dict]] = defaultdict(list)
+        by_name: dict[str, dict] = {}
+        for equip in state.get("equipment", []):
+            by_type[equip.get("type")].append(equip)
+            by_name[equip.get("entity_name")] = equip
+            status = equip.get("status")
+            if unit_name and status in ("ON", "OFF"):
+                _record_power_state(unit_name, equip.get("entity_name", ""), status)
+        state["_equip_by_type"] = by_type
+        state["_equip_by_name"] = by_name
+        return state
 
     @staticmethod
     def find_equipment_by_type(unit_state: dict, equip_type: str) -> list[dict]:
-        """在单元状态中查找指定类型的装备"""
+        """在单元状态中查找指定类型的装备（normalize 过的状态走哈希索引）"""
+        index = unit_state.get("_equip_by_type")
+        if index is not None:
+            return index.get(equip_type, [])
         equipment_list = unit_state.get("equipment", [])
         return [e for e in equipment_list if e.get("type") == equip_type]
 
     @staticmethod
     def find_equipment_by_name(unit_state: dict, equip_name: str) -> dict | None:
-        """在单元状态中按名称查找装备"""
+        """在单元状态中按名称查找装备（normalize 过的状态走哈希索引）"""
+        index = unit_state.get("_equip_by_name")
+        if index is not None:
+            return index.get(equip_name)
         equipment_list = unit_state.get("equipment", [])
         for e in equipment_list:
             if e.get("entity_name") == equip_name:
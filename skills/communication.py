@@ -4,9 +4,12 @@
 """
 from loguru import logger
 
-from .base import Skill, SkillResult
+from .base import Skill, SkillResult, _control_many
 from mcp.client import get_client
 
+# 模块级绑定：技能热路径少一次全局查找（同 mcp.tools 的做法）
+_get_client = get_client
+
 
 def radio_power_on(unit_name: str, radio_name: str = None) -> SkillResult:
     """通信设备开机
@@ -15,12 +18,12 @@ def radio_power_on(unit_name: str, radio_name: str = None) -> SkillResult:
         unit_name: 单元名称
         radio_name: 通信设备名称（可选）
     """
-    client = get_client()
-    actions = []
+    client = _get_client()
 
     state = client.get(f"/api/unit/{unit_name}/state")
     if "error" in state:
         return SkillResult(success=False, description=f"无法获取单元状态: {state['error']}")
+    Skill.normalize_state(state)
 
     if radio_name:
         radio = Skill.find_equipment_by_name(state, radio_name)
@@ -32,26 +35,20 @@ def radio_power_on(unit_name: str, radio_name: str = None) -> SkillResult:
         return SkillResult(success=False, description=f"{unit_name} 没有装备通信设备")
 
     activated = []
+    to_switch = []
     for radio in radios:
         rname = radio.get("entity_name", "")
         if radio.get("status") == "ON":
             activated.append(rname)
-            continue
-
-        result = client.post(
-            f"/api/unit/{unit_name}/equipment/{rname}/control",
-            {"power": True},
-        )
-        actions.append({
-            "tool": "control_equipment",
-            "params": {"unit": unit_name, "equipment": rname, "power": True},
-            "result": result.get("result", "unknown"),
-        })
-        if result.get("result") == "success":
-            activated.append(rname)
+        else:
+            to_switch.append(rname)
+
+    # 多台设备并发下发（见 base._control_many）
+    actions = _control_many(client, unit_name, to_switch, power=True)
+    activated += [a["params"]["equipment"] for a in actions if a["result"] == "success"]
 
     description = f"{unit_name} 通信设备开机: {', '.join(activated)}"
-    logger.info(f"[Skill] {description}")
+    logger.info("[Skill] {}", description)
 
     return SkillResult(
         success=len(activated) > 0,
@@ -68,12 +65,12 @@ def radio_power_off(unit_name: str, radio_name: str = None) -> SkillResult:
         unit_name: 单元名称
         radio_name: 通信设备名称（可选）
     """
-    client = get_client()
-    actions = []
+    client = _get_client()
 
     state = client.get(f"/api/unit/{unit_name}/state")
     if "error" in state:
         return SkillResult(success=False, description=f"无法获取单元状态: {state['error']}")
+    Skill.normalize_state(state)
 
     if radio_name:
         radio = Skill.find_equipment_by_name(state, radio_name)
@@ -85,26 +82,19 @@ def radio_power_off(unit_name: str, radio_name: str = None) -> SkillResult:
         return SkillResult(success=False, description=f"{unit_name} 没有装备通信设备")
 
     deactivated = []
+    to_switch = []
     for radio in radios:
         rname = radio.get("entity_name", "")
         if radio.get("status") == "OFF":
             deactivated.append(rname)
-            continue
-
-        result = client.post(
-            f"/api/unit/{unit_name}/equipment/{rname}/control",
-            {"power": False},
-        )
-        actions.append({
-            "tool": "control_equipment",
-            "params": {"unit": unit_name, "equipment": rname, "power": False},
-            "result": result.get("result", "unknown"),
-        })
-        if result.get("result") == "success":
-            deactivated.append(rname)
+        else:
+            to_switch.append(rname)
+
+    actions = _control_many(client, unit_name, to_switch, power=False)
+    deactivated += [a["params"]["equipment"] for a in actions if a["result"] == "success"]
 
     description = f"{unit_name} 通信设备关机（静默模式）: {', '.join(deactivated)}"
-    logger.info(f"[Skill] {description}")
+    logger.info("[Skill] {}", description)
 
     return SkillResult(
         success=len(deactivated) > 0,
@@ -4,9 +4,12 @@
 """
 from loguru import logger
 
-from .base import Skill, SkillResult
+from .base import Skill, SkillResult, _control_many
 from mcp.client import get_client
 
+# 模块级绑定：技能热路径少一次全局查找（同 mcp.tools 的做法）
+_get_client = get_client
+
 
 def activate_jammer(unit_name: str, jammer_name: str = None) -> SkillResult:
     """开启干扰机
@@ -17,12 +20,12 @@ def activate_jammer(unit_name: str, jammer_name: str = None) -> SkillResult:
         unit_name: 单元名称
         jammer_name: 干扰机名称（可选，不指定则开启所有干扰机）
     """
-    client = get_client()
-    actions = []
+    client = _get_client()
 
     state = client.get(f"/api/unit/{unit_name}/state")
     if "error" in state:
         return SkillResult(success=False, description=f"无法获取单元状态: {state['error']}")
+    Skill.normalize_state(state)
 
     # 查找干扰机
     if jammer_name:
@@ -35,26 +38,20 @@ def activate_jammer(unit_name: str, jammer_name: str = None) -> SkillResult:
         return SkillResult(success=False, description=f"{unit_name} 没有装备干扰机")
 
     activated = []
+    to_switch = []
     for jammer in jammers:
         jname = jammer.get("entity_name", "")
         if jammer.get("status") == "ON":
             activated.append(jname)
-            continue
-
-        result = client.post(
-            f"/api/unit/{unit_name}/equipment/{jname}/control",
-            {"power": True},
-        )
-        actions.append({
-            "tool": "control_equipment",
-            "params": {"unit": unit_name, "equipment": jname, "power": True},
-            "result": result.get("result", "unknown"),
-        })
-        if result.get("result") == "success":
-            activated.append(jname)
+        else:
+            to_switch.append(jname)
+
+    # 多部干扰机并发下发（见 base._control_many）
+    actions = _control_many(client, unit_name, to_switch, power=True)
+    activated += [a["params"]["equipment"] for a in actions if a["result"] == "success"]
 
     description = f"{unit_name} 干扰机开启: {', '.join(activated)}"
-    logger.info(f"[Skill] {description}")
+    logger.info("[Skill] {}", description)
 
     return SkillResult(
         success=len(activated) > 0,
@@ -71,12 +68,12 @@ def deactivate_jammer(unit_name: str, jammer_name: str = None) -> SkillResult:
         unit_name: 单元名称
         jammer_name: 干扰机名称（可选）
     """
-    client = get_client()
-    actions = []
+    client = _get_client()
 
     state = client.get(f"/api/unit/{unit_name}/state")
     if "error" in state:
         return SkillResult(success=False, description=f"无法获取单元状态: {state['error']}")
+    Skill.normalize_state(state)
 
     if jammer_name:
         jammer = Skill.find_equipment_by_name(state, jammer_name)
@@ -88,26 +85,19 @@ def deactivate_jammer(unit_name: str, jammer_name: str = None) -> SkillResult:
         return SkillResult(success=False, description=f"{unit_name} 没有装备干扰机")
 
     deactivated = []
+    to_switch = []
     for jammer in jammers:
         jname = jammer.get("entity_name", "")
         if jammer.get("status") == "OFF":
             deactivated.append(jname)
-            continue
-
-        result = client.post(
-            f"/api/unit/{unit_name}/equipment/{jname}/control",
-            {"power": False},
-        )
-        actions.append({
-            "tool": "control_equipment",
-            "params": {"unit": unit_name, "equipment": jname, "power": False},
-            "result": result.get("result", "unknown"),
-        })
-        if result.get("result") == "success":
-            deactivated.append(jname)
+        else:
+            to_switch.append(jname)
+
+    actions = _control_many(client, unit_name, to_switch, power=False)
+    deactivated += [a["params"]["equipment"] for a in actions if a["result"] == "success"]
 
     description = f"{unit_name} 干扰机关闭: {', '.join(deactivated)}"
-    logger.info(f"[Skill] {description}")
+    logger.info("[Skill] {}", description)
 
     return SkillResult(
         success=len(deactivated) > 0,
@@ -2,12 +2,12 @@
 飞行控制技能（使用新的平台直接控制接口）
 包含：航路飞行、巡逻、返航、编队、规避
 """
-import math
 from loguru import logger
 
+from . import _geomath
 from .base import Skill, SkillResult
 from mcp.tools import (
-    get_unit_state, platform_move_to_pos, platform_move_to_direction,
+    platform_move_to_pos, platform_move_to_direction,
     platform_patrol, platform_return_land, platform_formation,
     control_equipment,
 )
@@ -38,11 +38,11 @@ class FlightSkills(Skill):
             })
             return SkillResult(
                 success=True,
-                message=f"{unit_name} 飞往 ({latitude:.4f}, {longitude:.4f}) 高度{altitude}m 速度{speed}m/s",
+                description=f"{unit_name} 飞往 ({latitude:.4f}, {longitude:.4f}) 高度{altitude}m 速度{speed}m/s",
                 data=result,
             )
         except Exception as e:
-            return SkillResult(success=False, message=f"飞行控制失败: {str(e)}")
+            return SkillResult(success=False, description=f"飞行控制失败: {str(e)}")
 
     @staticmethod
     def fly_heading(unit_name: str, heading: float, altitude: float = 5000.0, speed: float = 200.0) -> SkillResult:
@@ -63,11 +63,11 @@ class FlightSkills(Skill):
             })
             return SkillResult(
                 success=True,
-                message=f"{unit_name} 按航向 {heading}° 飞行",
+                description=f"{unit_name} 按航向 {heading}° 飞行",
                 data=result,
             )
         except Exception as e:
-            return SkillResult(success=False, message=f"航向飞行失败: {str(e)}")
+            return SkillResult(success=False, description=f"航向飞行失败: {str(e)}")
 
     @staticmethod
     def patrol_airspace(unit_name: str, airspace_name: str,
@@ -82,11 +82,11 @@ class FlightSkills(Skill):
             })
             return SkillResult(
                 success=True,
-                message=f"{unit_name} 在空域 {airspace_name} 巡逻",
+                description=f"{unit_name} 在空域 {airspace_name} 巡逻",
                 data=result,
             )
         except Exception as e:
-            return SkillResult(success=False, message=f"巡逻指令失败: {str(e)}")
+            return SkillResult(success=False, description=f"巡逻指令失败: {str(e)}")
 
     @staticmethod
     def return_to_base(unit_name: str, airport_name: str = None) -> SkillResult:
@@ -99,11 +99,11 @@ class FlightSkills(Skill):
             })
             return SkillResult(
                 success=True,
-                message=f"{unit_name} 返航" + (f"至 {airport_name}" if airport_name else ""),
+                description=f"{unit_name} 返航" + (f"至 {airport_name}" if airport_name else ""),
                 data=result,
             )
         except Exception as e:
-            return SkillResult(success=False, message=f"返航指令失败: {str(e)}")
+            return SkillResult(success=False, description=f"返航指令失败: {str(e)}")
 
     @staticmethod
     def join_formation(unit_name: str, leader_name: str, formation_name: str = None) -> SkillResult:
@@ -116,11 +116,11 @@ class FlightSkills(Skill):
             })
             return SkillResult(
                 success=True,
-                message=f"{unit_name} 加入 {leader_name} 的编队",
+                description=f"{unit_name} 加入 {leader_name} 的编队",
                 data=result,
             )
         except Exception as e:
-            return SkillResult(success=False, message=f"编队指令失败: {str(e)}")
+            return SkillResult(success=False, description=f"编队指令失败: {str(e)}")
 
     @staticmethod
     def combat_spread(unit_name: str, threat_bearing: float, altitude: float = None,
@@ -134,30 +134,25 @@ class FlightSkills(Skill):
             speed: 展开速度（可选，默认保持当前速度）
         """
         try:
-            state = get_unit_state.invoke({"unit_name": unit_name})
-            if "error" in state:
-                return SkillResult(success=False, message=f"获取状态失败: {state['error']}")
-
-            current_alt = state.get("position", {}).get("altitude", 5000.0)
-            current_spd = state.get("speed", 200.0)
-
-            # 计算横向展开航向（垂直于威胁方向）
-            spread_heading = (threat_bearing + 90.0) % 360.0
+            # 计算横向展开航向（垂直于威胁方向，查表）
+            spread_heading = _geomath.spread_heading(threat_bearing)
 
+            # 高度/速度缺省时不再取一次状态回填默认值：请求体省略
+            # 对应字段、由引擎保持当前值，关键路径少一次状态 RPC
             result = platform_move_to_direction.invoke({
                 "unit_name": unit_name,
                 "heading": spread_heading,
-                "altitude": altitude or current_alt,
-                "speed": speed or current_spd,
+                "altitude": altitude,
+                "speed": speed,
                 "turn_g": 4.0,
             })
             return SkillResult(
                 success=True,
-                message=f"{unit_name} 面对威胁方位 {threat_bearing}° 横向展开至 {spread_heading}°",
+                description=f"{unit_name} 面对威胁方位 {threat_bearing}° 横向展开至 {spread_heading}°",
                 data=result,
             )
         except Exception as e:
-            return SkillResult(success=False, message=f"战斗展开失败: {str(e)}")
+            return SkillResult(success=False, description=f"战斗展开失败: {str(e)}")
 
 
 # 技能注册函数
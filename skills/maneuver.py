@@ -2,12 +2,25 @@
 机动技能模块
 包含飞行器机动相关的战术技能
 """
-import math
 from loguru import logger
 
-from .base import Skill, SkillResult
+from . import _geomath
+from ._dispatch import get_command_pool
+from .base import Skill, SkillResult, _control_many
 from mcp.client import get_client
 
+# 模块级绑定：技能热路径少一次全局查找（同 mcp.tools 的做法）
+_get_client = get_client
+
+
+def _post_alter(unit_name: str, data: dict) -> dict:
+    """经派发池下发姿态指令并等待结果
+
+    同一单元排队中尚未发出的旧姿态指令会被新指令合并覆盖：
+    紧凑控制循环里连发的航向/高度更新只有最后一条真正下发，
+    引擎不会按过时序列逐条机动。"""
+    return get_command_pool().submit_alter(unit_name, data).result()
+
 
 def climb_and_accelerate(
     unit_name: str,
@@ -28,7 +41,7 @@ def climb_and_accelerate(
     Returns:
         SkillResult 执行结果
     """
-    client = get_client()
+    client = _get_client()
     actions = []
 
     # 获取当前状态
@@ -50,7 +63,7 @@ def climb_and_accelerate(
         "speed": target_speed,
         "pitch": pitch_angle,
     }
-    result = client.post(f"/api/unit/{unit_name}/alter", alter_data)
+    result = _post_alter(unit_name, alter_data)
     actions.append({"tool": "alter_unit", "params": alter_data, "result": result.get("result", "unknown")})
 
     description = (
@@ -59,7 +72,7 @@ def climb_and_accelerate(
         f"速度 {current_speed:.1f}m/s -> {target_speed:.1f}m/s, "
         f"俯仰角 {pitch_angle:.1f}°"
     )
-    logger.info(f"[Skill] {description}")
+    logger.info("[Skill] {}", description)
 
     return SkillResult(
         success=result.get("result") == "success",
@@ -83,7 +96,7 @@ def descend_and_decelerate(
         target_speed: 目标速度（m/s）
         pitch_angle: 下降俯仰角（度），默认-10度
     """
-    client = get_client()
+    client = _get_client()
     actions = []
 
     state = client.get(f"/api/unit/{unit_name}/state")
@@ -99,11 +112,11 @@ def descend_and_decelerate(
         "speed": target_speed,
         "pitch": pitch_angle,
     }
-    result = client.post(f"/api/unit/{unit_name}/alter", alter_data)
+    result = _post_alter(unit_name, alter_data)
     actions.append({"tool": "alter_unit", "params": alter_data, "result": result.get("result", "unknown")})
 
     description = f"{unit_name} 执行下降减速: 目标高度 {target_altitude:.0f}m, 目标速度 {target_speed:.1f}m/s"
-    logger.info(f"[Skill] {description}")
+    logger.info("[Skill] {}", description)
 
     return SkillResult(
         success=result.get("result") == "success",
@@ -121,7 +134,7 @@ def turn_to_heading(unit_name: str, target_heading: float) -> SkillResult:
         unit_name: 单元名称
         target_heading: 目标航向（度，0=北，顺时针）
     """
-    client = get_client()
+    client = _get_client()
     actions = []
 
     state = client.get(f"/api/unit/{unit_name}/state")
@@ -132,11 +145,11 @@ def turn_to_heading(unit_name: str, target_heading: float) -> SkillResult:
     target_heading = target_heading % 360
 
     alter_data = {"heading": target_heading}
-    result = client.post(f"/api/unit/{unit_name}/alter", alter_data)
+    result = _post_alter(unit_name, alter_data)
     actions.append({"tool": "alter_unit", "params": alter_data, "result": result.get("result", "unknown")})
 
     description = f"{unit_name} 转向: {current_heading:.1f}° -> {target_heading:.1f}°"
-    logger.info(f"[Skill] {description}")
+    logger.info("[Skill] {}", description)
 
     return SkillResult(
         success=result.get("result") == "success",
@@ -154,13 +167,14 @@ def evade_missile(unit_name: str, threat_bearing: float = None) -> SkillResult:
         unit_name: 单元名称
         threat_bearing: 威胁来袭方位角（度）。如果提供，将背向威胁方向转向。
     """
-    client = get_client()
+    client = _get_client()
     actions = []
 
     # 获取当前状态
     state = client.get(f"/api/unit/{unit_name}/state")
     if "error" in state:
         return SkillResult(success=False, description=f"无法获取单元状态: {state['error']}")
+    Skill.normalize_state(state)
 
     current_heading = state.get("orientation", {}).get("heading", 0)
     current_alt = state.get("position", {}).get("altitude", 5000)
@@ -168,7 +182,7 @@ def evade_missile(unit_name: str, threat_bearing: float = None) -> SkillResult:
 
     # 计算规避航向（背向威胁 +/- 随机偏移以增加不可预测性）
     if threat_bearing is not None:
-        evade_heading = (threat_bearing + 150) % 360  # 近似背向，略偏
+        evade_heading = _geomath.evade_heading(threat_bearing)  # 近似背向，略偏（查表）
     else:
         evade_heading = (current_heading + 90) % 360  # 无威胁信息则横转
 
@@ -184,23 +198,16 @@ def evade_missile(unit_name: str, threat_bearing: float = None) -> SkillResult:
         "pitch": -20,  # 急降
         "roll": 60,  # 大角度滚转
     }
-    result = client.post(f"/api/unit/{unit_name}/alter", alter_data)
+    result = _post_alter(unit_name, alter_data)
     actions.append({"tool": "alter_unit", "params": alter_data, "result": result.get("result", "unknown")})
 
-    # 开启干扰机（如果有的话）
+    # 开启干扰机（如果有的话；多部经 bulk/并发路径一次下发）
     jammers = Skill.find_equipment_by_type(state, "jammer")
-    for jammer in jammers:
-        jammer_name = jammer.get("entity_name", "")
-        if jammer.get("status") != "ON" and jammer_name:
-            jammer_result = client.post(
-                f"/api/unit/{unit_name}/equipment/{jammer_name}/control",
-                {"power": True},
-            )
-            actions.append({
-                "tool": "control_equipment",
-                "params": {"equipment": jammer_name, "power": True},
-                "result": jammer_result.get("result", "unknown"),
-            })
+    to_switch = [
+        j.get("entity_name", "") for j in jammers
+        if j.get("status") != "ON" and j.get("entity_name")
+    ]
+    actions.extend(_control_many(client, unit_name, to_switch, power=True))
 
     description = (
         f"{unit_name} 执行导弹规避: "
@@ -209,7 +216,7 @@ def evade_missile(unit_name: str, threat_bearing: float = None) -> SkillResult:
         f"速度 -> {evade_speed:.1f}m/s, "
         f"干扰机已激活 {len(jammers)} 部"
     )
-    logger.info(f"[Skill] {description}")
+    logger.info("[Skill] {}", description)
 
     return SkillResult(
         success=True,
@@ -237,12 +244,13 @@ def intercept_target(
         target_alt: 目标高度
         intercept_speed: 截击速度（m/s）
     """
-    client = get_client()
+    client = _get_client()
     actions = []
 
     state = client.get(f"/api/unit/{unit_name}/state")
     if "error" in state:
         return SkillResult(success=False, description=f"无法获取单元状态: {state['error']}")
+    Skill.normalize_state(state)
 
     my_lat = state.get("position", {}).get("latitude", 0)
     my_lon = state.get("position", {}).get("longitude", 0)
@@ -260,23 +268,16 @@ def intercept_target(
         "altitude": target_alt,
         "speed": intercept_speed,
     }
-    result = client.post(f"/api/unit/{unit_name}/alter", alter_data)
+    result = _post_alter(unit_name, alter_data)
     actions.append({"tool": "alter_unit", "params": alter_data, "result": result.get("result", "unknown")})
 
-    # 开启雷达
+    # 开启雷达（多部经 bulk/并发路径一次下发）
     radars = Skill.find_equipment_by_type(state, "radar")
-    for radar in radars:
-        radar_name = radar.get("entity_name", "")
-        if radar.get("status") != "ON" and radar_name:
-            radar_result = client.post(
-                f"/api/unit/{unit_name}/equipment/{radar_name}/control",
-                {"power": True},
-            )
-            actions.append({
-                "tool": "control_equipment",
-                "params": {"equipment": radar_name, "power": True},
-                "result": radar_result.get("result", "unknown"),
-            })
+    to_switch = [
+        r.get("entity_name", "") for r in radars
+        if r.get("status") != "ON" and r.get("entity_name")
+    ]
+    actions.extend(_control_many(client, unit_name, to_switch, power=True))
 
     description = (
         f"{unit_name} 执行截击: "
@@ -285,7 +286,7 @@ def intercept_target(
         f"速度 {intercept_speed:.1f}m/s, "
         f"目标高度 {target_alt:.0f}m"
     )
-    logger.info(f"[Skill] {description}")
+    logger.info("[Skill] {}", description)
 
     return SkillResult(
         success=True,
@@ -297,3 +298,73 @@ def intercept_target(
             "radars_activated": len(radars),
         },
     )
+
+
+def intercept_targets(
+    unit_name: str,
+    targets: list,
+    intercept_speed: float = 400.0,
+) -> SkillResult:
+    """多目标截击分诊技能
+
+    对 K 个候选目标只取一次己方状态，批量计算全部距离后
+    选最近者下发一条截击指令；相比逐目标调用 intercept_target，
+    K 次状态 RPC + K 次三角计算收敛为各一次。
+
+    Args:
+        unit_name: 单元名称
+        targets: 目标列表，每项为含 latitude/longitude/altitude 的 dict
+        intercept_speed: 截击速度（m/s）
+    """
+    if not targets:
+        return SkillResult(success=False, description="目标列表为空")
+
+    client = _get_client()
+    actions = []
+
+    state = client.get(f"/api/unit/{unit_name}/state")
+    if "error" in state:
+        return SkillResult(success=False, description=f"无法获取单元状态: {state['error']}")
+    Skill.normalize_state(state)
+
+    my_lat = state.get("position", {}).get("latitude", 0)
+    my_lon = state.get("position", {}).get("longitude", 0)
+
+    # 批量分诊：向量化距离 + argmin 挑最近威胁
+    idx = Skill.pick_nearest_target(my_lat, my_lon, targets)
+    chosen = targets[idx]
+    target_lat = chosen.get("latitude", 0.0)
+    target_lon = chosen.get("longitude", 0.0)
+    target_alt = chosen.get("altitude", state.get("position", {}).get("altitude", 5000))
+
+    intercept_heading = Skill.calculate_bearing(my_lat, my_lon, target_lat, target_lon)
+    distance = Skill.calculate_distance(my_lat, my_lon, target_lat, target_lon)
+    intercept_speed = Skill.clamp(intercept_speed, 100, 800)
+
+    alter_data = {
+        "heading": intercept_heading,
+        "altitude": target_alt,
+        "speed": intercept_speed,
+    }
+    result = _post_alter(unit_name, alter_data)
+    actions.append({"tool": "alter_unit", "params": alter_data, "result": result.get("result", "unknown")})
+
+    description = (
+        f"{unit_name} 从 {len(targets)} 个目标中截击最近者(#{idx}): "
+        f"航向 {intercept_heading:.1f}°, "
+        f"距离 {distance / 1000:.1f}km, "
+        f"速度 {intercept_speed:.1f}m/s"
+    )
+    logger.info("[Skill] {}", description)
+
+    return SkillResult(
+        success=result.get("result") == "success",
+        description=description,
+        actions_taken=actions,
+        data={
+            "target_index": idx,
+            "intercept_heading": intercept_heading,
+            "distance_m": distance,
+            "candidates": len(targets),
+        },
+    )
@@ -4,9 +4,12 @@
 """
 from loguru import logger
 
-from .base import Skill, SkillResult
+from .base import Skill, SkillResult, ensure_equipment_power
 from mcp.client import get_client
 
+# 模块级绑定：技能热路径少一次全局查找（同 mcp.tools 的做法）
+_get_client = get_client
+
 
 def radar_power_on(unit_name: str, radar_name: str = None) -> SkillResult:
     """雷达开机技能
@@ -17,7 +20,7 @@ def radar_power_on(unit_name: str, radar_name: str = None) -> SkillResult:
         unit_name: 单元名称
         radar_name: 雷达名称（可选，不指定则开启第一个雷达）
     """
-    client = get_client()
+    client = _get_client()
     actions = []
 
     # 获取单元状态
@@ -44,10 +47,11 @@ def radar_power_on(unit_name: str, radar_name: str = None) -> SkillResult:
             activated.append(rname)
             continue
 
-        result = client.post(
-            f"/api/unit/{unit_name}/equipment/{rname}/control",
-            {"power": True},
-        )
+        result = ensure_equipment_power(client, unit_name, rname, on=True)
+        if result is None:
+            # 缓存已知已开机：跳过重复 TURN_ON
+            activated.append(rname)
+            continue
         actions.append({
             "tool": "control_equipment",
             "params": {"unit": unit_name, "equipment": rname, "power": True},
@@ -57,7 +61,7 @@ def radar_power_on(unit_name: str, radar_name: str = None) -> SkillResult:
             activated.append(rname)
 
     description = f"{unit_name} 雷达开机: {', '.join(activated)}"
-    logger.info(f"[Skill] {description}")
+    logger.info("[Skill] {}", description)
 
     return SkillResult(
         success=len(activated) > 0,
@@ -74,7 +78,7 @@ def radar_power_off(unit_name: str, radar_name: str = None) -> SkillResult:
         unit_name: 单元名称
         radar_name: 雷达名称（可选）
     """
-    client = get_client()
+    client = _get_client()
     actions = []
 
     state = client.get(f"/api/unit/{unit_name}/state")
@@ -97,10 +101,11 @@ def radar_power_off(unit_name: str, radar_name: str = None) -> SkillResult:
             deactivated.append(rname)
             continue
 
-        result = client.post(
-            f"/api/unit/{unit_name}/equipment/{rname}/control",
-            {"power": False},
-        )
+        result = ensure_equipment_power(client, unit_name, rname, on=False)
+        if result is None:
+            # 缓存已知已关机：跳过重复 TURN_OFF
+            deactivated.append(rname)
+            continue
         actions.append({
             "tool": "control_equipment",
             "params": {"unit": unit_name, "equipment": rname, "power": False},
@@ -110,7 +115,7 @@ def radar_power_off(unit_name: str, radar_name: str = None) -> SkillResult:
             deactivated.append(rname)
 
     description = f"{unit_name} 雷达关机（静默模式）: {', '.join(deactivated)}"
-    logger.info(f"[Skill] {description}")
+    logger.info("[Skill] {}", description)
 
     return SkillResult(
         success=len(deactivated) > 0,
@@ -129,7 +134,7 @@ def radar_search(unit_name: str, radar_name: str = None) -> SkillResult:
         unit_name: 单元名称
         radar_name: 雷达名称（可选）
     """
-    client = get_client()
+    client = _get_client()
     actions = []
 
     state = client.get(f"/api/unit/{unit_name}/state")
@@ -149,17 +154,15 @@ def radar_search(unit_name: str, radar_name: str = None) -> SkillResult:
 
     rname = radar.get("entity_name", "")
 
-    # 确保雷达开机
+    # 确保雷达开机（缓存已知已开机时免一次控制 RPC）
     if radar.get("status") != "ON":
-        power_result = client.post(
-            f"/api/unit/{unit_name}/equipment/{rname}/control",
-            {"power": True},
-        )
-        actions.append({
-            "tool": "control_equipment",
-            "params": {"unit": unit_name, "equipment": rname, "power": True},
-            "result": power_result.get("result", "unknown"),
-        })
+        power_result = ensure_equipment_power(client, unit_name, rname, on=True)
+        if power_result is not None:
+            actions.append({
+                "tool": "control_equipment",
+                "params": {"unit": unit_name, "equipment": rname, "power": True},
+                "result": power_result.get("result", "unknown"),
+            })
 
     # 查询雷达状态
     query_result = client.get(f"/api/unit/{unit_name}/equipment/{rname}/query")
@@ -170,7 +173,7 @@ def radar_search(unit_name: str, radar_name: str = None) -> SkillResult:
     })
 
     description = f"{unit_name} 雷达 {rname} 执行搜索"
-    logger.info(f"[Skill] {description}")
+    logger.info("[Skill] {}", description)
 
     return SkillResult(
         success=True,
@@ -2,24 +2,55 @@
 武器使用技能
 包含：BVR攻击、目标锁定与发射、多目标分配
 """
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 from loguru import logger
 
-from .base import Skill, SkillResult
+from .base import Skill, SkillResult, _known_power_state, _record_power_state
 from mcp.tools import (
     get_unit_state, get_weapon_status, weapon_lock_target, weapon_launch,
     weapon_abort, control_equipment, get_world_state,
 )
 
+# target_name -> (unit_id, 写入时刻)：多目标连射时把每发一次的
+# 世界态势 RPC + O(N) 扫描摊薄为一次 dict 查找，TTL 过期后重建
+_TARGET_ID_CACHE: dict[str, tuple[int, float]] = {}
+_TARGET_ID_TTL = 0.5  # 秒
+
+
+def _cached_target_id(target_name: str):
+    """TTL 内命中则返回缓存的 unit_id，否则返回 None"""
+    hit = _TARGET_ID_CACHE.get(target_name)
+    if hit is not None and time.monotonic() - hit[1] < _TARGET_ID_TTL:
+        return hit[0]
+    return None
+
+
+def _index_world_units(world: dict) -> None:
+    """单遍扫描世界态势，整表填充 名称 -> unit_id 缓存"""
+    now = time.monotonic()
+    for u in world.get("units", []):
+        name = u.get("unit_name")
+        if name:
+            _TARGET_ID_CACHE[name] = (u.get("unit_id"), now)
+
 
 class WeaponSkills(Skill):
     """武器系统技能集"""
 
     @staticmethod
-    def bvr_attack(unit_name: str, target_name: str, weapon_name: str = None, launch_num: int = 1) -> SkillResult:
-        """BVR 超视距攻击流程
+    async def bvr_attack_async(unit_name: str, target_name: str, weapon_name: str = None,
+                               launch_num: int = 1) -> SkillResult:
+        """BVR 超视距攻击流程（异步版）
 
         完整流程: 确认目标 -> 确认武器 -> 锁定 -> 发射
 
+        发射前的三次只读调用（己方状态 / 武器状态 / 世界态势）互相独立，
+        经 asyncio.gather 并发获取，发射前延迟从 3 次串行 RTT 降到约 1 次；
+        锁定 -> 发射存在数据依赖，保持串行。
+
         Args:
             unit_name: 攻击方单元名称
             target_name: 目标单元名称
@@ -27,63 +58,92 @@ class WeaponSkills(Skill):
             launch_num: 发射弹数
         """
         try:
-            # 1. 获取己方状态
-            my_state = get_unit_state.invoke({"unit_name": unit_name})
+            # 1. 并发获取己方状态与世界态势（武器状态已知名称时一并取；
+            #    目标 ID 缓存命中时整个省掉世界态势 RPC）
+            target_id = _cached_target_id(target_name)
+            state_task = asyncio.create_task(
+                asyncio.to_thread(get_unit_state.invoke, {"unit_name": unit_name})
+            )
+            world_task = None
+            if target_id is None:
+                world_task = asyncio.create_task(asyncio.to_thread(get_world_state.invoke, {}))
+            status_task = None
+            if weapon_name:
+                status_task = asyncio.create_task(asyncio.to_thread(
+                    get_weapon_status.invoke,
+                    {"unit_name": unit_name, "weapon_name": weapon_name},
+                ))
+
+            my_state = await state_task
+            weapon_status = await status_task if status_task is not None else None
+
             if "error" in my_state:
-                return SkillResult(success=False, message=f"获取己方状态失败: {my_state['error']}")
+                if world_task is not None:
+                    world_task.cancel()
+                return SkillResult(success=False, description=f"获取己方状态失败: {my_state['error']}")
 
             # 2. 查找武器系统
             if not weapon_name:
-                weapon_name = Skill.find_equipment_by_type(my_state, "WeaponSystem")
-                if not weapon_name:
-                    return SkillResult(success=False, message="未找到武器系统")
+                weapons = Skill.find_equipment_by_type(my_state, "WeaponSystem")
+                if not weapons:
+                    return SkillResult(success=False, description="未找到武器系统")
+                weapon_name = weapons[0].get("entity_name", "")
+                weapon_status = await asyncio.to_thread(
+                    get_weapon_status.invoke,
+                    {"unit_name": unit_name, "weapon_name": weapon_name},
+                )
 
             # 3. 检查武器状态
-            weapon_status = get_weapon_status.invoke({"unit_name": unit_name, "weapon_name": weapon_name})
             if not weapon_status.get("available", False):
-                return SkillResult(success=False, message="武器系统不可用")
+                return SkillResult(success=False, description="武器系统不可用")
             if not weapon_status.get("has_munition", False):
-                return SkillResult(success=False, message="弹药已耗尽")
-
-            # 4. 获取目标信息 - 查找目标 ID
-            world = get_world_state.invoke({})
-            target_id = None
-            for u in world.get("units", []):
-                if u.get("unit_name") == target_name:
-                    target_id = u.get("unit_id")
-                    break
+                return SkillResult(success=False, description="弹药已耗尽")
+
+            # 4. 获取目标信息 - 查找目标 ID（缓存未命中时整表重建索引）
+            if world_task is not None:
+                world = await world_task
+                _index_world_units(world)
+                hit = _TARGET_ID_CACHE.get(target_name)
+                target_id = hit[0] if hit is not None else None
             if target_id is None:
-                return SkillResult(success=False, message=f"未找到目标: {target_name}")
-
-            # 5. 确认雷达开启
-            radar_name = Skill.find_equipment_by_type(my_state, "Sensor")
-            if radar_name:
-                control_equipment.invoke({
+                return SkillResult(success=False, description=f"未找到目标: {target_name}")
+
+            # 5. 确认雷达开启（快照或电源缓存显示已开启时跳过 RPC）
+            radars = Skill.find_equipment_by_type(my_state, "Sensor")
+            for radar in radars:
+                radar_name = radar.get("entity_name", "")
+                if not radar_name:
+                    continue
+                if radar.get("status") == "ON" or _known_power_state(unit_name, radar_name) == "ON":
+                    continue
+                ctrl = await asyncio.to_thread(control_equipment.invoke, {
                     "unit_name": unit_name,
                     "equipment_name": radar_name,
                     "action": "TURN_ON",
                 })
+                if isinstance(ctrl, dict) and ctrl.get("result") == "success":
+                    _record_power_state(unit_name, radar_name, "ON")
 
             # 6. 锁定目标
-            lock_result = weapon_lock_target.invoke({
+            lock_result = await asyncio.to_thread(weapon_lock_target.invoke, {
                 "unit_name": unit_name,
                 "weapon_name": weapon_name,
                 "target_id": target_id,
             })
-            logger.info(f"[Weapon] 锁定目标: {target_name}(ID={target_id})")
+            logger.info("[Weapon] 锁定目标: {}(ID={})", target_name, target_id)
 
             # 7. 发射
-            launch_result = weapon_launch.invoke({
+            launch_result = await asyncio.to_thread(weapon_launch.invoke, {
                 "unit_name": unit_name,
                 "weapon_name": weapon_name,
                 "target_id": target_id,
                 "launch_num": launch_num,
             })
-            logger.warning(f"[Weapon] 发射武器: {unit_name} -> {target_name}, 弹数={launch_num}")
+            logger.warning("[Weapon] 发射武器: {} -> {}, 弹数={}", unit_name, target_name, launch_num)
 
             return SkillResult(
                 success=True,
-                message=f"BVR攻击执行完成: {unit_name} 向 {target_name} 发射 {launch_num} 枚导弹",
+                description=f"BVR攻击执行完成: {unit_name} 向 {target_name} 发射 {launch_num} 枚导弹",
                 data={
                     "attacker": unit_name,
                     "target": target_name,
@@ -96,7 +156,20 @@ class WeaponSkills(Skill):
             )
         except Exception as e:
             logger.error(f"[Weapon] BVR 攻击失败: {e}")
-            return SkillResult(success=False, message=f"BVR攻击异常: {str(e)}")
+            return SkillResult(success=False, description=f"BVR攻击异常: {str(e)}")
+
+    @staticmethod
+    def bvr_attack(unit_name: str, target_name: str, weapon_name: str = None,
+                   launch_num: int = 1) -> SkillResult:
+        """BVR 超视距攻击流程（同步入口，内部走异步并发版）"""
+        coro = WeaponSkills.bvr_attack_async(unit_name, target_name, weapon_name, launch_num)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coro)
+        # 已在事件循环内：换线程跑独立循环，避免嵌套 asyncio.run
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            return pool.submit(asyncio.run, coro).result()
 
     @staticmethod
     def abort_engagement(unit_name: str, weapon_name: str = None) -> SkillResult:
@@ -107,16 +180,19 @@ class WeaponSkills(Skill):
             weapon_name: 武器系统名称
         """
         try:
+            # 交战中止通常意味着态势剧变（目标被毁/撤出），作废 ID 缓存
+            _TARGET_ID_CACHE.clear()
             if not weapon_name:
                 state = get_unit_state.invoke({"unit_name": unit_name})
-                weapon_name = Skill.find_equipment_by_type(state, "WeaponSystem")
-                if not weapon_name:
-                    return SkillResult(success=False, message="未找到武器系统")
+                weapons = Skill.find_equipment_by_type(state, "WeaponSystem")
+                if not weapons:
+                    return SkillResult(success=False, description="未找到武器系统")
+                weapon_name = weapons[0].get("entity_name", "")
 
             result = weapon_abort.invoke({"unit_name": unit_name, "weapon_name": weapon_name})
-            return SkillResult(success=True, message=f"已中止交战: {unit_name}/{weapon_name}", data=result)
+            return SkillResult(success=True, description=f"已中止交战: {unit_name}/{weapon_name}", data=result)
         except Exception as e:
-            return SkillResult(success=False, message=f"中止交战失败: {str(e)}")
+            return SkillResult(success=False, description=f"中止交战失败: {str(e)}")
 
 
 # 技能注册
@@ -24,11 +24,42 @@ sys.path.insert(0, str(UI_DIR))
 import streamlit as st
 from styles import get_global_css, get_ui_text, get_ui_param
 
-# ──────────── 从配置读取应用元信息 ────────────
-app_title = get_ui_text("app", "title", "AI 飞行仿真 Agent")
-app_icon = get_ui_text("app", "icon", "✈️")
-app_version = get_ui_text("app", "version", "v1.0")
-app_subtitle = get_ui_text("app", "subtitle", "Streamlit Dashboard")
+from mcp.client import get_client
+from utils.logger import setup_logger
+
+# ──────────── 应用元信息 / CSS / 导航配置（进程内只加载一次） ────────────
+@st.cache_resource
+def _ui_bootstrap() -> dict:
+    """一次性加载全局 CSS、应用元信息和导航配置
+
+    Streamlit 每次控件交互都重跑脚本；styles 的 JSON 读盘与解析
+    挪进 cache_resource 后重跑为零开销。修改 theme.json 等配置后
+    通过「Clear cache」或重启服务生效。
+    """
+    # 日志系统随 UI 进程初始化一次（幂等）：挂 sink 并把 stdlib
+    # logging（mcp 层）桥接进 loguru，否则 WARNING 以下的记录丢失
+    setup_logger()
+    return {
+        "css": get_global_css(),
+        "title": get_ui_text("app", "title", "AI 飞行仿真 Agent"),
+        "icon": get_ui_text("app", "icon", "✈️"),
+        "version": get_ui_text("app", "version", "v1.0"),
+        "subtitle": get_ui_text("app", "subtitle", "Streamlit Dashboard"),
+        "nav": get_ui_param("navigation", None, [
+            {"label": "💬 智能对话", "page": "chat"},
+            {"label": "📚 知识库管理", "page": "knowledge"},
+            {"label": "⚙️ 系统配置", "page": "settings"},
+            {"label": "🔗 MCP 服务", "page": "mcp_monitor"},
+        ]),
+    }
+
+
+_cfg = _ui_bootstrap()
+app_title = _cfg["title"]
+app_icon = _cfg["icon"]
+app_version = _cfg["version"]
+app_subtitle = _cfg["subtitle"]
+nav_config = _cfg["nav"]
 
 # ──────────── 页面配置 ────────────
 st.set_page_config(
@@ -38,25 +69,28 @@ st.set_page_config(
     initial_sidebar_state="expanded",
 )
 
-# ──────────── 注入全局 CSS（热加载，修改 theme.json 后自动生效） ────────────
-st.markdown(get_global_css(), unsafe_allow_html=True)
-
-# ──────────── 从配置读取导航项 ────────────
-nav_config = get_ui_param("navigation", None, [
-    {"label": "💬 智能对话", "page": "chat"},
-    {"label": "📚 知识库管理", "page": "knowledge"},
-    {"label": "⚙️ 系统配置", "page": "settings"},
-    {"label": "🔗 MCP 服务", "page": "mcp_monitor"},
-])
+# ──────────── 注入全局 CSS ────────────
+st.markdown(_cfg["css"], unsafe_allow_html=True)
 
 nav_labels = [item.get("label", "") for item in nav_config]
-nav_pages = [item.get("page", "") for item in nav_config]
+
+
+@st.cache_data(ttl=2.0, show_spinner=False)
+def _cached_health():
+    """引擎健康检查（2 秒 TTL）：True/False/None = 正常/响应异常/未连接"""
+    try:
+        return get_client().health_check()
+    except Exception:
+        return None
 
 # ──────────── 侧边栏 ────────────
 with st.sidebar:
     st.markdown(f"## {app_icon} {app_title}")
     st.markdown("---")
 
+    # 导航用 radio 而非 st.tabs：tabs 每次重跑会执行所有标签页的
+    # 渲染函数（四个页面各自的 RPC 全部触发），radio 每轮只渲染
+    # 选中页；配合下方缓存的渲染表，切页开销只剩一次 dict 查找
     page_label = st.radio(
         "导航",
         nav_labels,
@@ -65,37 +99,39 @@ with st.sidebar:
 
     st.markdown("---")
 
-    # 引擎连接状态指示
+    # 引擎连接状态指示（2 秒内的重跑复用探测结果，
+    # 避免每次控件交互都同步 ping 一次引擎）
     st.markdown("### 引擎状态")
-    try:
-        from mcp.client import get_client
-        client = get_client()
-        ok = client.health_check()
-        if ok:
-            st.success("🟢 引擎已连接")
-        else:
-            st.warning("🟡 引擎响应异常")
-    except Exception:
+    _health = _cached_health()
+    if _health:
+        st.success("🟢 引擎已连接")
+    elif _health is False:
+        st.warning("🟡 引擎响应异常")
+    else:
         st.error("🔴 引擎未连接")
 
     st.caption(f"{app_version} · {app_subtitle}")
 
 # ──────────── 页面路由 ────────────
-selected_page = ""
-for i, label in enumerate(nav_labels):
-    if page_label == label:
-        selected_page = nav_pages[i]
-        break
-
-if selected_page == "chat":
-    from components import chat
-    chat.render()
-elif selected_page == "knowledge":
-    from components import knowledge
-    knowledge.render()
-elif selected_page == "settings":
-    from components import settings
-    settings.render()
-elif selected_page == "mcp_monitor":
-    from components import mcp_monitor
-    mcp_monitor.render()
+@st.cache_resource
+def _page_renderers() -> dict:
+    """页面渲染函数表（组件子树进程内只导入一次）
+
+    Streamlit 每次交互都重跑整个脚本，把 import 和分支挪进
+    cache_resource 后，重跑只剩一次 dict 查找。
+    """
+    from components import chat, knowledge, settings, mcp_monitor
+    return {
+        "chat": chat.render,
+        "knowledge": knowledge.render,
+        "settings": settings.render,
+        "mcp_monitor": mcp_monitor.render,
+    }
+
+
+nav_map = {item.get("label", ""): item.get("page", "") for item in nav_config}
+selected_page = nav_map.get(page_label, "")
+
+renderer = _page_renderers().get(selected_page)
+if renderer is not None:
+    renderer()
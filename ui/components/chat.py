@@ -3,14 +3,72 @@
 所有文本、参数、快捷指令均从外部配置加载
 """
 import streamlit as st
+import io
 import json
 import time
 import sys
+from collections import deque
+from functools import lru_cache
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 from styles import get_ui_text, get_ui_param, _quick_commands
 
+from mcp.client import get_client
+
+try:
+    # orjson 解析快数倍；其 JSONDecodeError 兼容标准库的 except 子句
+    import orjson
+
+    def _json_loads(s):
+        return orjson.loads(s)
+except ImportError:
+    _json_loads = json.loads
+
+
+def _fragmented(func):
+    """可用时用 st.fragment 装饰，把函数隔离成独立重跑域
+
+    片段内部事件只重跑片段自身而非整个脚本；旧版 Streamlit
+    没有 fragment 时退化为普通函数。
+    """
+    frag = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
+    return frag(func) if frag is not None else func
+
+
+@_fragmented
+def _render_messages(user_avatar: str, ai_avatar: str):
+    """渲染对话历史（空态提示或全部消息）"""
+    if not st.session_state.chat_messages:
+        empty_title = get_ui_text("chat", "empty_title", "✈️ 准备就绪")
+        empty_desc = get_ui_text("chat", "empty_desc", "输入任务指令开始对话")
+        st.markdown(
+            f"<div style='text-align:center; color:#8b949e; padding:4rem 0;'>"
+            f"<h3>{empty_title}</h3>"
+            f"<p>{empty_desc}</p>"
+            f"</div>",
+            unsafe_allow_html=True,
+        )
+    else:
+        for msg in st.session_state.chat_messages:
+            if msg["role"] == "user":
+                with st.chat_message("user", avatar=user_avatar):
+                    st.markdown(msg["content"])
+            else:
+                with st.chat_message("assistant", avatar=ai_avatar):
+                    st.markdown(msg["content"])
+
+
+@lru_cache(maxsize=1)
+def _agent_runner():
+    """惰性加载 run_agent_stream 并缓存绑定
+
+    agent.graph 连带拉起 langgraph/langchain 全家桶，只在首次
+    下达任务时导入；之后每次调用免去重复的 import 机制开销。
+    """
+    from agent.graph import run_agent_stream
+    return run_agent_stream
+
 
 def render():
     # ── 页面标题（从配置读取）──
@@ -18,8 +76,12 @@ def render():
     st.markdown(get_ui_text("chat", "page_desc", "向 AI 飞行指挥官下达任务指令"))
 
     # ── 初始化会话状态 ──
+    # 有界 deque：超出 max_history 时 O(1) 淘汰最旧消息，
+    # 长会话的内存占用和历史重绘成本都有上限
     if "chat_messages" not in st.session_state:
-        st.session_state.chat_messages = []
+        st.session_state.chat_messages = deque(
+            maxlen=get_ui_param("chat", "max_history", 500)
+        )
     if "agent_running" not in st.session_state:
         st.session_state.agent_running = False
 
@@ -47,13 +109,18 @@ def render():
     with col_clear:
         st.markdown("<div style='height:28px'></div>", unsafe_allow_html=True)
         if st.button("🗑️ 清空对话", use_container_width=True):
-            st.session_state.chat_messages = []
+            st.session_state.chat_messages.clear()
             st.rerun()
     with col_export:
         st.markdown("<div style='height:28px'></div>", unsafe_allow_html=True)
         if st.button("📋 导出对话", use_container_width=True):
             if st.session_state.chat_messages:
-                export_text = _export_chat(st.session_state.chat_messages)
+                # 转成可哈希的元组作为缓存键；时间戳在缓存外追加
+                msgs = tuple((m["role"], m["content"]) for m in st.session_state.chat_messages)
+                export_text = (
+                    _export_chat(msgs)
+                    + f"\n---\n导出时间: {time.strftime('%Y-%m-%d %H:%M:%S')}\n"
+                )
                 st.session_state["_export_text"] = export_text
             else:
                 st.toast("暂无对话记录")
@@ -71,24 +138,7 @@ def render():
     # ── 对话历史展示 ──
     chat_container = st.container(height=chat_height)
     with chat_container:
-        if not st.session_state.chat_messages:
-            empty_title = get_ui_text("chat", "empty_title", "✈️ 准备就绪")
-            empty_desc = get_ui_text("chat", "empty_desc", "输入任务指令开始对话")
-            st.markdown(
-                f"<div style='text-align:center; color:#8b949e; padding:4rem 0;'>"
-                f"<h3>{empty_title}</h3>"
-                f"<p>{empty_desc}</p>"
-                f"</div>",
-                unsafe_allow_html=True,
-            )
-        else:
-            for msg in st.session_state.chat_messages:
-                if msg["role"] == "user":
-                    with st.chat_message("user", avatar=user_avatar):
-                        st.markdown(msg["content"])
-                else:
-                    with st.chat_message("assistant", avatar=ai_avatar):
-                        st.markdown(msg["content"])
+        _render_messages(user_avatar, ai_avatar)
 
     # ── 输入框 ──
     user_input = st.chat_input(input_placeholder)
@@ -127,23 +177,33 @@ def render():
 def _run_agent_task(task: str, max_iterations: int, skip_check: bool) -> str:
     """执行 Agent 任务并返回结果文本"""
     try:
-        import config
-
         if not skip_check:
-            from mcp.client import get_client
             client = get_client()
             if not client.health_check():
                 return "❌ **引擎未连接**，请先启动 C++ 仿真引擎或开启离线模式。"
 
-        from agent.graph import run_agent
-        final_state = run_agent(task, max_iterations=max_iterations)
+        # 流式消费 Agent 进度，按 25ms 合并窗口刷新占位符：
+        # 把逐节点的重绘摊薄成少量批量刷新
+        final_state = None
+        progress = st.empty()
+        nodes, last_flush = [], 0.0
+        for kind, payload in _agent_runner()(task, max_iterations=max_iterations):
+            if kind == "final":
+                final_state = payload
+                continue
+            nodes.append(str(payload))
+            now = time.monotonic()
+            if now - last_flush >= 0.025:
+                progress.markdown("⏳ " + " → ".join(nodes[-6:]))
+                last_flush = now
+        progress.empty()
 
         parts = ["### ✅ 任务执行完成\n"]
         if final_state:
             intent = final_state.get("tactical_intent", "")
             if intent:
                 try:
-                    intent_json = json.loads(intent)
+                    intent_json = _json_loads(intent)
                     parts.append("**📋 战术意图：**")
                     parts.append(f"- 任务理解：{intent_json.get('mission_understanding', 'N/A')}")
                     parts.append(f"- 态势评估：{intent_json.get('situation_assessment', 'N/A')}")
@@ -163,15 +223,21 @@ def _run_agent_task(task: str, max_iterations: int, skip_check: bool) -> str:
         return f"❌ **执行出错：** `{str(e)}`"
 
 
-def _export_chat(messages: list) -> str:
-    """导出对话为 Markdown 文本"""
+@st.cache_data(max_entries=16, show_spinner=False)
+def _export_chat(messages: tuple) -> str:
+    """导出对话为 Markdown 文本
+
+    入参为 (role, content) 元组，Streamlit 按内容哈希缓存，
+    对话未变化时重复导出直接命中。导出时间戳由调用方追加，
+    避免被冻结进缓存。长历史用 StringIO 流式写出，省去中间
+    列表及其逐元素对象开销。
+    """
     app_title = get_ui_text("app", "title", "AI Agent")
-    lines = [f"# {app_title} 对话记录\n"]
-    lines.append(f"导出时间: {time.strftime('%Y-%m-%d %H:%M:%S')}\n")
-    lines.append("---\n")
-    for msg in messages:
-        role = "🧑‍✈️ 指挥官" if msg["role"] == "user" else "🤖 Agent"
-        lines.append(f"### {role}\n")
-        lines.append(msg["content"])
-        lines.append("\n")
-    return "\n".join(lines)
+    buf = io.StringIO()
+    buf.write(f"# {app_title} 对话记录\n\n---\n")
+    for role, content in messages:
+        role_label = "🧑‍✈️ 指挥官" if role == "user" else "🤖 Agent"
+        buf.write(f"\n### {role_label}\n\n")
+        buf.write(content)
+        buf.write("\n\n")
+    return buf.getvalue()
@@ -4,8 +4,10 @@
 """
 import streamlit as st
 import json
+import os
 from pathlib import Path
-from collections import OrderedDict
+from collections import OrderedDict, defaultdict
+from functools import lru_cache
 import sys
 
 import config
@@ -42,6 +44,54 @@ def _knowledge_dir() -> Path:
     return (Path(project_root) / "rag" / "knowledge_base").resolve()
 
 
+@lru_cache(maxsize=1)
+def _get_rag():
+    """惰性加载 get_rag 并缓存绑定（rag 包连带 langchain/FAISS，点按钮时才导入）"""
+    from rag import get_rag
+    return get_rag
+
+
+@st.cache_data(show_spinner=False)
+def _cat_choices(cats_sig: tuple) -> tuple:
+    """新建文档分类下拉的 (keys, labels)（按分类签名缓存）"""
+    keys = [k for k, _, _ in cats_sig]
+    labels = [f"{icon} {label}" for _, icon, label in cats_sig]
+    return keys, labels
+
+
+@st.cache_data(show_spinner=False)
+def _list_kb_files(dir_str: str, dir_mtime_ns: int) -> list[tuple]:
+    """单次 scandir 列出知识库 md/json 文档（按目录 mtime 缓存）
+
+    返回 (路径, mtime_ns, 字节数) 列表，排序保持 md 在前 json 在后。
+    复用 scandir 自带的 stat 结果，目录走一遍就拿全列表 + 元信息，
+    后续渲染不再逐文件 stat；原先两次 glob 各自还要再遍历一轮目录。
+    新建/删除会改变目录 mtime，缓存键随之失效。
+    """
+    md, js = [], []
+    with os.scandir(dir_str) as it:
+        for e in it:
+            if not e.is_file():
+                continue
+            if e.name.endswith(".md"):
+                bucket = md
+            elif e.name.endswith(".json"):
+                bucket = js
+            else:
+                continue
+            info = e.stat()
+            bucket.append((e.path, info.st_mtime_ns, info.st_size))
+    md.sort()
+    js.sort()
+    return md + js
+
+
+@st.cache_data(show_spinner=False)
+def _read_text(path_str: str, mtime_ns: int) -> str:
+    """读取文档内容（按文件 mtime 缓存，保存后自动失效）"""
+    return Path(path_str).read_text(encoding="utf-8")
+
+
 def render():
     st.markdown(get_ui_text("knowledge", "page_title", "# 📚 知识库管理"))
     st.markdown(get_ui_text("knowledge", "page_desc", "管理 RAG 战术知识库文档。"))
@@ -57,8 +107,7 @@ def render():
         if st.button("🔄 重建向量库", use_container_width=True, type="primary"):
             with st.spinner("正在重建向量库..."):
                 try:
-                    from rag import get_rag
-                    rag = get_rag()
+                    rag = _get_rag()()
                     rag.rebuild()
                     st.success("✅ 向量库重建完成！")
                 except Exception as e:
@@ -80,8 +129,10 @@ def render():
                     cat_options[k] = v
             cat_options["general"] = _all_cats.get("general", {"label": "通用文档", "icon": "📄"})
 
-            cat_keys = list(cat_options.keys())
-            cat_labels_list = [f"{v.get('icon', '📄')} {v.get('label', k)}" for k, v in cat_options.items()]
+            cat_keys, cat_labels_list = _cat_choices(tuple(
+                (k, v.get("icon", "📄"), v.get("label", k))
+                for k, v in cat_options.items()
+            ))
 
             col_cat, col_fmt = st.columns([3, 1])
             with col_cat:
@@ -146,22 +197,26 @@ def render():
                     st.session_state.show_new_doc = False
                     st.rerun()
 
-    # ── 加载并分类文档 ──
-    md_files = sorted(KNOWLEDGE_DIR.glob("*.md"))
-    json_files = sorted(KNOWLEDGE_DIR.glob("*.json"))
-    all_files = md_files + json_files
+    # 删除后的反馈：在重跑后的这一轮用 toast 提示
+    # （原先 warning 紧跟 st.rerun，消息根本来不及显示）
+    _deleted = st.session_state.pop("_kb_deleted", None)
+    if _deleted:
+        st.toast(f"🗑️ 已删除 {_deleted}")
+
+    # ── 加载并分类文档（单次 scandir，列表按目录 mtime 缓存）──
+    all_files = [(Path(p), mtime_ns, size) for p, mtime_ns, size in _list_kb_files(
+        str(KNOWLEDGE_DIR), KNOWLEDGE_DIR.stat().st_mtime_ns,
+    )]
 
     if not all_files:
         st.info("知识库为空，点击上方【新建文档】添加知识。")
         return
 
-    # 按分类归组
-    categorized = OrderedDict()
-    for f in all_files:
-        cat = categorize_doc(f.name)
-        if cat not in categorized:
-            categorized[cat] = []
-        categorized[cat].append(f)
+    # 按分类归组（defaultdict 单遍归并；categorize_doc 已记忆化，
+    # 稳定知识库下整个循环只剩哈希查找）
+    categorized = defaultdict(list)
+    for entry in all_files:
+        categorized[categorize_doc(entry[0].name)].append(entry)
 
     # ── 统计卡片 ──
     stat_cols = st.columns(min(len(categorized), 6))
@@ -189,9 +244,20 @@ def render():
             unsafe_allow_html=True,
         )
 
-        for filepath in files:
+        for filepath, file_mtime_ns, file_size in files:
             with st.expander(f"{icon} {filepath.name}", expanded=False):
-                content = filepath.read_text(encoding="utf-8")
+                # 懒加载：未点开编辑前只展示 scandir 已有的元信息，
+                # 不读文件、不向浏览器下发整篇内容的编辑器控件；
+                # 每轮重跑的负载从 O(全库字节数) 降到 O(已打开文档)
+                open_key = f"open_{filepath.name}"
+                if not st.session_state.get(open_key):
+                    st.caption(f"分类: {label} · 大小: {file_size / 1024:.1f}KB")
+                    if st.button("✏️ 加载内容", key=f"load_{filepath.name}", use_container_width=True):
+                        st.session_state[open_key] = True
+                        st.rerun()
+                    continue
+
+                content = _read_text(str(filepath), file_mtime_ns)
 
                 edited = st.text_area(
                     f"编辑 {filepath.name}",
@@ -205,13 +271,20 @@ def render():
                 with col_s:
                     if st.button("💾 保存", key=f"save_{filepath.name}", use_container_width=True, type="primary"):
                         filepath.write_text(edited, encoding="utf-8")
+                        # 内容改动不影响目录 mtime，手动失效列表缓存
+                        # 以便下轮重跑拿到新的文件 mtime/大小
+                        _list_kb_files.clear()
                         st.success(f"✅ 已保存 {filepath.name}")
                 with col_d:
                     if st.button("🗑️ 删除", key=f"del_{filepath.name}", use_container_width=True):
                         filepath.unlink()
-                        st.warning(f"已删除 {filepath.name}")
+                        st.session_state.pop(f"open_{filepath.name}", None)
+                        # 删除改变目录 mtime，列表缓存自动失效；
+                        # 懒加载 + mtime 缓存让这次重跑只重扫目录，
+                        # 不再重读剩余文档
+                        st.session_state["_kb_deleted"] = filepath.name
                         st.rerun()
                 with col_info:
-                    size_kb = filepath.stat().st_size / 1024
+                    size_kb = file_size / 1024
                     lines = content.count("\n") + 1
                     st.caption(f"分类: {label} · 大小: {size_kb:.1f}KB · {lines} 行")
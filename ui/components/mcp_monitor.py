@@ -6,11 +6,22 @@ import streamlit as st
 import json
 import time
 import sys
+from functools import lru_cache
 from pathlib import Path
 
 import config
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+try:
+    # orjson 解析快数倍；其 JSONDecodeError 兼容标准库的 except 子句
+    import orjson
+
+    def _json_loads(s):
+        return orjson.loads(s)
+except ImportError:
+    _json_loads = json.loads
+
 from styles import (
     _api_endpoints, _colors,
     get_tool_cn_name, get_tool_cn_desc,
@@ -18,6 +29,78 @@ from styles import (
 )
 
 
+@st.cache_resource(show_spinner=False)
+def _mcp_tools() -> tuple:
+    """MCP 工具列表句柄（进程内导入并取属性一次，跨重跑复用）"""
+    from mcp.tools import ALL_TOOLS, QUERY_TOOLS, CONTROL_TOOLS
+    return ALL_TOOLS, QUERY_TOOLS, CONTROL_TOOLS
+
+
+@st.cache_resource(show_spinner=False)
+def _http_client(timeout: float):
+    """进程内共享的 httpx 客户端（keep-alive 连接池）
+
+    每次请求临时新建 Client 都要重做 TCP 握手；按超时档各留
+    一个实例，跨重跑复用已建立的连接。
+    """
+    import httpx
+    return httpx.Client(
+        timeout=timeout,
+        limits=httpx.Limits(max_keepalive_connections=8),
+    )
+
+
+@st.cache_data(ttl=5.0, show_spinner=False)
+def _probe_health(base_url: str) -> tuple:
+    """探测引擎健康端点，返回 (connected, latency_ms)
+
+    5 秒 TTL：窗口内的控件交互复用探测结果，不再每次重跑都
+    同步阻塞一个最长 3 秒的网络请求。
+    """
+    try:
+        start = time.time()
+        resp = _http_client(3.0).get(f"{base_url}/api/health")
+        return resp.status_code == 200, (time.time() - start) * 1000
+    except Exception:
+        return False, 0.0
+
+
+@st.cache_data(show_spinner=False)
+def _endpoints_html(eps_sig: tuple, ok_color: str, warn_color: str, muted: str) -> str:
+    """端点列表 HTML：整块生成并缓存，由调用方一次 st.markdown 输出
+
+    逐端点 st.markdown 每条都要走一轮服务端到浏览器的增量消息；
+    合并成单个元素后 N 条端点只付一次序列化开销。
+    """
+    rows = []
+    for method, path, name_cn, desc_cn in eps_sig:
+        method_color = ok_color if method == "GET" else warn_color
+        rows.append(
+            f'<div style="margin:2px 0">'
+            f'<span style="display:inline-block;min-width:48px;color:{method_color};'
+            f'font-weight:bold;font-family:monospace">{method}</span> '
+            f'<code>{path}</code> — <b>{name_cn}</b> · '
+            f'<span style="color:{muted}">{desc_cn}</span></div>'
+        )
+    return "\n".join(rows)
+
+
+@st.cache_data(show_spinner=False)
+def _tool_display_labels(tool_names: tuple) -> list:
+    """工具下拉框的显示标签「中文名 (name)」，按名称元组缓存"""
+    return [f"{get_tool_cn_name(n)} ({n})" for n in tool_names]
+
+
+@lru_cache(maxsize=256)
+def _schema_for(schema_cls) -> dict:
+    """按 args_schema 类缓存 model_json_schema() 结果
+
+    pydantic 的 schema 生成要遍历整个模型，而结果在进程内不变；
+    每个工具只在首次展开时真正生成一次。
+    """
+    return schema_cls.model_json_schema()
+
+
 def render():
     st.markdown(get_ui_text("mcp_monitor", "page_title", "# 🔗 MCP 服务监控"))
     st.markdown(get_ui_text("mcp_monitor", "page_desc", "查看和测试 MCP 工具接口。"))
@@ -43,17 +126,7 @@ def render():
         </div>
         """, unsafe_allow_html=True)
     with col3:
-        connected = False
-        latency = 0
-        try:
-            import httpx
-            start = time.time()
-            with httpx.Client(timeout=3.0) as client:
-                resp = client.get(f"{base_url}/api/health")
-                latency = (time.time() - start) * 1000
-                connected = resp.status_code == 200
-        except Exception:
-            pass
+        connected, latency = _probe_health(base_url)
 
         _clr = _colors()
         color = _clr.get("success", "#3fb950") if connected else _clr.get("error", "#f85149")
@@ -77,27 +150,27 @@ def render():
     with tab_tools:
         st.markdown("### 已注册的 MCP 工具")
 
-        from mcp.tools import ALL_TOOLS, QUERY_TOOLS, CONTROL_TOOLS
+        _, query_tools, control_tools = _mcp_tools()
 
         col_q, col_c = st.columns(2)
 
         with col_q:
-            st.markdown(f"#### 🔍 查询工具 ({len(QUERY_TOOLS)} 个)")
-            for tool_obj in QUERY_TOOLS:
+            st.markdown(f"#### 🔍 查询工具 ({len(query_tools)} 个)")
+            for tool_obj in query_tools:
                 _render_tool_card(tool_obj, "🔍")
 
         with col_c:
-            st.markdown(f"#### ⚡ 控制工具 ({len(CONTROL_TOOLS)} 个)")
-            for tool_obj in CONTROL_TOOLS:
+            st.markdown(f"#### ⚡ 控制工具 ({len(control_tools)} 个)")
+            for tool_obj in control_tools:
                 _render_tool_card(tool_obj, "⚡")
 
     # ━━━━ 接口测试 ━━━━
     with tab_test:
         st.markdown("### 手动测试 MCP 工具")
 
-        from mcp.tools import ALL_TOOLS as _ALL
+        _ALL, _, _ = _mcp_tools()
 
-        tool_display = [f"{get_tool_cn_name(t.name)} ({t.name})" for t in _ALL]
+        tool_display = _tool_display_labels(tuple(t.name for t in _ALL))
         selected_idx = st.selectbox(
             "选择工具", range(len(_ALL)),
             format_func=lambda i: tool_display[i],
@@ -110,7 +183,7 @@ def render():
 
         params = {}
         if hasattr(selected, "args_schema") and selected.args_schema:
-            schema = selected.args_schema.model_json_schema()
+            schema = _schema_for(selected.args_schema)
             props = schema.get("properties", {})
             required = schema.get("required", [])
 
@@ -179,78 +252,86 @@ def render():
         _clr2 = _colors()
         st.markdown(f"#### 全部端点 ({len(_endpoints)} 个)")
 
-        for ep in _endpoints:
-            method = ep.get("method", "GET")
-            path = ep.get("path", "")
-            name_cn = ep.get("name", "")
-            desc_cn = ep.get("desc", "")
-            method_color = _clr2.get("success", "#3fb950") if method == "GET" else _clr2.get("warning", "#d29922")
-            st.markdown(
-                f'<span style="display:inline-block;min-width:48px;color:{method_color};'
-                f'font-weight:bold;font-family:monospace">{method}</span> '
-                f'<code>{path}</code> — **{name_cn}** · '
-                f'<span style="color:{_clr2.get("text_muted", "#8b949e")}">{desc_cn}</span>',
-                unsafe_allow_html=True,
-            )
+        eps_sig = tuple(
+            (ep.get("method", "GET"), ep.get("path", ""), ep.get("name", ""), ep.get("desc", ""))
+            for ep in _endpoints
+        )
+        st.markdown(
+            _endpoints_html(
+                eps_sig,
+                _clr2.get("success", "#3fb950"),
+                _clr2.get("warning", "#d29922"),
+                _clr2.get("text_muted", "#8b949e"),
+            ),
+            unsafe_allow_html=True,
+        )
+
+
+@lru_cache(maxsize=256)
+def _tool_card_md(schema_cls, desc: str) -> str:
+    """工具卡片正文 Markdown（按 schema 类缓存）
+
+    功能说明 + 参数列表在进程内不变；整卡拼成一个字符串后
+    只需一次 st.markdown，不再逐参数产生元素。
+    """
+    lines = [f"**功能：** {desc}"]
+    if schema_cls is not None:
+        schema = _schema_for(schema_cls)
+        props = schema.get("properties", {})
+        required = schema.get("required", [])
+        if props:
+            lines.append("\n**参数：**")
+            for pname, pinfo in props.items():
+                ptype = pinfo.get("type", "any")
+                pdesc = pinfo.get("description", "")
+                req_mark = " *必填*" if pname in required else ""
+                default_str = ""
+                if "default" in pinfo:
+                    default_str = f"，默认: `{pinfo['default']}`"
+                lines.append(f"- `{pname}` ({ptype}{req_mark}): {pdesc}{default_str}")
+        else:
+            lines.append("\n*无参数*")
+    return "\n".join(lines)
 
 
 def _render_tool_card(tool_obj, icon: str):
-    """渲染单个工具卡片"""
+    """渲染单个工具卡片（正文整卡缓存，一次输出）"""
     cn_name = get_tool_cn_name(tool_obj.name)
-    cn_desc = get_tool_cn_desc(tool_obj.name)
+    cn_desc = get_tool_cn_desc(tool_obj.name) or tool_obj.description
+    schema_cls = getattr(tool_obj, "args_schema", None)
 
     with st.expander(f"{icon} {cn_name}  `{tool_obj.name}`"):
-        if cn_desc:
-            st.markdown(f"**功能：** {cn_desc}")
-        else:
-            st.markdown(f"**功能：** {tool_obj.description}")
-
-        if hasattr(tool_obj, "args_schema") and tool_obj.args_schema:
-            schema = tool_obj.args_schema.model_json_schema()
-            props = schema.get("properties", {})
-            required = schema.get("required", [])
-            if props:
-                st.markdown("**参数：**")
-                for pname, pinfo in props.items():
-                    ptype = pinfo.get("type", "any")
-                    desc = pinfo.get("description", "")
-                    req_mark = " *必填*" if pname in required else ""
-                    default_str = ""
-                    if "default" in pinfo:
-                        default_str = f"，默认: `{pinfo['default']}`"
-                    st.markdown(f"- `{pname}` ({ptype}{req_mark}): {desc}{default_str}")
-            else:
-                st.caption("无参数")
+        st.markdown(_tool_card_md(schema_cls, cn_desc))
 
 
 def _send_raw_request(url: str, method: str, body: str = ""):
-    """发送原始 HTTP 请求"""
+    """发送原始 HTTP 请求（复用共享连接池）"""
     import httpx
     try:
-        with httpx.Client(timeout=10.0) as client:
-            start = time.time()
-            if method == "GET":
-                resp = client.get(url)
-            else:
-                try:
-                    json_body = json.loads(body) if body.strip() else {}
-                except json.JSONDecodeError:
-                    st.error("Body JSON 格式错误")
-                    return
-                resp = client.post(url, json=json_body)
-
-            elapsed = (time.time() - start) * 1000
-            _c = _colors()
-            status_color = _c.get("success", "#3fb950") if resp.status_code == 200 else _c.get("error", "#f85149")
-            st.markdown(
-                f'状态: <span style="color:{status_color};font-weight:bold">{resp.status_code}</span> · '
-                f'耗时: {elapsed:.0f}ms',
-                unsafe_allow_html=True,
-            )
+        client = _http_client(10.0)
+        start = time.time()
+        if method == "GET":
+            resp = client.get(url)
+        else:
             try:
-                st.json(resp.json())
-            except Exception:
-                st.code(resp.text[:2000])
+                json_body = _json_loads(body) if body.strip() else {}
+            except json.JSONDecodeError:
+                st.error("Body JSON 格式错误")
+                return
+            resp = client.post(url, json=json_body)
+
+        elapsed = (time.time() - start) * 1000
+        _c = _colors()
+        status_color = _c.get("success", "#3fb950") if resp.status_code == 200 else _c.get("error", "#f85149")
+        st.markdown(
+            f'状态: <span style="color:{status_color};font-weight:bold">{resp.status_code}</span> · '
+            f'耗时: {elapsed:.0f}ms',
+            unsafe_allow_html=True,
+        )
+        try:
+            st.json(resp.json())
+        except Exception:
+            st.code(resp.text[:2000])
     except httpx.ConnectError:
         st.error(f"❌ 无法连接: {url}")
     except Exception as e:
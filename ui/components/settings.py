@@ -3,32 +3,39 @@
 环境变量元信息、选项列表均从外部 JSON 配置加载
 """
 import streamlit as st
+import re
+from functools import lru_cache
 from pathlib import Path
-from collections import OrderedDict
 import sys
 import importlib
 
 import config
 
-sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
-from styles import _env_meta, get_ui_text, get_ui_param
+# 幂等插入：importlib.reload 等场景重复执行模块体时
+# 不再重复 resolve() 路径、也不往 sys.path 里塞重复项
+_UI_DIR = str(Path(__file__).resolve().parent.parent)
+if _UI_DIR not in sys.path:
+    sys.path.insert(0, _UI_DIR)
+from styles import get_live_snapshot, get_ui_text, get_ui_param
+from styles import reload_config as _reload_ui_caches
 
 
 ENV_FILE = Path(config.PROJECT_ROOT) / ".env"
 ENV_EXAMPLE = Path(config.PROJECT_ROOT) / ".env.example"
 
+# KEY=value 行（多行模式整篇一次扫完）；键名限定以字母/下划线开头，
+# 注释行和空行天然匹配不上，不必逐行 strip/startswith 判断。
+# 空白只允许横向的 [ \t]，防止空值行的 \s* 吞掉换行、串到下一行
+_ENV_RE = re.compile(r"^[ \t]*([A-Za-z_][A-Za-z0-9_]*)[ \t]*=[ \t]*(.*?)[ \t]*$", re.M)
+
 
 def render():
     st.markdown(get_ui_text("settings", "page_title", "# ⚙️ 系统配置"))
     st.markdown(get_ui_text("settings", "page_desc", "管理 Agent 的所有配置参数。"))
 
-    # ── 保存成功提示（跨 rerun 持久） ──
-    if st.session_state.get("_config_saved"):
-        st.success("✅ 配置已保存并立即生效！")
-        del st.session_state["_config_saved"]
-    if st.session_state.get("_config_reset"):
-        st.success("✅ 已重置为默认配置并立即生效！")
-        del st.session_state["_config_reset"]
+    # 重置后的反馈：在重跑后的这一轮用 toast 提示
+    if st.session_state.pop("_config_reset", False):
+        st.toast("✅ 已重置为默认配置并立即生效！", icon="✅")
 
     # ── 加载当前 .env ──
     env_data = _load_env()
@@ -40,14 +47,11 @@ def render():
     ])
     tabs = st.tabs(tab_labels)
 
-    # ── 按 env_meta.json 中的分组自动渲染各标签页（热加载） ──
-    _meta = _env_meta()
-    groups = OrderedDict()
-    for var_info in _meta:
-        group = var_info.get("group", "其他")
-        if group not in groups:
-            groups[group] = []
-        groups[group].append(var_info)
+    # ── 按 env_meta.json 中的分组自动渲染各标签页（热加载）──
+    # 入口取一次配置快照：整轮渲染读同一版本，不再逐项查访问函数
+    snap = get_live_snapshot()
+    _meta = snap.env_meta
+    groups = snap.env_groups
 
     # 分组映射到标签页索引（前 N-1 个标签给分组，最后一个给原始 .env）
     group_keys = list(groups.keys())
@@ -60,16 +64,34 @@ def render():
         with tabs[i]:
             st.markdown(f"### {group_name} 配置")
             vars_in_group = groups[group_name]
-            _render_group_form(env_data, vars_in_group)
+            # 表单把组内控件的改动留在浏览器侧，只在点「保存本组」时
+            # 提交并重跑一次；否则每个控件的每次变更都会整页重跑
+            with st.form(f"cfg_group_{i}"):
+                _render_group_form(env_data, vars_in_group)
+                submitted = st.form_submit_button(
+                    "💾 保存本组", use_container_width=True, type="primary",
+                )
+            if submitted:
+                _save_env(env_data)
+                _reload_config()
+                st.success(f"✅ {group_name} 配置已保存并立即生效！")
+
+            # st.button 不允许出现在表单内，连接测试放在表单之后
+            if any(m.key == "SIM_ENGINE_HOST" for m in vars_in_group):
+                if st.button("🔌 测试连接", type="primary", key="test_conn"):
+                    _test_connection(
+                        env_data.get("SIM_ENGINE_HOST", "localhost"),
+                        env_data.get("SIM_ENGINE_PORT", "8080"),
+                    )
 
     # ━━━━ 原始 .env 标签页（只读预览 + 自定义变量管理）━━━━
     with tabs[tab_count - 1]:
         st.markdown("### 原始 .env 文件预览")
         st.caption("此处显示当前 .env 文件内容。请在左侧分组标签页中编辑配置项。")
 
-        # 只读预览当前 .env 文件
+        # 只读预览当前 .env 文件（按 mtime 缓存，没改不重读）
         if ENV_FILE.exists():
-            raw_content = ENV_FILE.read_text(encoding="utf-8")
+            raw_content = _read_env_cached(str(ENV_FILE), _mt(ENV_FILE))
         else:
             raw_content = "# .env 文件尚未创建"
         st.code(raw_content, language="bash")
@@ -79,7 +101,7 @@ def render():
         st.markdown("#### ➕ 自定义配置项")
         st.caption("如果需要添加上面分组中未列出的环境变量，可以在此添加。")
 
-        known_keys = {v.get("key") for v in _meta}
+        known_keys = {m.key for m in _meta}
         extra_keys = [k for k in env_data if k not in known_keys]
         for ek in extra_keys:
             env_data[ek] = st.text_input(
@@ -104,123 +126,135 @@ def render():
         if st.button("💾 保存所有配置", use_container_width=True, type="primary"):
             _save_env(env_data)
             _reload_config()
-            st.session_state["_config_saved"] = True
-            st.rerun()
+            # toast 直接提示即可：保存不改变页面结构，省掉原先
+            # 只为显示成功横幅而做的整页重跑（重读 env/全部 JSON）
+            st.toast("✅ 配置已保存并立即生效！", icon="✅")
     with col_reset:
         if st.button("↩️ 重置为默认", use_container_width=True):
             if ENV_EXAMPLE.exists():
                 env_data = _parse_env_text(ENV_EXAMPLE.read_text(encoding="utf-8"))
                 _save_env(env_data)
                 _reload_config()
+                # 重置改变了控件取值，需要整页重跑；清掉旧控件状态
+                # 让各输入框回到默认值，提示留到下一轮 toast
+                for k in [k for k in st.session_state if k.startswith("cfg_")]:
+                    del st.session_state[k]
                 st.session_state["_config_reset"] = True
                 st.rerun()
 
 
 def _render_group_form(env_data: dict, vars_list: list):
-    """根据 env_meta.json 中的类型定义动态渲染表单控件"""
-    for var_info in vars_list:
-        key = var_info.get("key", "")
-        label = var_info.get("label", key)
-        desc = var_info.get("desc", "")
-        var_type = var_info.get("type", "text")
-        default = var_info.get("default", "")
-        options = var_info.get("options", [])
-
-        current_val = env_data.get(key, default)
-
-        if var_type == "password":
+    """根据 env_meta.json 中的类型定义动态渲染表单控件
+
+    入参为 EnvVarMeta 冻结记录：逐变量的近十次 dict.get
+    换成 slots 属性访问，缺省值在转换时已补齐。
+    """
+    for meta in vars_list:
+        key = meta.key
+        current_val = env_data.get(key, meta.default)
+
+        if meta.type == "password":
             env_data[key] = st.text_input(
-                label, value=str(current_val), type="password",
-                help=desc, key=f"cfg_{key}",
+                meta.label, value=str(current_val), type="password",
+                help=meta.desc, key=f"cfg_{key}",
             )
 
-        elif var_type == "select" and options:
-            try:
-                idx = options.index(str(current_val)) if str(current_val) in options else 0
-            except ValueError:
-                idx = 0
+        elif meta.type == "select" and meta.options:
+            options = list(meta.options)
+            idx = options.index(str(current_val)) if str(current_val) in options else 0
             env_data[key] = st.selectbox(
-                label, options, index=idx,
-                help=desc, key=f"cfg_{key}",
+                meta.label, options, index=idx,
+                help=meta.desc, key=f"cfg_{key}",
             )
 
-        elif var_type == "slider":
-            min_val = float(var_info.get("min", 0))
-            max_val = float(var_info.get("max", 1))
-            step_val = float(var_info.get("step", 0.05))
+        elif meta.type == "slider":
+            min_val = float(meta.min) if meta.min is not None else 0.0
+            max_val = float(meta.max) if meta.max is not None else 1.0
+            step_val = float(meta.step) if meta.step is not None else 0.05
             try:
                 cur_float = float(current_val)
             except (ValueError, TypeError):
-                cur_float = float(default) if default else min_val
+                cur_float = float(meta.default) if meta.default else min_val
             env_data[key] = str(st.slider(
-                label, min_value=min_val, max_value=max_val,
+                meta.label, min_value=min_val, max_value=max_val,
                 value=cur_float, step=step_val,
-                help=desc, key=f"cfg_{key}",
+                help=meta.desc, key=f"cfg_{key}",
             ))
 
-        elif var_type == "number":
-            min_val = var_info.get("min", 0)
-            max_val = var_info.get("max", 9999)
-            step_val = var_info.get("step", 1)
+        elif meta.type == "number":
+            min_val = meta.min if meta.min is not None else 0
+            max_val = meta.max if meta.max is not None else 9999
+            step_val = meta.step if meta.step is not None else 1
             try:
                 cur_num = float(current_val)
             except (ValueError, TypeError):
-                cur_num = float(default) if default else float(min_val)
+                cur_num = float(meta.default) if meta.default else float(min_val)
             # 判断整数/浮点
             if isinstance(min_val, int) and isinstance(step_val, int):
                 env_data[key] = str(st.number_input(
-                    label, min_value=int(min_val), max_value=int(max_val),
+                    meta.label, min_value=int(min_val), max_value=int(max_val),
                     value=int(cur_num), step=int(step_val),
-                    help=desc, key=f"cfg_{key}",
+                    help=meta.desc, key=f"cfg_{key}",
                 ))
             else:
                 env_data[key] = str(st.number_input(
-                    label, min_value=float(min_val), max_value=float(max_val),
+                    meta.label, min_value=float(min_val), max_value=float(max_val),
                     value=float(cur_num), step=float(step_val),
-                    help=desc, key=f"cfg_{key}",
+                    help=meta.desc, key=f"cfg_{key}",
                 ))
 
         else:
             # 默认文本输入
-            placeholder = var_info.get("placeholder", "")
             env_data[key] = st.text_input(
-                label, value=str(current_val),
-                help=desc, key=f"cfg_{key}",
-                placeholder=placeholder,
+                meta.label, value=str(current_val),
+                help=meta.desc, key=f"cfg_{key}",
+                placeholder=meta.placeholder,
             )
 
-    # 连接测试按钮（如果当前组包含引擎 host/port）
-    keys_in_group = {v.get("key") for v in vars_list}
-    if "SIM_ENGINE_HOST" in keys_in_group:
-        st.markdown("---")
-        if st.button("🔌 测试连接", type="primary", key="test_conn"):
-            _test_connection(
-                env_data.get("SIM_ENGINE_HOST", "localhost"),
-                env_data.get("SIM_ENGINE_PORT", "8080"),
-            )
+
+def _mt(path: Path) -> float:
+    """文件 mtime（不存在时为 0.0），用作缓存键"""
+    try:
+        return path.stat().st_mtime
+    except OSError:
+        return 0.0
 
 
 def _load_env() -> dict:
-    """加载 .env 文件为 dict"""
-    data = OrderedDict()
-    if ENV_EXAMPLE.exists():
-        data.update(_parse_env_text(ENV_EXAMPLE.read_text(encoding="utf-8")))
-    if ENV_FILE.exists():
-        data.update(_parse_env_text(ENV_FILE.read_text(encoding="utf-8")))
+    """加载 .env 文件为 dict（示例文件打底，实际文件覆盖）
+
+    结果存在 session_state 里、按两个文件的 mtime 作键：同一会话
+    内文件没改就不再读盘重建；同一个 dict 跨重跑复用，未保存的
+    控件改动也得以保留在其中。
+    """
+    mtime_key = (_mt(ENV_FILE), _mt(ENV_EXAMPLE))
+    if st.session_state.get("_env_key") == mtime_key:
+        return st.session_state["_env_data"]
+
+    data = {}
+    for path in (ENV_EXAMPLE, ENV_FILE):
+        if path.exists():
+            data.update(_parse_env_file(str(path), path.stat().st_mtime))
+    st.session_state["_env_key"] = mtime_key
+    st.session_state["_env_data"] = data
     return data
 
 
-def _parse_env_text(text: str) -> OrderedDict:
-    """解析 .env 格式文本"""
-    data = OrderedDict()
-    for line in text.splitlines():
-        line = line.strip()
-        if not line or line.startswith("#"):
-            continue
-        if "=" in line:
-            key, _, value = line.partition("=")
-            data[key.strip()] = value.strip()
-    return data
+@lru_cache(maxsize=2)
+def _read_env_cached(path_str: str, mtime: float) -> str:
+    """.env 原文预览（按 mtime 缓存，文件没改就不再读盘）"""
+    return Path(path_str).read_text(encoding="utf-8")
+
+
+@lru_cache(maxsize=4)
+def _parse_env_file(path_str: str, mtime: float) -> dict:
+    """读取并解析 .env 格式文件（按 mtime 缓存，文件没改就不再读盘）"""
+    return _parse_env_text(Path(path_str).read_text(encoding="utf-8"))
+
+
+def _parse_env_text(text: str) -> dict:
+    """解析 .env 格式文本（单次正则扫描代替逐行 strip/partition）"""
+    return {m.group(1): m.group(2) for m in _ENV_RE.finditer(text)}
 
 
 def _env_to_text(data: dict) -> str:
@@ -233,48 +267,66 @@ def _env_to_text(data: dict) -> str:
         "LOG_DIR", "REPLAY_DIR",
     }
 
-    lines = ["# AI Agent 配置文件 (由 UI 生成)", ""]
-    for key, value in data.items():
-        val = str(value).strip()
-        if key in _path_keys and not val:
-            # 路径型变量为空 → 注释掉，使用默认路径
-            lines.append(f"# {key}=")
-        else:
-            lines.append(f"{key}={val}")
-    return "\n".join(lines)
+    # 单个列表推导式一次成形，省去逐行 append 的解释器开销；
+    # 路径型变量为空 → 注释掉，使用默认路径
+    body = [
+        f"# {key}=" if (key in _path_keys and not str(value).strip())
+        else f"{key}={str(value).strip()}"
+        for key, value in data.items()
+    ]
+    return "\n".join(["# AI Agent 配置文件 (由 UI 生成)", ""] + body)
 
 
 def _save_env(data: dict):
     """保存 dict 到 .env 文件"""
     content = _env_to_text(data)
     ENV_FILE.write_text(content, encoding="utf-8")
+    # 写盘改变了 mtime，刷新缓存键让下一轮重跑直接命中，
+    # 不必为自己刚写的内容再读一次盘
+    st.session_state["_env_key"] = (_mt(ENV_FILE), _mt(ENV_EXAMPLE))
+    st.session_state["_env_data"] = data
 
 
 def _reload_config():
     """热加载配置：保存 .env 后调用，立即刷新内存中的配置
-    使用 importlib.reload 强制重新执行 config 模块，
-    确保即使旧模块缓存中没有 reload() 函数也能正常工作
+
+    优先走 config.reload()：原地刷新各配置实例，其他模块持有的
+    引用保持有效。importlib.reload 会重新执行整个 config 模块
+    （重新 import loguru/dotenv 等），且旧引用可能指向废弃对象，
+    只在旧版 config 没有 reload() 时兜底使用。
     """
     global config
-    config = importlib.reload(config)
-    # 如果新版 config 有 reload()，额外调用一次确保实例刷新
     if hasattr(config, "reload"):
         config.reload()
+    else:
+        config = importlib.reload(config)
+    # UI 侧缓存（ui_config 解析缓存、记忆化查找）一并失效
+    _reload_ui_caches()
+
+
+@st.cache_resource(show_spinner=False)
+def _http_client():
+    """进程内共享的 httpx 客户端（keep-alive 连接池）
+
+    每次点「测试连接」都新建 Client 要重做 TCP 握手；
+    复用同一实例后，重复测试直接走已建立的连接。
+    """
+    import httpx
+    return httpx.Client(timeout=5.0)
 
 
 def _test_connection(host: str, port: str):
-    """测试引擎连接"""
+    """测试引擎连接（复用共享连接池）"""
     import httpx
     url = f"http://{host}:{port}/api/health"
     try:
-        with httpx.Client(timeout=5.0) as client:
-            resp = client.get(url)
-            if resp.status_code == 200:
-                data = resp.json()
-                st.success(f"✅ 连接成功！引擎状态: {data.get('status', 'ok')}")
-                st.json(data)
-            else:
-                st.warning(f"⚠️ 引擎返回状态码: {resp.status_code}")
+        resp = _http_client().get(url)
+        if resp.status_code == 200:
+            data = resp.json()
+            st.success(f"✅ 连接成功！引擎状态: {data.get('status', 'ok')}")
+            st.json(data)
+        else:
+            st.warning(f"⚠️ 引擎返回状态码: {resp.status_code}")
     except httpx.ConnectError:
         st.error(f"❌ 无法连接到 {url}")
     except Exception as e:
@@ -14,6 +14,11 @@
   ui_config/doc_templates/      - 各分类文档模板
 """
 import json
+import os
+import string
+import time
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 
 # ============================================================================
@@ -22,6 +27,13 @@ from pathlib import Path
 _CONFIG_DIR = Path(__file__).resolve().parent / "ui_config"
 _TEMPLATE_DIR = _CONFIG_DIR / "doc_templates"
 
+try:
+    # pyahocorasick 可选依赖：文档归类的关键词匹配用自动机一次线性
+    # 扫完文件名，代价与关键词数量无关；未安装时退回双层循环
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 
 # ============================================================================
 # 热加载配置管理器
@@ -33,24 +45,46 @@ class _ConfigManager:
     访问配置时检测文件是否变化，变化则自动重新加载。
     """
 
+    # mtime 检测节流窗口（秒）：窗口内的重复访问直接复用缓存；
+    # 一次 Streamlit 重跑会触发数十次访问，节流后整个目录只扫一遍
+    _STAT_INTERVAL = 1.0
+
     def __init__(self, config_dir: Path):
         self._dir = config_dir
-        self._cache: dict[str, dict] = {}      # filename -> parsed data
-        self._mtimes: dict[str, float] = {}     # filename -> last mtime
+        self._cache: dict[str, dict] = {}       # filename -> parsed data
+        self._mtimes: dict[str, float] = {}      # filename -> 已解析内容的 mtime
+        self._disk_mtimes: dict[str, float] = {}  # 目录快照: filename -> 磁盘 mtime
+        self._last_scan = 0.0                    # 上次目录扫描时刻 (monotonic)
+
+    def _scan(self, now: float):
+        """单次 scandir 刷新整个目录的 mtime 快照
+
+        逐文件 stat 每个配置一次系统调用；scandir 一次目录读取
+        就带回全部文件的 stat 结果，7 个配置共用一次调用。
+        """
+        try:
+            with os.scandir(self._dir) as it:
+                self._disk_mtimes = {
+                    e.name: e.stat().st_mtime for e in it if e.is_file()
+                }
+        except FileNotFoundError:
+            self._disk_mtimes = {}
+        self._last_scan = now
 
     def get(self, filename: str) -> dict:
         """获取指定配置文件内容，自动检测变化并热加载"""
-        filepath = self._dir / filename
-        if not filepath.exists():
-            return {}
+        now = time.monotonic()
+        if now - self._last_scan >= self._STAT_INTERVAL:
+            self._scan(now)
 
-        current_mtime = filepath.stat().st_mtime
-        cached_mtime = self._mtimes.get(filename, 0)
+        current_mtime = self._disk_mtimes.get(filename)
+        if current_mtime is None:
+            return {}
 
-        if filename not in self._cache or current_mtime != cached_mtime:
+        if filename not in self._cache or current_mtime != self._mtimes.get(filename):
             # 文件新增或已修改 -> 重新加载
             self._cache[filename] = json.loads(
-                filepath.read_text(encoding="utf-8")
+                (self._dir / filename).read_text(encoding="utf-8")
             )
             self._mtimes[filename] = current_mtime
 
@@ -60,6 +94,8 @@ class _ConfigManager:
         """强制重新加载所有已缓存的配置"""
         self._cache.clear()
         self._mtimes.clear()
+        self._disk_mtimes.clear()
+        self._last_scan = 0.0
 
 
 # 全局配置管理器实例
@@ -70,23 +106,30 @@ _cfg = _ConfigManager(_CONFIG_DIR)
 # 便捷访问函数（每次调用时自动检测文件变化）
 # ============================================================================
 
+# 缺省值提升为模块常量：访问函数每轮重跑被调用数十次，
+# 不必每次调用都重新构造一遍大字典字面量
+_DEFAULT_COLORS = {
+    "primary": "#58a6ff", "primary_hover": "rgba(88,166,255,0.15)",
+    "primary_active": "rgba(88,166,255,0.25)", "bg_dark": "#0e1117",
+    "bg_card": "#161b22", "bg_card_alt": "#1c2333", "border": "#30363d",
+    "text_primary": "#f0f6fc", "text_secondary": "#c9d1d9", "text_muted": "#8b949e",
+    "success": "#3fb950", "warning": "#d29922", "error": "#f85149",
+    "chat_user_bg": "linear-gradient(135deg, #1f6feb, #388bfd)", "chat_ai_bg": "#161b22",
+}
+
+_DEFAULT_CATS = {
+    "general": {"label": "通用文档", "icon": "📄", "prefix": "通用文档", "keywords": [], "template": "general.md"}
+}
+
+
 def _colors() -> dict:
     data = _cfg.get("theme.json")
-    return data.get("colors", {
-        "primary": "#58a6ff", "primary_hover": "rgba(88,166,255,0.15)",
-        "primary_active": "rgba(88,166,255,0.25)", "bg_dark": "#0e1117",
-        "bg_card": "#161b22", "bg_card_alt": "#1c2333", "border": "#30363d",
-        "text_primary": "#f0f6fc", "text_secondary": "#c9d1d9", "text_muted": "#8b949e",
-        "success": "#3fb950", "warning": "#d29922", "error": "#f85149",
-        "chat_user_bg": "linear-gradient(135deg, #1f6feb, #388bfd)", "chat_ai_bg": "#161b22",
-    })
+    return data.get("colors", _DEFAULT_COLORS)
 
 
 def _doc_categories() -> dict:
     data = _cfg.get("doc_categories.json")
-    return data.get("categories", {
-        "general": {"label": "通用文档", "icon": "📄", "prefix": "通用文档", "keywords": [], "template": "general.md"}
-    })
+    return data.get("categories", _DEFAULT_CATS)
 
 
 def _tool_cn_names() -> dict:
@@ -113,6 +156,112 @@ def _ui_text() -> dict:
     return _cfg.get("ui_text.json")
 
 
+@dataclass(frozen=True, slots=True)
+class EnvVarMeta:
+    """env_meta.json 单个变量的不可变记录
+
+    设置页每轮重跑对每个变量要做近十次 dict.get（每次还要分配
+    缺省值），冻结成 slots 数据类后变成 C 层属性访问，
+    且整表按 mtime 只转换一次。min/max/step 保留原始 int/float
+    类型，供控件区分整数/浮点输入。
+    """
+    key: str
+    label: str
+    desc: str
+    type: str
+    default: str
+    options: tuple
+    group: str
+    min: float | int | None
+    max: float | int | None
+    step: float | int | None
+    placeholder: str
+
+
+@lru_cache(maxsize=4)
+def _env_meta_frozen_impl(_mtime: float) -> tuple:
+    return tuple(
+        EnvVarMeta(
+            key=d.get("key", ""),
+            label=d.get("label") or d.get("key", ""),
+            desc=d.get("desc", ""),
+            type=d.get("type", "text"),
+            default=d.get("default", ""),
+            options=tuple(d.get("options", ())),
+            group=d.get("group", "其他"),
+            min=d.get("min"),
+            max=d.get("max"),
+            step=d.get("step"),
+            placeholder=d.get("placeholder", ""),
+        )
+        for d in _env_meta()
+    )
+
+
+def _env_meta_frozen() -> tuple:
+    """获取冻结的环境变量元信息（记忆化，env_meta.json 修改后自动失效）"""
+    _env_meta()  # 触发热加载检测，保证 mtime 键最新
+    return _env_meta_frozen_impl(_cfg._mtimes.get("env_meta.json", 0.0))
+
+
+@lru_cache(maxsize=4)
+def _env_meta_grouped_impl(_mtime: float) -> dict:
+    grouped: dict[str, list] = {}
+    for meta in _env_meta_frozen():
+        grouped.setdefault(meta.group, []).append(meta)
+    return {group: tuple(metas) for group, metas in grouped.items()}
+
+
+def _env_meta_grouped() -> dict:
+    """按 group 归组的环境变量元信息 {组名: (EnvVarMeta, ...)}
+
+    设置页每轮重跑都要按组遍历整表，归组结果随 mtime 记忆化
+    后，热路径只剩一次字典查找；dict 保持 JSON 中的出现顺序。
+    """
+    _env_meta()
+    return _env_meta_grouped_impl(_cfg._mtimes.get("env_meta.json", 0.0))
+
+
+@dataclass(frozen=True, slots=True)
+class ConfigSnapshot:
+    """全部 UI 配置的一致性快照（冻结）
+
+    页面渲染入口取一次快照后向下传递，渲染树内部不再逐项调用
+    访问函数，也不会出现同一轮重跑前后读到不同版本配置的情况。
+    """
+    colors: dict
+    doc_categories: dict
+    tool_names: dict
+    quick_commands: list
+    api_endpoints: list
+    env_meta: tuple
+    env_groups: dict
+    ui_text: dict
+
+
+@lru_cache(maxsize=4)
+def _snapshot_impl(_sig: tuple) -> ConfigSnapshot:
+    return ConfigSnapshot(
+        colors=_colors(),
+        doc_categories=_doc_categories(),
+        tool_names=_tool_cn_names(),
+        quick_commands=_quick_commands(),
+        api_endpoints=_api_endpoints(),
+        env_meta=_env_meta_frozen(),
+        env_groups=_env_meta_grouped(),
+        ui_text=_ui_text(),
+    )
+
+
+def get_live_snapshot() -> ConfigSnapshot:
+    """获取当前配置快照（记忆化，任一配置文件修改后自动重建）
+
+    快照按目录 mtime 签名缓存：配置全未变化时返回同一个对象。
+    """
+    _ui_text()  # 触发一次目录扫描节流检测
+    return _snapshot_impl(tuple(sorted(_cfg._disk_mtimes.items())))
+
+
 # ============================================================================
 # 兼容属性访问（通过 property-like 模块级变量）
 # 外部代码用 COLORS / DOC_CATEGORIES 等时，每次访问都走热加载
@@ -155,7 +304,7 @@ class _LiveConfig:
 
     def reload(self):
         """手动强制重新加载所有配置"""
-        _cfg.reload_all()
+        reload_config()
 
 
 # 模块级单例
@@ -168,62 +317,76 @@ _live = _LiveConfig()
 # ============================================================================
 
 def _build_css(colors: dict) -> str:
-    """根据颜色生成 CSS"""
-    return """
+    """根据颜色生成 CSS（按颜色内容记忆化）
+
+    模板近 2KB、替换点数十个，每次 %-格式化都要整段重扫；
+    颜色字典转成排序元组作缓存键后，相同配色直接复用成品串。
+    """
+    return _build_css_cached(tuple(sorted(colors.items())))
+
+
+# CSS 模板进程内只编译一次；substitute 单遍替换占位符，
+# 不像 %-格式化每次调用都要整段重扫模板
+_CSS_TMPL = string.Template("""
 <style>
 [data-testid="stSidebarNav"] { display: none !important; }
 [data-testid="stSidebar"] {
-    background: linear-gradient(180deg, %(bg_dark)s 0%%, %(bg_card)s 100%%);
+    background: linear-gradient(180deg, ${bg_dark} 0%, ${bg_card} 100%);
 }
 [data-testid="stSidebar"] h1,
 [data-testid="stSidebar"] h2,
 [data-testid="stSidebar"] h3 {
-    color: %(primary)s;
+    color: ${primary};
 }
 .status-card {
-    background: linear-gradient(135deg, %(bg_card)s, %(bg_card_alt)s);
-    border: 1px solid %(border)s;
+    background: linear-gradient(135deg, ${bg_card}, ${bg_card_alt});
+    border: 1px solid ${border};
     border-radius: 12px; padding: 1.2rem; margin: 0.5rem 0;
 }
-.status-card h3 { color: %(primary)s; margin: 0 0 0.5rem 0; font-size: 1rem; }
-.status-card .metric { font-size: 1.8rem; font-weight: bold; color: %(text_primary)s; }
-.status-card .label { color: %(text_muted)s; font-size: 0.85rem; }
+.status-card h3 { color: ${primary}; margin: 0 0 0.5rem 0; font-size: 1rem; }
+.status-card .metric { font-size: 1.8rem; font-weight: bold; color: ${text_primary}; }
+.status-card .label { color: ${text_muted}; font-size: 0.85rem; }
 .chat-user {
-    background: %(chat_user_bg)s; color: white;
+    background: ${chat_user_bg}; color: white;
     padding: 0.8rem 1.2rem; border-radius: 16px 16px 4px 16px;
-    max-width: 80%%; margin-left: auto; margin-bottom: 0.5rem;
+    max-width: 80%; margin-left: auto; margin-bottom: 0.5rem;
 }
 .chat-ai {
-    background: %(chat_ai_bg)s; border: 1px solid %(border)s;
-    color: %(text_secondary)s; padding: 0.8rem 1.2rem;
-    border-radius: 16px 16px 16px 4px; max-width: 80%%; margin-bottom: 0.5rem;
+    background: ${chat_ai_bg}; border: 1px solid ${border};
+    color: ${text_secondary}; padding: 0.8rem 1.2rem;
+    border-radius: 16px 16px 16px 4px; max-width: 80%; margin-bottom: 0.5rem;
 }
 .stButton > button { border-radius: 8px; font-weight: 600; transition: all 0.3s; }
 .stButton > button:hover {
     transform: translateY(-1px); box-shadow: 0 4px 12px rgba(88,166,255,0.3);
 }
-.editor-container { border: 1px solid %(border)s; border-radius: 8px; overflow: hidden; }
+.editor-container { border: 1px solid ${border}; border-radius: 8px; overflow: hidden; }
 .tag { display: inline-block; padding: 2px 10px; border-radius: 12px; font-size: 0.78rem; font-weight: 600; margin-right: 4px; }
 .tag-query { background: rgba(56,139,253,0.15); color: #58a6ff; }
 .tag-control { background: rgba(210,153,34,0.15); color: #d29922; }
 .tag-category { background: rgba(63,185,80,0.15); color: #3fb950; }
 .category-header {
-    background: linear-gradient(135deg, %(bg_card)s, %(bg_card_alt)s);
-    border: 1px solid %(border)s; border-radius: 10px;
+    background: linear-gradient(135deg, ${bg_card}, ${bg_card_alt});
+    border: 1px solid ${border}; border-radius: 10px;
     padding: 0.8rem 1rem; margin: 1rem 0 0.5rem 0;
 }
-.category-header h4 { margin: 0; color: %(primary)s; }
-.category-header .count { color: %(text_muted)s; font-size: 0.85rem; }
+.category-header h4 { margin: 0; color: ${primary}; }
+.category-header .count { color: ${text_muted}; font-size: 0.85rem; }
 .tool-card {
-    background: %(bg_card)s; border: 1px solid %(border)s;
+    background: ${bg_card}; border: 1px solid ${border};
     border-radius: 10px; padding: 0.8rem 1rem; margin-bottom: 0.5rem; transition: border-color 0.3s;
 }
-.tool-card:hover { border-color: %(primary)s; }
-.tool-card .tool-name { font-weight: 700; color: %(text_primary)s; }
-.tool-card .tool-cn-name { color: %(primary)s; font-size: 0.9rem; }
-.tool-card .tool-desc { color: %(text_muted)s; font-size: 0.85rem; margin-top: 4px; }
+.tool-card:hover { border-color: ${primary}; }
+.tool-card .tool-name { font-weight: 700; color: ${text_primary}; }
+.tool-card .tool-cn-name { color: ${primary}; font-size: 0.9rem; }
+.tool-card .tool-desc { color: ${text_muted}; font-size: 0.85rem; margin-top: 4px; }
 </style>
-""" % colors
+""")
+
+
+@lru_cache(maxsize=8)
+def _build_css_cached(items: tuple) -> str:
+    return _CSS_TMPL.substitute(dict(items))
 
 
 # ============================================================================
@@ -236,21 +399,67 @@ def get_colors() -> dict:
 
 
 def get_global_css() -> str:
-    """获取全局 CSS（热加载，颜色变化自动生效）"""
+    """获取全局 CSS（热加载，颜色变化自动生效）
+
+    _build_css 已按颜色内容记忆化，这里不必再按 mtime 做一层缓存。
+    """
     return _build_css(_colors())
 
 
-def get_category_label(cat_key: str) -> str:
-    """获取分类中文标签"""
+# 以下查找函数纯由「入参 + 配置文件内容」决定，按 (入参, 配置 mtime)
+# 记忆化：配置未变时同一入参只算一次；配置修改后 mtime 变化、自动失效
+
+
+@lru_cache(maxsize=512)
+def _category_label_impl(cat_key: str, _mtime: float) -> str:
     cats = _doc_categories()
     info = cats.get(cat_key, cats.get("general", {}))
     return f"{info.get('icon', '📄')} {info.get('label', cat_key)}"
 
 
-def categorize_doc(filename: str) -> str:
-    """根据文件名推断文档类别"""
+def get_category_label(cat_key: str) -> str:
+    """获取分类中文标签（记忆化）"""
+    _doc_categories()  # 触发热加载检测，保证 mtime 键最新
+    return _category_label_impl(cat_key, _cfg._mtimes.get("doc_categories.json", 0.0))
+
+
+@lru_cache(maxsize=4)
+def _keyword_automaton_impl(_mtime: float):
+    """按 doc_categories.json 构建关键词 Aho-Corasick 自动机
+
+    同一关键词出现在多个分类时保留先声明的分类（与循环版一致）。
+    未安装 pyahocorasick 或没有任何关键词时返回 None。
+    """
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for cat_key, cat_info in _doc_categories().items():
+        if cat_key == "general":
+            continue
+        for kw in cat_info.get("keywords", []):
+            if not automaton.exists(kw):
+                automaton.add_word(kw, cat_key)
+    if not len(automaton):
+        return None
+    automaton.make_automaton()
+    return automaton
+
+
+@lru_cache(maxsize=4096)
+def _categorize_doc_impl(filename: str, _mtime: float) -> str:
     cats = _doc_categories()
     name_lower = filename.lower()
+
+    automaton = _keyword_automaton_impl(_mtime)
+    if automaton is not None:
+        hits = {cat_key for _, cat_key in automaton.iter(name_lower)}
+        if hits:
+            # 命中多个分类时，按配置声明顺序取优先级最高的
+            for cat_key in cats:
+                if cat_key in hits:
+                    return cat_key
+        return "general"
+
     for cat_key, cat_info in cats.items():
         if cat_key == "general":
             continue
@@ -260,16 +469,28 @@ def categorize_doc(filename: str) -> str:
     return "general"
 
 
-def get_tool_cn_name(tool_name: str) -> str:
-    """获取工具中文名称"""
+def categorize_doc(filename: str) -> str:
+    """根据文件名推断文档类别（记忆化：每个文件名只做一次关键词扫描）"""
+    _doc_categories()
+    return _categorize_doc_impl(filename, _cfg._mtimes.get("doc_categories.json", 0.0))
+
+
+@lru_cache(maxsize=512)
+def _tool_cn_impl(tool_name: str, _mtime: float) -> tuple:
     info = _tool_cn_names().get(tool_name, {})
-    return info.get("cn_name", tool_name)
+    return info.get("cn_name", tool_name), info.get("cn_desc", "")
+
+
+def get_tool_cn_name(tool_name: str) -> str:
+    """获取工具中文名称（记忆化）"""
+    _tool_cn_names()
+    return _tool_cn_impl(tool_name, _cfg._mtimes.get("tool_names.json", 0.0))[0]
 
 
 def get_tool_cn_desc(tool_name: str) -> str:
-    """获取工具中文简述"""
-    info = _tool_cn_names().get(tool_name, {})
-    return info.get("cn_desc", "")
+    """获取工具中文简述（记忆化）"""
+    _tool_cn_names()
+    return _tool_cn_impl(tool_name, _cfg._mtimes.get("tool_names.json", 0.0))[1]
 
 
 def get_ui_text(section: str, key: str, default: str = "") -> str:
@@ -323,5 +544,18 @@ def load_json_template(cat_key: str, title: str = "") -> str:
 
 
 def reload_config():
-    """手动强制重新加载所有配置（供 UI 刷新按钮调用）"""
+    """手动强制重新加载所有配置（供 UI 刷新按钮调用）
+
+    除清空解析缓存外，连带清空按 mtime 记忆化的查找缓存与 CSS 缓存：
+    mtime 键兜不住「内容换了但 mtime 相同」的极端情况（如文件原子替换
+    后时间戳一致），手动刷新按钮应当无条件回到冷态。
+    """
     _cfg.reload_all()
+    _category_label_impl.cache_clear()
+    _categorize_doc_impl.cache_clear()
+    _keyword_automaton_impl.cache_clear()
+    _tool_cn_impl.cache_clear()
+    _env_meta_frozen_impl.cache_clear()
+    _env_meta_grouped_impl.cache_clear()
+    _snapshot_impl.cache_clear()
+    _build_css_cached.cache_clear()
@@ -4,18 +4,65 @@
 """
 import sys
 import json
+import logging
 from datetime import datetime
 from pathlib import Path
 from loguru import logger
 
 import config
 
+try:
+    # orjson 编码快数倍且直接产出 bytes：log_mcp_call 截断 500 字节
+    # 时只付出所需部分的解码成本，不再为了切片而整串格式化
+    import orjson
+
+    def _dump_pretty(obj) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+
+    def _dump_compact(obj) -> bytes:
+        return orjson.dumps(obj)
+except ImportError:
+    def _dump_pretty(obj) -> str:
+        return json.dumps(obj, ensure_ascii=False, indent=2)
+
+    def _dump_compact(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+
+class InterceptHandler(logging.Handler):
+    """把 stdlib logging 记录转交 loguru 输出
+
+    热路径模块（如 mcp 客户端/工具层）使用 stdlib logger + %-延迟
+    格式化，避开 loguru 每次调用的取帧开销；记录仍统一汇入
+    loguru 的控制台与文件 sink。
+    """
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            level = logger.level(record.levelname).name
+        except ValueError:
+            level = record.levelno
+        logger.opt(depth=6, exception=record.exc_info).log(level, record.getMessage())
+
+
+# setup_logger 是否已执行：importlib.reload / Streamlit 多页面等场景
+# 可能重复触发模块级代码，幂等保护避免重复挂 sink、重复写文件句柄
+_INITIALIZED = False
+
 
 def setup_logger():
-    """初始化日志系统"""
+    """初始化日志系统（幂等，重复调用直接返回）"""
+    global _INITIALIZED
+    if _INITIALIZED:
+        return logger
+    _INITIALIZED = True
+
     # 移除默认 handler
     logger.remove()
 
+    # stdlib logging 桥接到 loguru（级别过滤交给各 sink）
+    logging.basicConfig(handlers=[InterceptHandler()], level=0, force=True)
+
     # 控制台输出
     logger.add(
         sys.stderr,
@@ -41,13 +88,25 @@ def setup_logger():
 
 def log_decision(agent_name: str, decision: dict):
     """记录 Agent 决策，用于审计"""
-    logger.info(f"[{agent_name}] Decision: {json.dumps(decision, ensure_ascii=False, indent=2)}")
+    logger.info("[{}] Decision: {}", agent_name, _dump_pretty(decision))
 
 
 def log_mcp_call(tool_name: str, params: dict, result: dict):
-    """记录 MCP 工具调用"""
-    logger.info(f"[MCP] {tool_name}({json.dumps(params, ensure_ascii=False)}) -> {json.dumps(result, ensure_ascii=False)[:500]}")
+    """记录 MCP 工具调用（结果按字节截断，不整串解码）"""
+    logger.info(
+        "[MCP] {}({}) -> {}",
+        tool_name,
+        _dump_compact(params).decode("utf-8", "replace"),
+        _dump_compact(result)[:500].decode("utf-8", "replace"),
+    )
+
 
+def get_logger():
+    """获取已初始化的 logger（首次调用时惰性完成初始化）
 
-# 初始化
-setup_logger()
+    不在模块导入时执行 setup_logger()：让导入方决定何时付出
+    建 sink、建日志文件的成本；未初始化时 loguru 自带的
+    stderr sink 仍可兜底输出。
+    """
+    setup_logger()
+    return logger
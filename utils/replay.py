@@ -9,6 +9,23 @@ from pathlib import Path
 from typing import Any
 from loguru import logger
 
+try:
+    # orjson（Rust 实现）编码/解码比标准库快数倍且直接产出 bytes；
+    # 长会话的回放文件保存不再卡在 json.dump 上
+    import orjson
+
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+
+    def _loads(data: bytes):
+        return orjson.loads(data)
+except ImportError:
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+
+    def _loads(data: bytes):
+        return json.loads(data)
+
 
 class ReplayRecorder:
     """记录 MCP 调用序列，用于回放"""
@@ -40,26 +57,19 @@ class ReplayRecorder:
         output_path.mkdir(parents=True, exist_ok=True)
 
         filepath = output_path / f"replay_{self.session_id}.json"
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(
-                {
-                    "session_id": self.session_id,
-                    "start_time": self.start_time,
-                    "total_calls": len(self.records),
-                    "records": self.records,
-                },
-                f,
-                ensure_ascii=False,
-                indent=2,
-            )
+        filepath.write_bytes(_dumps({
+            "session_id": self.session_id,
+            "start_time": self.start_time,
+            "total_calls": len(self.records),
+            "records": self.records,
+        }))
         logger.info(f"Replay saved to {filepath}")
         return str(filepath)
 
     @classmethod
     def load(cls, filepath: str) -> "ReplayRecorder":
         """从文件加载回放记录"""
-        with open(filepath, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = _loads(Path(filepath).read_bytes())
 
         recorder = cls(session_id=data["session_id"])
         recorder.start_time = data["start_time"]